@@ -1,15 +1,14 @@
 """Backtester for simulating hedge fund performance on historical data."""
 
 import asyncio
-import os
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 
 from hedgehog.workflow import analyze_company
-from hedgehog.tools.api import fetch_price_history
+from hedgehog.tools.api import fetch_price_series, close_api_clients
+from hedgehog.tools.llm import DEFAULT_MODEL, close_llm_clients
+from hedgehog.tools.prices import PriceSeries
 
 
 class BacktestParameters(BaseModel):
@@ -23,6 +22,7 @@ class BacktestParameters(BaseModel):
     position_size_limit: float = Field(..., description="Maximum position size as percentage")
     rebalance_frequency: int = Field(..., description="Rebalance frequency in days")
     stop_loss_enabled: bool = Field(..., description="Whether to use stop-loss for positions")
+    model: str = Field(DEFAULT_MODEL, description="Model to use for analysis")
 
 
 class BacktestPosition(BaseModel):
@@ -93,6 +93,19 @@ class BacktestResult(BaseModel):
     portfolio_history: List[Tuple[datetime, float]] = Field(..., description="Portfolio equity history")
 
 
+def _period_covering(start_date: datetime) -> str:
+    """Return the shortest API period (in whole years) that reaches back to a date.
+
+    Args:
+        start_date: Oldest date that must be covered
+
+    Returns:
+        Period string such as '2y'
+    """
+    years = max(1, -(-(datetime.now() - start_date).days // 365))
+    return f"{years}y"
+
+
 async def run_backtest(params: BacktestParameters) -> BacktestResult:
     """Run a backtest with the given parameters.
 
@@ -102,15 +115,6 @@ async def run_backtest(params: BacktestParameters) -> BacktestResult:
     Returns:
         BacktestResult: Results from the completed backtest
     """
-    # Set up the model for analysis
-    model = OpenAIModel(
-        "anthropic/claude-3.5-sonnet",
-        provider=OpenAIProvider(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY")
-        ),
-    )
-
     # Initialize portfolio
     portfolio = BacktestPortfolio(
         date=params.start_date,
@@ -127,6 +131,15 @@ async def run_backtest(params: BacktestParameters) -> BacktestResult:
     # Portfolio equity history for tracking performance
     portfolio_history = [(params.start_date, params.initial_capital)]
 
+    # Price history is loaded once per ticker and looked up by date
+    price_series: Dict[str, PriceSeries] = {}
+    period = _period_covering(params.start_date)
+
+    async def price_on(ticker: str, when: datetime) -> float:
+        if ticker not in price_series:
+            price_series[ticker] = await fetch_price_series(ticker, period)
+        return price_series[ticker].price_as_of(when) or 0
+
     # Generate date range for the backtest
     current_date = params.start_date
     while current_date <= params.end_date:
@@ -154,11 +167,10 @@ async def run_backtest(params: BacktestParameters) -> BacktestResult:
 
                 # Run analysis for the ticker
                 try:
-                    analysis = await analyze_company(ticker, model)
+                    analysis = await analyze_company(ticker, params.model)
 
                     # Get current price
-                    price_history = await fetch_price_history(ticker)
-                    current_price = price_history.get("latest_price", 0)
+                    current_price = await price_on(ticker, current_date)
 
                     if current_price <= 0:
                         continue
@@ -205,8 +217,7 @@ async def run_backtest(params: BacktestParameters) -> BacktestResult:
         for position in portfolio.positions:
             # Fetch latest price data
             try:
-                price_history = await fetch_price_history(position.ticker)
-                current_price = price_history.get("latest_price", 0)
+                current_price = await price_on(position.ticker, current_date)
 
                 if current_price <= 0:
                     updated_positions.append(position)
@@ -254,8 +265,7 @@ async def run_backtest(params: BacktestParameters) -> BacktestResult:
         portfolio_value = portfolio.cash
         for position in portfolio.positions:
             try:
-                price_history = await fetch_price_history(position.ticker)
-                current_price = price_history.get("latest_price", 0)
+                current_price = await price_on(position.ticker, current_date)
 
                 if current_price > 0:
                     portfolio_value += position.shares * current_price
@@ -307,8 +317,15 @@ if __name__ == "__main__":
         stop_loss_enabled=True
     )
 
+    async def _run() -> BacktestResult:
+        try:
+            return await run_backtest(parameters)
+        finally:
+            await close_api_clients()
+            await close_llm_clients()
+
     # Run the backtest
-    result = asyncio.run(run_backtest(parameters))
+    result = asyncio.run(_run())
 
     # Print results
     print(f"Backtest completed from {parameters.start_date} to {parameters.end_date}")
@@ -0,0 +1,204 @@
+"""Checkpoints of finished pipeline nodes, for resuming interrupted runs.
+
+While a run is checkpointed, the result of every analyst, decision and
+output node is appended to `<run id>/checkpoint.jsonl` next to the run's
+node states. A resumed run restores those results instead of recomputing
+them, so a batch that died at ticker 170 of 200 only pays for the rest.
+Each resumed attempt gets an attempt id (`<run id>.r1`, `<run id>.r2`, ...)
+under which its call metrics and node states are written, so they never
+overwrite those of the attempts before it.
+
+Results are converted to plain data on the event loop, which keeps them a
+snapshot of the moment they were saved; encoding and writing happen on a
+background thread so the pipeline never waits on the disk.
+"""
+
+import importlib
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from hedgehog.pipeline import PIPELINE_STATE_DIR
+
+
+class CheckpointStore:
+    """Append-only store of node results for one run."""
+
+    def __init__(self, root: Path = PIPELINE_STATE_DIR):
+        """Initialize a closed store.
+
+        Args:
+            root: Directory holding one subdirectory per run id
+        """
+        self.root = Path(root)
+        self.run_id: Optional[str] = None
+        self.attempt = 0
+        self.config: Dict[str, Any] = {}
+        self._results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._stats = {"restored": 0, "saved": 0}
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Checkpoint file of the open run."""
+        return self.root / self.run_id / "checkpoint.jsonl" if self.run_id else None
+
+    @property
+    def attempt_id(self) -> Optional[str]:
+        """Identifier of the current attempt of the open run: the run id, suffixed with `.r<n>` when resumed."""
+        if self.run_id is None or not self.attempt:
+            return self.run_id
+        return f"{self.run_id}.r{self.attempt}"
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a run is being checkpointed."""
+        return self._writer is not None
+
+    def _start(self, run_id: str) -> None:
+        self.run_id = run_id
+        self._stats = {"restored": 0, "saved": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = threading.Thread(target=self._write, args=(self.path,), name="checkpoint-writer", daemon=True)
+        self._writer.start()
+
+    def _write(self, path: Path) -> None:
+        with open(path, "a", encoding="utf-8") as output:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                output.write(json.dumps(record, default=str) + "\n")
+                # Flush once the backlog is written, so a crash loses at most what is queued
+                if self._queue.empty():
+                    output.flush()
+
+    def open(self, run_id: str, config: Optional[Dict[str, Any]] = None) -> None:
+        """Start checkpointing a new run.
+
+        Args:
+            run_id: Identifier of the run
+            config: Settings the run was started with (tickers, model,
+                analysts, ...), restored when the run is resumed
+        """
+        self.close()
+        self.config = dict(config or {})
+        self._results = {}
+        self.attempt = 0
+        self._start(run_id)
+        self._queue.put({"kind": "run", "run_id": run_id, "time": time.time(), "config": self.config})
+
+    def resume(self, run_id: str) -> Dict[str, Any]:
+        """Load the checkpoints of an earlier run and keep checkpointing it.
+
+        Args:
+            run_id: Identifier of the run to resume
+
+        Returns:
+            Settings the run was started with
+
+        Raises:
+            ValueError: If the run has no checkpoint
+        """
+        self.close()
+        path = self.root / run_id / "checkpoint.jsonl"
+        if not path.exists():
+            raise ValueError(f"No checkpoint for run {run_id!r} in {self.root}")
+
+        self.config, self._results = {}, {}
+        attempts = 0
+        with open(path, "r", encoding="utf-8") as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short when the run died
+                    continue
+                if record.get("kind") == "run":
+                    self.config = record.get("config", {})
+                elif record.get("kind") == "resume":
+                    attempts = max(attempts, record.get("attempt", 0))
+                elif record.get("kind") == "node":
+                    # Later records of a node supersede earlier ones
+                    self._results[(record["ticker"], record["node"])] = record
+        self.attempt = attempts + 1
+        self._start(run_id)
+        self._queue.put({"kind": "resume", "attempt": self.attempt, "time": time.time()})
+        return dict(self.config)
+
+    def restore(self, ticker: str, node: str) -> Optional[BaseModel]:
+        """Return the checkpointed result of a node.
+
+        Args:
+            ticker: Ticker the pipeline ran for
+            node: Node name
+
+        Returns:
+            The result, or None if no run is open or the node has no
+            (readable) checkpoint
+        """
+        record = self._results.get((ticker, node)) if self.is_open else None
+        if record is None:
+            return None
+        module_name, _, type_name = record["type"].partition(":")
+        try:
+            model = getattr(importlib.import_module(module_name), type_name)
+            value = model.model_validate(record["data"])
+        except (ImportError, AttributeError, ValueError):
+            # Saved by a different version of the code
+            return None
+        self._stats["restored"] += 1
+        return value
+
+    def save(self, ticker: str, node: str, value: BaseModel) -> None:
+        """Checkpoint the result of a node; a no-op unless a run is open.
+
+        Args:
+            ticker: Ticker the pipeline ran for
+            node: Node name
+            value: Result of the node
+        """
+        if not self.is_open:
+            return
+        record = {
+            "kind": "node",
+            "ticker": ticker,
+            "node": node,
+            "time": time.time(),
+            "type": f"{type(value).__module__}:{type(value).__qualname__}",
+            "data": value.model_dump(mode="json"),
+        }
+        self._results[(ticker, node)] = record
+        self._queue.put(record)
+        self._stats["saved"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return restore and save counters.
+
+        Returns:
+            Dict with the run id, checkpoint path, nodes restored and saved
+            and writes still queued
+        """
+        return {
+            "run_id": self.run_id,
+            "path": str(self.path) if self.path else None,
+            **self._stats,
+            "pending": self._queue.qsize(),
+        }
+
+    def close(self) -> None:
+        """Write every queued checkpoint and stop checkpointing."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+
+# Global store used by the workflow; closed unless a run is checkpointed
+checkpoints = CheckpointStore()
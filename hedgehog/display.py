@@ -52,6 +52,13 @@ def format_analysis_output(analysis: CompanyAnalysisOutput) -> str:
         investor_confidence = f"{investor_analysis.rating * 10}%"
         signals.append((investor_name, investor_signal, investor_color, investor_confidence))
 
+    # Add analyses of registered analysts beyond the built-in ones
+    for key, other_analysis in analysis.other_analyses.items():
+        other_signal = "BULLISH" if other_analysis.rating >= 7 else "BEARISH" if other_analysis.rating <= 4 else "NEUTRAL"
+        other_color = GREEN if other_signal == "BULLISH" else RED if other_signal == "BEARISH" else YELLOW
+        other_confidence = f"{other_analysis.rating * 10}%"
+        signals.append((key.replace("_", " ").title(), other_signal, other_color, other_confidence))
+
     # Add valuation signal based on the investment decision
     valuation_signal = "BULLISH" if "buy" in analysis.investment_decision.order_type.lower() else "BEARISH" if "sell" in analysis.investment_decision.order_type.lower() else "NEUTRAL"
     valuation_color = GREEN if valuation_signal == "BULLISH" else RED if valuation_signal == "BEARISH" else YELLOW
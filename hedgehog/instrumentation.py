@@ -0,0 +1,306 @@
+"""Instrumentation hooks for pipeline events.
+
+Fetches, LLM calls and analyst steps emit events on the global `events` bus.
+Subscribers such as the progress tracker react to them; emitting costs
+nothing beyond calling each subscriber. The `call_recorder` subscriber keeps
+a per-call record of every LLM and data API call for the run summary.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Ticker and analyst the current task is working for; tasks inherit them when created
+current_ticker: ContextVar[Optional[str]] = ContextVar("current_ticker", default=None)
+current_analyst: ContextVar[Optional[str]] = ContextVar("current_analyst", default=None)
+
+
+class Event:
+    """A single pipeline event."""
+
+    __slots__ = ("name", "ticker", "analyst", "timestamp", "data")
+
+    def __init__(self, name: str, ticker: Optional[str], analyst: Optional[str], data: Dict[str, Any]):
+        """Initialize the event.
+
+        Args:
+            name: Event name (e.g. 'fetch_started', 'llm_completed')
+            ticker: Ticker the event relates to, if any
+            analyst: Analyst the event relates to, if any
+            data: Event-specific fields
+        """
+        self.name = name
+        self.ticker = ticker
+        self.analyst = analyst
+        self.timestamp = time.time()
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"Event({self.name!r}, ticker={self.ticker!r}, analyst={self.analyst!r}, data={self.data!r})"
+
+
+class EventBus:
+    """Dispatches pipeline events to subscribers."""
+
+    def __init__(self):
+        """Initialize the bus with no subscribers."""
+        self._subscribers: List[Callable[[Event], None]] = []
+
+    def subscribe(self, callback: Callable[[Event], None]) -> Callable[[], None]:
+        """Register a callback for every event.
+
+        Args:
+            callback: Function called with each Event
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    def emit(self, name: str, ticker: Optional[str] = None, analyst: Optional[str] = None, **data: Any) -> None:
+        """Emit an event to all subscribers.
+
+        Args:
+            name: Event name
+            ticker: Ticker the event relates to (defaults to the current context)
+            analyst: Analyst the event relates to (defaults to the current context)
+            **data: Event-specific fields
+        """
+        if not self._subscribers:
+            return
+        event = Event(
+            name,
+            ticker if ticker is not None else current_ticker.get(),
+            analyst if analyst is not None else current_analyst.get(),
+            data
+        )
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                # A broken subscriber must never break the pipeline, but its failure is logged
+                logger.exception("Event subscriber %r failed on %s", callback, event.name)
+
+
+@contextmanager
+def instrument_context(ticker: Optional[str] = None, analyst: Optional[str] = None) -> Iterator[None]:
+    """Tag events emitted inside the block with a ticker and/or analyst.
+
+    Args:
+        ticker: Ticker to tag events with
+        analyst: Analyst to tag events with
+    """
+    tokens = []
+    if ticker is not None:
+        tokens.append((current_ticker, current_ticker.set(ticker)))
+    if analyst is not None:
+        tokens.append((current_analyst, current_analyst.set(analyst)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+# Global event bus
+events = EventBus()
+
+
+# Percentiles reported for call durations
+SUMMARY_PERCENTILES = (50, 90, 99)
+
+
+class CallRecorder:
+    """Records every LLM and data API call of a run and summarises them.
+
+    LLM calls are recorded from `llm_completed`, `llm_failed` and
+    `llm_cache_hit` events, data API calls from `fetch_finished` events.
+    `llm_escalated` events mark the analyst's latest call as superseded by a
+    stronger model, and `decision_synthesis` events count decision reasoning
+    calls that were made, skipped or deferred. `pipeline_finished` events
+    keep the wall time and critical path of every pipeline run, several per
+    ticker when it is analysed more than once (e.g. once per backtest period). Hedged
+    LLM calls are marked with the request that won.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.run_id = time.strftime("%Y%m%d-%H%M%S")
+        self._records: List[Dict[str, Any]] = []
+        self._decisions: Dict[str, int] = {}
+        self._pipelines: Dict[str, List[Dict[str, Any]]] = {}
+
+    def reset(self, run_id: Optional[str] = None) -> None:
+        """Forget recorded calls and start a new run.
+
+        Args:
+            run_id: Identifier of the new run (defaults to the current time)
+        """
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self._records = []
+        self._decisions = {}
+        self._pipelines = {}
+
+    def handle_event(self, event: Event) -> None:
+        """Record a call from a pipeline event.
+
+        Args:
+            event: Event emitted on the instrumentation bus
+        """
+        data = event.data
+        if event.name in ("llm_completed", "llm_failed", "llm_cache_hit"):
+            self._records.append({
+                "kind": "llm",
+                "timestamp": event.timestamp,
+                "ticker": event.ticker,
+                "analyst": event.analyst,
+                "model": data.get("model"),
+                "duration": data.get("duration", 0.0),
+                "queued": data.get("queued"),
+                "ttft": data.get("ttft"),
+                "input_tokens": data.get("input_tokens"),
+                "output_tokens": data.get("output_tokens"),
+                "cost": data.get("cost"),
+                "cached": event.name == "llm_cache_hit",
+                "error": data.get("error"),
+                "escalated": False,
+                "hedge": data.get("hedge"),
+                "hedge_skipped": data.get("hedge_skipped"),
+                "extra_cost": data.get("extra_cost") or 0.0,
+            })
+        elif event.name == "llm_escalated":
+            for record in reversed(self._records):
+                if record["kind"] == "llm" and record["ticker"] == event.ticker and record["analyst"] == event.analyst:
+                    record["escalated"] = data.get("reason", True)
+                    break
+        elif event.name == "decision_synthesis":
+            action = data.get("action", "called")
+            self._decisions[action] = self._decisions.get(action, 0) + 1
+        elif event.name == "pipeline_finished":
+            self._pipelines.setdefault(event.ticker, []).append({
+                "seconds": data.get("seconds", 0.0),
+                "critical_path": [list(step) for step in data.get("critical_path", [])],
+            })
+        elif event.name == "fetch_finished":
+            self._records.append({
+                "kind": "data",
+                "timestamp": event.timestamp,
+                "ticker": event.ticker,
+                "analyst": event.analyst,
+                "endpoint": data.get("endpoint"),
+                "duration": data.get("duration", 0.0),
+                "streaming": bool(data.get("streaming")),
+                "error": data.get("error"),
+            })
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Calls recorded so far, in completion order."""
+        return list(self._records)
+
+    @staticmethod
+    def _aggregate(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        durations = np.array([record["duration"] for record in records if not record.get("cached")], dtype=float)
+        ttfts = np.array([record["ttft"] for record in records if record.get("ttft") is not None], dtype=float)
+        summary: Dict[str, Any] = {
+            "calls": len(records),
+            "errors": sum(1 for record in records if record.get("error")),
+            "cached": sum(1 for record in records if record.get("cached")),
+            "total_seconds": float(durations.sum()),
+            "max_seconds": float(durations.max()) if len(durations) else 0.0,
+        }
+        for percentile in SUMMARY_PERCENTILES:
+            summary[f"p{percentile}_seconds"] = float(np.percentile(durations, percentile)) if len(durations) else 0.0
+        if ttfts.size:
+            summary["p50_ttft_seconds"] = float(np.percentile(ttfts, 50))
+        if records and records[0]["kind"] == "llm":
+            summary["input_tokens"] = sum(record.get("input_tokens") or 0 for record in records)
+            summary["output_tokens"] = sum(record.get("output_tokens") or 0 for record in records)
+            summary["cost"] = sum(record.get("cost") or 0.0 for record in records)
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarise the recorded calls.
+
+        Returns:
+            Dict with LLM calls grouped by model and by analyst, data API calls
+            grouped by endpoint, totals for each kind, decision reasoning
+            calls by what happened to them, hedged LLM calls, and per-ticker
+            pipeline runs with the wall time and critical path of the slowest,
+            slowest tickers first
+        """
+        def grouped(kind: str, field: str) -> Dict[str, Any]:
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for record in self._records:
+                if record["kind"] == kind:
+                    groups.setdefault(record.get(field) or "unknown", []).append(record)
+            return {name: self._aggregate(records) for name, records in sorted(groups.items())}
+
+        llm_records = [record for record in self._records if record["kind"] == "llm"]
+        data_records = [record for record in self._records if record["kind"] == "data"]
+        requested = [record for record in llm_records if not record.get("cached")]
+        hedged = [record for record in requested if record.get("hedge")]
+        pipelines = {}
+        for ticker, runs in self._pipelines.items():
+            slowest = max(runs, key=lambda run: run["seconds"])
+            pipelines[ticker] = {
+                "runs": len(runs),
+                "seconds": slowest["seconds"],
+                "total_seconds": sum(run["seconds"] for run in runs),
+                "critical_path": slowest["critical_path"],
+            }
+        return {
+            "run_id": self.run_id,
+            "llm": {
+                "total": self._aggregate(llm_records),
+                "by_model": grouped("llm", "model"),
+                "by_analyst": grouped("llm", "analyst"),
+            },
+            "data": {
+                "total": self._aggregate(data_records),
+                "by_endpoint": grouped("data", "endpoint"),
+            },
+            "decisions": dict(self._decisions),
+            "hedging": {
+                "calls": len(requested),
+                "hedged": len(hedged),
+                "hedge_rate": len(hedged) / len(requested) if requested else 0.0,
+                "hedge_wins": sum(1 for record in hedged if record["hedge"] == "hedge"),
+                "skipped_no_slot": sum(1 for record in requested if record.get("hedge_skipped") == "no_slot"),
+                "skipped_budget": sum(1 for record in requested if record.get("hedge_skipped") == "budget"),
+                "extra_cost": sum(record.get("extra_cost") or 0.0 for record in hedged),
+                "cost": sum(record.get("cost") or 0.0 for record in requested),
+            },
+            "pipelines": dict(sorted(pipelines.items(), key=lambda item: -item[1]["seconds"])),
+        }
+
+    def write_jsonl(self, path: Path) -> Path:
+        """Write every recorded call, followed by the run summary, as JSON Lines.
+
+        Args:
+            path: File to write
+
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as output:
+            for record in self._records:
+                output.write(json.dumps({"run_id": self.run_id, **record}) + "\n")
+            output.write(json.dumps({"kind": "summary", **self.summary()}) + "\n")
+        return path
+
+
+# Global recorder of the calls made during a run
+call_recorder = CallRecorder()
+events.subscribe(call_recorder.handle_event)
@@ -1,20 +1,47 @@
 """Main entry point for the Hedgehog AI Hedge Fund application."""
 
 import os
+import re
+import time
 import asyncio
 import argparse
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
-
-from hedgehog.workflow import analyze_company
+from hedgehog.workflow import (
+    analyze_company,
+    collect_deferred_reasoning,
+    configure_decision_policy,
+    configure_llm_concurrency,
+    configure_llm_streaming,
+    DECISION_POLICIES,
+    DEFAULT_ANALYSTS,
+)
 from hedgehog.backtester import run_backtest, BacktestParameters
 from hedgehog.display import display_analyses
 from hedgehog.cli import select_analysts, select_model
 from hedgehog.progress import progress
+from hedgehog.tools.api import (
+    close_api_clients,
+    data_api_stats,
+    response_cache,
+    fetch_company_data_many,
+    fetch_price_series_many,
+    fetch_news_data_many,
+    fetch_peer_companies_many,
+)
+from hedgehog.checkpoint import checkpoints
+from hedgehog.instrumentation import call_recorder
+from hedgehog.tools.cache import CACHE_DIR, CACHE_MODES
+from hedgehog.tools.fixtures import fixtures
+from hedgehog.tools.http_client import http_client
+from hedgehog.tools.llm import DEFAULT_MODEL, close_llm_clients, llm_stats
+from hedgehog.tools.hedging import DEFAULT_HEDGE_BUDGET, DEFAULT_HEDGE_PERCENTILE, configure_hedging
+from hedgehog.tools.incremental import configure_incremental, incremental_analyses
+from hedgehog.tools.llm_cache import llm_cache
+from hedgehog.tools.routing import RoutingTable, configure_routing, model_routing
 
 
 # Load environment variables
@@ -33,50 +60,285 @@ DARK_MODE = os.getenv("HEDGEHOG_DARK_MODE", "0") == "1"
 # Set progress tracker dark mode
 progress.dark_mode = DARK_MODE
 
+# Slowest tickers whose pipeline critical path is printed in the run summary
+CRITICAL_PATHS_SHOWN = 10
+
 
 async def analyze_stocks(
     tickers: List[str],
-    model_name: str = "anthropic/claude-3.5-sonnet",
+    model_name: str = DEFAULT_MODEL,
     selected_analysts: List[str] = None,
     show_reasoning: bool = False,
-    interactive: bool = False
+    interactive: bool = False,
+    concurrency: int = 4,
+    metrics_file: Optional[str] = None,
+    resume: Optional[str] = None
 ) -> None:
     """Analyze a list of stocks and print investment recommendations.
 
+    Tickers are analyzed by a bounded pool of concurrent workers; a ticker
+    that fails is reported without stopping the others. Every finished
+    analysis is checkpointed under the run's id, so an interrupted run can
+    be resumed without paying for the finished work again.
+
     Args:
         tickers: List of ticker symbols to analyze
         model_name: Name of the model to use for analysis
         selected_analysts: List of analysts to use for analysis
         show_reasoning: Whether to show detailed reasoning
         interactive: Whether to use interactive CLI selectors
+        concurrency: Maximum number of tickers analyzed at once
+        metrics_file: JSON Lines file the per-call metrics are written to
+            (defaults to a file named after the run under the cache directory)
+        resume: Id of an interrupted run to resume; its tickers (unless
+            given), model, analysts and reasoning setting are reused
     """
     # If interactive mode, use CLI selectors
     if interactive:
         selected_analysts = select_analysts()
         model_name = select_model()
 
-    # Initialize the OpenRouter model
-    model = OpenAIModel(
-        model_name=model_name,
-        provider=OpenAIProvider(
-            api_key=OPENROUTER_API_KEY,
-            base_url="https://openrouter.ai/api/v1"
-        ),
-    )
+    if resume:
+        config = checkpoints.resume(resume)
+        # Metrics and node states of this attempt must not overwrite the earlier attempts'
+        call_recorder.reset(checkpoints.attempt_id)
+        tickers = tickers or config.get("tickers", [])
+        model_name = config.get("model", model_name)
+        selected_analysts = config.get("analysts", selected_analysts)
+        show_reasoning = config.get("show_reasoning", show_reasoning)
+    else:
+        checkpoints.open(call_recorder.run_id, {
+            "tickers": tickers,
+            "model": model_name,
+            "analysts": selected_analysts,
+            "show_reasoning": show_reasoning,
+        })
+    print(f"Run {call_recorder.run_id} (resume with --resume {checkpoints.run_id})")
+
+    # Progress is tracked once for the whole batch
+    progress.set_analysts(selected_analysts or DEFAULT_ANALYSTS)
+    progress.set_model(model_name)
+    progress.start_display()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = {}
+
+    async def analyze_ticker(ticker: str):
+        async with semaphore:
+            try:
+                return await analyze_company(
+                    ticker=ticker,
+                    model_name=model_name,
+                    selected_analysts=selected_analysts,
+                    show_reasoning=show_reasoning,
+                    track_progress=False
+                )
+            except Exception as e:
+                # Isolate the failure so the rest of the batch keeps going
+                failures[ticker] = str(e)
+                progress.log_error(f"Analysis failed for {ticker}: {str(e)}")
+                return None
 
     # Run analysis for each ticker
-    analyses = []
-    for ticker in tickers:
-        analysis = await analyze_company(
-            ticker=ticker,
-            model=model,
-            selected_analysts=selected_analysts,
-            show_reasoning=show_reasoning
-        )
-        analyses.append(analysis)
+    try:
+        results = await asyncio.gather(*(analyze_ticker(ticker) for ticker in tickers))
+        # Reasoning deferred on consensus was generated while the batch went on
+        await collect_deferred_reasoning([analysis for analysis in results if analysis is not None])
+    finally:
+        progress.stop_display()
+        checkpoints.close()
+        incremental_analyses.close()
+        api_stats = data_api_stats()
+        model_stats = llm_stats()
+        await close_api_clients()
+        await close_llm_clients()
+
+    analyses = [analysis for analysis in results if analysis is not None]
 
     # Display the results
     display_analyses(analyses)
+    for ticker, error in failures.items():
+        print(f"✗ {ticker}: analysis failed: {error}")
+    print_data_api_stats(api_stats)
+    print_llm_stats(model_stats)
+    print_incremental_stats(incremental_analyses.stats())
+    print_checkpoint_stats(checkpoints.stats())
+    report_call_metrics(metrics_file, model_name)
+
+
+def print_incremental_stats(stats: dict) -> None:
+    """Print how many analyses incremental re-analysis reused.
+
+    Args:
+        stats: Statistics as returned by `incremental_analyses.stats()`
+    """
+    if not stats["enabled"]:
+        return
+    print(
+        f"Incremental analysis: {stats['unchanged']} reused on unchanged inputs, "
+        f"{stats['immaterial']} reused within materiality thresholds, {stats['recomputed']} recomputed"
+    )
+
+
+def print_checkpoint_stats(stats: dict) -> None:
+    """Print how many analyses were restored from and saved to the run's checkpoint.
+
+    Args:
+        stats: Statistics as returned by `checkpoints.stats()`
+    """
+    print(f"Checkpoint: {stats['restored']} results restored, {stats['saved']} saved to {stats['path']}")
+
+
+def print_data_api_stats(stats: dict) -> None:
+    """Print connection pool, cache, price store and request coalescing statistics for the data API.
+
+    Args:
+        stats: Statistics as returned by `data_api_stats()`
+    """
+    pool = stats["pool"]
+    cache = stats["cache"]
+    coalesced = stats["single_flight"]
+    print(
+        f"\nData API: {pool['requests']} requests, "
+        f"{pool['connections_created']} connections opened, "
+        f"{pool['reuse_rate']:.0%} connection reuse, "
+        f"{'unknown' if pool['open_sockets'] is None else pool['open_sockets']} sockets open at shutdown (best effort)"
+    )
+    print(
+        f"Response cache ({cache['mode']}): {cache['hits']} hits, "
+        f"{cache['misses']} misses ({cache['hit_rate']:.0%} hit rate), "
+        f"{cache['evictions']} evictions"
+    )
+    synced = stats["price_sync"]
+    print(
+        f"Price store: {synced['current']} series current, {synced['delta']} delta fetches "
+        f"({synced['bars_appended']} bars appended), {synced['full']} full fetches"
+    )
+    print(f"Request coalescing: {coalesced['absorbed']} duplicate requests absorbed by {coalesced['calls']} calls")
+    recorded = stats["fixtures"]
+    if recorded["mode"] != "off":
+        print(
+            f"Fixtures ({recorded['mode']}): {recorded['recorded']} recorded, "
+            f"{recorded['replayed']} replayed, {recorded['missing']} missing"
+        )
+
+
+def print_llm_stats(stats: dict) -> None:
+    """Print OpenRouter client and LLM cache statistics.
+
+    Args:
+        stats: Statistics as returned by `llm_stats()`
+    """
+    client = stats["client"]
+    cache = stats["cache"]
+    print(f"LLM: {client['requests']} requests, {client['open_connections']} connections open at shutdown")
+    print(
+        f"LLM cache ({cache['mode']}): {cache['hits']} hits, "
+        f"{cache['misses']} misses ({cache['hit_rate']:.0%} hit rate), "
+        f"{cache['writes']} stored, {cache['evictions']} evictions"
+    )
+
+
+def print_call_summary(summary: dict) -> None:
+    """Print per-call latency, token and cost percentiles for LLM and data API calls.
+
+    Args:
+        summary: Summary as returned by `call_recorder.summary()`
+    """
+    def row(name: str, stats: dict, llm: bool) -> str:
+        line = (
+            f"  {name:<32} {stats['calls']:>5} {stats['cached']:>6} {stats['errors']:>6} "
+            f"{stats['p50_seconds']:>7.2f} {stats['p90_seconds']:>7.2f} {stats['p99_seconds']:>7.2f} {stats['max_seconds']:>7.2f}"
+        )
+        if llm:
+            line += f" {stats['input_tokens']:>9} {stats['output_tokens']:>8} {stats['cost']:>8.4f}"
+        return line
+
+    header = f"  {'':<32} {'calls':>5} {'cached':>6} {'errors':>6} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} {'max s':>7}"
+    llm = summary["llm"]
+    if llm["total"]["calls"]:
+        print(f"\nLLM calls (run {summary['run_id']}):")
+        print(header + f" {'in tok':>9} {'out tok':>8} {'cost $':>8}")
+        for group in ("by_model", "by_analyst"):
+            for name, stats in llm[group].items():
+                print(row(name, stats, llm=True))
+        print(row("total", llm["total"], llm=True))
+
+    data = summary["data"]
+    if data["total"]["calls"]:
+        print("\nData API calls:")
+        print(header)
+        for name, stats in data["by_endpoint"].items():
+            print(row(name, stats, llm=False))
+        print(row("total", data["total"], llm=False))
+
+    decisions = summary.get("decisions")
+    if decisions:
+        print("\nDecision reasoning calls: " + ", ".join(
+            f"{decisions.get(action, 0)} {action}" for action in ("called", "skipped", "deferred")
+        ))
+
+    hedging = summary.get("hedging")
+    if hedging and (hedging["hedged"] or hedging["skipped_no_slot"] or hedging["skipped_budget"]):
+        extra_share = hedging["extra_cost"] / hedging["cost"] if hedging["cost"] else 0.0
+        print(
+            f"\nHedged requests: {hedging['hedged']} of {hedging['calls']} calls ({hedging['hedge_rate']:.1%}), "
+            f"hedge won {hedging['hedge_wins']}, estimated extra spend ${hedging['extra_cost']:.4f} "
+            f"({extra_share:.1%} of LLM cost)"
+        )
+        if hedging["hedged"]:
+            print(
+                "  Extra spend charges each cancelled request the prompt tokens and the winner's output "
+                "tokens pro-rated by its time in flight"
+            )
+        if hedging["skipped_no_slot"] or hedging["skipped_budget"]:
+            print(
+                f"  Not sent: {hedging['skipped_no_slot']} with no free LLM slot (--max-llm-calls), "
+                f"{hedging['skipped_budget']} over budget"
+            )
+
+    pipelines = summary.get("pipelines")
+    if pipelines:
+        print("\nCritical paths (slowest tickers):")
+        for ticker, pipeline in list(pipelines.items())[:CRITICAL_PATHS_SHOWN]:
+            path = " → ".join(f"{node} {seconds:.1f}s" for node, seconds in pipeline["critical_path"])
+            runs = f" (slowest of {pipeline['runs']} runs)" if pipeline["runs"] > 1 else ""
+            print(f"  {ticker:<8} {pipeline['seconds']:>6.1f}s: {path}{runs}")
+
+
+def print_routing_report(report: dict) -> None:
+    """Print what model routing saved against sending every call to one model.
+
+    Args:
+        report: Report as returned by `RoutingTable.report()`
+    """
+    models = ", ".join(f"{count} {model}" for model, count in report["calls_by_model"].items())
+    print(f"\nModel routing: {report['calls']} calls ({models}), {report['escalations']} escalations")
+    print(
+        f"  Cost: ${report['actual_cost']:.4f} vs ${report['baseline_cost']:.4f} on {report['baseline_model']} "
+        f"(saved ${report['cost_saved']:.4f})"
+    )
+    if report["baseline_seconds"] is None:
+        print(f"  Latency: {report['actual_seconds']:.1f} call-seconds (no {report['baseline_model']} calls to compare with)")
+    else:
+        print(
+            f"  Latency: {report['actual_seconds']:.1f} vs {report['baseline_seconds']:.1f} call-seconds "
+            f"(saved {report['seconds_saved']:.1f})"
+        )
+
+
+def report_call_metrics(metrics_file: Optional[str] = None, model_name: str = DEFAULT_MODEL) -> None:
+    """Print the run's call summary and write every call to a JSON Lines file.
+
+    Args:
+        metrics_file: File to write (defaults to `metrics/<run id>.jsonl` under the cache directory)
+        model_name: Model of the run, the baseline routing savings are measured against
+    """
+    print_call_summary(call_recorder.summary())
+    if model_routing.is_routed():
+        print_routing_report(model_routing.report(call_recorder.records, model_name))
+    path = Path(metrics_file) if metrics_file else CACHE_DIR / "metrics" / f"{call_recorder.run_id}.jsonl"
+    print(f"Call metrics written to {call_recorder.write_jsonl(path)}")
 
 
 async def run_historical_backtest(
@@ -87,7 +349,9 @@ async def run_historical_backtest(
     max_positions: int = 10,
     position_size_limit: float = 10.0,
     rebalance_frequency: int = 30,
-    stop_loss_enabled: bool = True
+    stop_loss_enabled: bool = True,
+    model_name: str = DEFAULT_MODEL,
+    metrics_file: Optional[str] = None
 ) -> None:
     """Run a historical backtest for a list of tickers.
 
@@ -100,6 +364,8 @@ async def run_historical_backtest(
         position_size_limit: Maximum position size as percentage
         rebalance_frequency: Rebalance frequency in days
         stop_loss_enabled: Whether to use stop-loss for positions
+        model_name: Name of the model to use for analysis
+        metrics_file: JSON Lines file the per-call metrics are written to
     """
     print("🦔 Hedgehog AI Hedge Fund - Backtester 🦔")
     print(f"Running backtest for {len(tickers)} stocks from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
@@ -114,11 +380,19 @@ async def run_historical_backtest(
         max_positions=max_positions,
         position_size_limit=position_size_limit,
         rebalance_frequency=rebalance_frequency,
-        stop_loss_enabled=stop_loss_enabled
+        stop_loss_enabled=stop_loss_enabled,
+        model=model_name
     )
 
     # Run the backtest
-    result = await run_backtest(params)
+    try:
+        result = await run_backtest(params)
+    finally:
+        incremental_analyses.close()
+        api_stats = data_api_stats()
+        model_stats = llm_stats()
+        await close_api_clients()
+        await close_llm_clients()
 
     # Print the results
     print("\nBacktest Results:")
@@ -157,6 +431,161 @@ async def run_historical_backtest(
     else:
         print("No closed trades")
 
+    print_data_api_stats(api_stats)
+    print_llm_stats(model_stats)
+    print_incremental_stats(incremental_analyses.stats())
+    report_call_metrics(metrics_file, model_name)
+
+
+def load_universe(path: str) -> List[str]:
+    """Read ticker symbols from a universe file.
+
+    Tickers may be separated by newlines, commas or spaces; anything after a
+    `#` on a line is ignored.
+
+    Args:
+        path: Path of the universe file
+
+    Returns:
+        Unique upper-case ticker symbols in file order
+    """
+    tickers = []
+    with open(path) as universe:
+        for line in universe:
+            tickers.extend(t.upper() for t in re.split(r"[\s,]+", line.split("#", 1)[0]) if t)
+    return list(dict.fromkeys(tickers))
+
+
+async def warm_caches(
+    tickers: List[str],
+    concurrency: int = 16,
+    period: str = "1y",
+    news_limit: int = 20
+) -> None:
+    """Prefetch company data, financials, peers, news and prices into the local caches.
+
+    Args:
+        tickers: Ticker symbols to prefetch
+        concurrency: Maximum number of tickers fetched at once per dataset
+        period: Price history period to keep in the price store
+        news_limit: Number of news articles to prefetch per ticker
+    """
+    print(f"🦔 Warming caches for {len(tickers)} tickers (concurrency {concurrency})")
+
+    datasets = {
+        "company data": fetch_company_data_many(tickers, concurrency=concurrency),
+        "peers": fetch_peer_companies_many(tickers, concurrency=concurrency),
+        "news": fetch_news_data_many(tickers, limit=news_limit, concurrency=concurrency),
+        "prices": fetch_price_series_many(tickers, period=period, concurrency=concurrency),
+    }
+    failures = {name: {} for name in datasets}
+
+    async def drain(name: str, results) -> None:
+        async for ticker, result in results:
+            if isinstance(result, Exception):
+                failures[name][ticker] = str(result)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(drain(name, results) for name, results in datasets.items()))
+    finally:
+        api_stats = data_api_stats()
+        await close_api_clients()
+    elapsed = time.perf_counter() - started
+
+    print(f"\nFinished in {elapsed:.1f}s ({len(tickers) / elapsed if elapsed else 0:.1f} tickers/s)")
+    for name, failed in failures.items():
+        print(f"  {name:<13} {len(tickers) - len(failed)}/{len(tickers)} ok")
+
+    for name, failed in failures.items():
+        for ticker, error in failed.items():
+            print(f"  ✗ {name} [{ticker}]: {error}")
+
+    pool = api_stats["pool"]
+    print(f"Network requests: {pool['requests']} ({pool['requests'] / elapsed if elapsed else 0:.1f}/s)")
+    throttled = sum(limiter["throttled"] for limiter in api_stats["rate_limits"].values())
+    if throttled:
+        print(f"Rate limited: {throttled} requests delayed")
+    print_data_api_stats(api_stats)
+
+
+def add_data_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add options controlling the financial data layer to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default="use", help="Response cache mode")
+    parser.add_argument("--max-data-requests", type=int, default=20, help="Maximum data API requests in flight")
+    fixture_group = parser.add_mutually_exclusive_group()
+    fixture_group.add_argument("--record", metavar="ARCHIVE", help="Record all data API responses to an archive")
+    fixture_group.add_argument("--replay", metavar="ARCHIVE", help="Serve data API responses from a recorded archive")
+    parser.add_argument("--replay-latency-ms", type=float, default=0.0, help="Median synthetic latency for replayed responses")
+    parser.add_argument("--replay-latency-sigma", type=float, default=0.5, help="Log-normal spread of the synthetic latency")
+
+
+def add_llm_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add options controlling LLM calls to a subcommand.
+
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument("--max-llm-calls", type=int, default=8, help="Maximum LLM calls in flight across all tickers")
+    parser.add_argument("--llm-cache", choices=CACHE_MODES, default="use", help="LLM response cache mode")
+    parser.add_argument("--routing", help="JSON routing table of model cascades per analyst role")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream LLM responses and start each decision once every analyst has rated the stock")
+    parser.add_argument("--decision-policy", choices=DECISION_POLICIES, default="always",
+                        help="Skip or defer the portfolio manager's reasoning call when analysts agree")
+    parser.add_argument("--consensus-threshold", type=float, default=1.0,
+                        help="Share of analysts agreeing on a recommendation for the decision policy to apply")
+    parser.add_argument("--metrics-file", help="JSON Lines file for per-call LLM and data API metrics")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Duplicate LLM requests that take longer than usual and keep the first result")
+    parser.add_argument("--hedge-percentile", type=float, default=DEFAULT_HEDGE_PERCENTILE,
+                        help="Latency percentile of recent calls after which a request is duplicated")
+    parser.add_argument("--hedge-model", help="Model duplicate requests are sent to (default: the same model)")
+    parser.add_argument("--hedge-budget", type=float, default=DEFAULT_HEDGE_BUDGET,
+                        help="Share of the LLM spend that duplicate requests may add (share of calls for unpriced models)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse earlier analyses whose inputs have not materially changed")
+    parser.add_argument("--materiality", help="JSON file of materiality thresholds for --incremental")
+
+
+def configure_llm(args: argparse.Namespace) -> None:
+    """Apply the LLM options parsed by `add_llm_arguments`.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    configure_llm_concurrency(args.max_llm_calls)
+    configure_llm_streaming(args.stream)
+    if args.routing:
+        configure_routing(RoutingTable.from_file(args.routing))
+    configure_decision_policy(args.decision_policy, args.consensus_threshold)
+    configure_incremental(args.incremental, args.materiality)
+    configure_hedging(args.hedge, args.hedge_percentile, args.hedge_budget, args.hedge_model)
+    llm_cache.mode = args.llm_cache
+
+
+def configure_data_layer(args: argparse.Namespace) -> None:
+    """Apply the data layer options parsed by `add_data_arguments`.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    response_cache.mode = args.cache_mode
+    http_client.configure(limit=args.max_data_requests, limit_per_host=args.max_data_requests)
+    if args.record:
+        fixtures.configure("record", args.record)
+    elif args.replay:
+        fixtures.configure(
+            "replay",
+            args.replay,
+            latency_ms=args.replay_latency_ms,
+            latency_sigma=args.replay_latency_sigma
+        )
+
 
 def main():
     """Main entry point for the application."""
@@ -167,10 +596,14 @@ def main():
 
     # Analyze command
     analyze_parser = subparsers.add_parser("analyze", help="Analyze stocks")
-    analyze_parser.add_argument("tickers", nargs="+", help="Ticker symbols to analyze")
-    analyze_parser.add_argument("--model", default="anthropic/claude-3.5-sonnet", help="Model to use for analysis")
+    analyze_parser.add_argument("tickers", nargs="*", help="Ticker symbols to analyze (default: those of the resumed run)")
+    analyze_parser.add_argument("--model", default=DEFAULT_MODEL, help="Model to use for analysis")
     analyze_parser.add_argument("--show-reasoning", action="store_true", help="Show detailed reasoning in output")
     analyze_parser.add_argument("--interactive", action="store_true", help="Use interactive CLI selectors")
+    analyze_parser.add_argument("--concurrency", type=int, default=4, help="Tickers analyzed at once")
+    analyze_parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted run, skipping finished analyses")
+    add_llm_arguments(analyze_parser)
+    add_data_arguments(analyze_parser)
 
     # Backtest command
     backtest_parser = subparsers.add_parser("backtest", help="Run a historical backtest")
@@ -182,17 +615,40 @@ def main():
     backtest_parser.add_argument("--position-size", type=float, default=10.0, help="Maximum position size as percentage")
     backtest_parser.add_argument("--rebalance", type=int, default=30, help="Rebalance frequency in days")
     backtest_parser.add_argument("--no-stop-loss", action="store_true", help="Disable stop-loss")
+    backtest_parser.add_argument("--model", default=DEFAULT_MODEL, help="Model to use for analysis")
+    add_llm_arguments(backtest_parser)
+    add_data_arguments(backtest_parser)
+
+    # Warm command
+    warm_parser = subparsers.add_parser("warm", help="Prefetch data for a universe into the local caches")
+    warm_parser.add_argument("universe", help="File listing the ticker symbols to prefetch")
+    warm_parser.add_argument("--concurrency", type=int, default=16, help="Tickers fetched at once per dataset")
+    warm_parser.add_argument("--period", default="1y", help="Price history period to prefetch")
+    warm_parser.add_argument("--news-limit", type=int, default=20, help="News articles to prefetch per ticker")
+    add_data_arguments(warm_parser)
 
     # Parse arguments
     args = parser.parse_args()
 
+    # Configure the data layer
+    if args.command in ("analyze", "backtest", "warm"):
+        configure_data_layer(args)
+    if args.command in ("analyze", "backtest"):
+        configure_llm(args)
+
+    if args.command == "analyze" and not args.tickers and not args.resume:
+        analyze_parser.error("the following arguments are required: tickers (unless resuming a run)")
+
     # Run the appropriate command
     if args.command == "analyze":
         asyncio.run(analyze_stocks(
             args.tickers,
             args.model,
             show_reasoning=args.show_reasoning,
-            interactive=args.interactive
+            interactive=args.interactive,
+            concurrency=args.concurrency,
+            metrics_file=args.metrics_file,
+            resume=args.resume
         ))
     elif args.command == "backtest":
         # Parse dates
@@ -208,7 +664,16 @@ def main():
             max_positions=args.max_positions,
             position_size_limit=args.position_size,
             rebalance_frequency=args.rebalance,
-            stop_loss_enabled=not args.no_stop_loss
+            stop_loss_enabled=not args.no_stop_loss,
+            model_name=args.model,
+            metrics_file=args.metrics_file
+        ))
+    elif args.command == "warm":
+        asyncio.run(warm_caches(
+            load_universe(args.universe),
+            concurrency=args.concurrency,
+            period=args.period,
+            news_limit=args.news_limit
         ))
     else:
         parser.print_help()
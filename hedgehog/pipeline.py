@@ -0,0 +1,334 @@
+"""Dependency-driven scheduler for the per-ticker analysis pipeline.
+
+The pipeline is a DAG of nodes. Each node names the outputs it reads and the
+scheduler starts it as soon as all of them are available, so independent
+nodes (the data fetches, the analysts) run concurrently. Besides its result a
+node may publish named early outputs while it is still running, such as an
+analyst's headline that the decision can start from.
+
+Every run keeps the state of each node (status, timings, which input it
+waited on last), which is persisted as JSON and used to report the run's
+critical path.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from hedgehog.instrumentation import events
+from hedgehog.tools.cache import CACHE_DIR
+
+# Node states are persisted under <run id>/<ticker>.json here
+PIPELINE_STATE_DIR = CACHE_DIR / "runs"
+
+
+class Node:
+    """A step of the pipeline."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[["NodeContext"], Awaitable[Any]],
+        deps: Iterable[str] = (),
+        early: Optional[Dict[str, Callable[[Any], Any]]] = None
+    ):
+        """Initialize the node.
+
+        Args:
+            name: Unique node name, which is also the name of its result
+            run: Coroutine function computing the result from a NodeContext
+            deps: Outputs the node reads: node names, or "node:output" for an
+                early output
+            early: Early outputs the node may publish while running, each with
+                a function deriving it from the result if it was not published
+        """
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.early = dict(early or {})
+
+    def outputs(self) -> List[str]:
+        """Return the names of every output of the node."""
+        return [self.name, *(f"{self.name}:{output}" for output in self.early)]
+
+
+class NodeContext:
+    """What a running node sees of the pipeline run."""
+
+    def __init__(self, run: "PipelineRun", node: Node, inputs: Dict[str, Any]):
+        """Initialize the context.
+
+        Args:
+            run: The pipeline run
+            node: The node being run
+            inputs: Values of the node's dependencies by output name
+        """
+        self._run = run
+        self.node = node
+        self.inputs = inputs
+
+    def publish(self, output: str, value: Any) -> bool:
+        """Publish an early output; later publications of the same output are ignored.
+
+        Args:
+            output: Name of the early output, as declared by the node
+            value: Value of the output
+
+        Returns:
+            Whether this was the first publication of the output
+        """
+        if output not in self.node.early:
+            raise KeyError(f"Node {self.node.name!r} declares no early output {output!r}")
+        return self._run._resolve(f"{self.node.name}:{output}", value)
+
+
+class NodeState:
+    """Status and timings of a node in one run, in seconds from the start of the run."""
+
+    __slots__ = ("status", "ready", "started", "finished", "waited_on", "error")
+
+    def __init__(self):
+        """Initialize a pending node state."""
+        self.status = "pending"
+        self.ready: Optional[float] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.waited_on: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the state as a JSON-serializable dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PipelineRun:
+    """One execution of a pipeline."""
+
+    def __init__(self, pipeline: "Pipeline", name: str):
+        """Initialize the run.
+
+        Args:
+            pipeline: Pipeline being run
+            name: Name of the run (e.g. the ticker), used in events and state
+        """
+        self.pipeline = pipeline
+        self.name = name
+        self.states: Dict[str, NodeState] = {node: NodeState() for node in pipeline.nodes}
+        self.results: Dict[str, Any] = {}
+        self.produced: Dict[str, float] = {}
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _resolve(self, output: str, value: Any) -> bool:
+        future = self._futures[output]
+        if future.done():
+            return False
+        self.produced[output] = self._now()
+        future.set_result(value)
+        return True
+
+    def _fail(self, node: Node, error: BaseException) -> None:
+        for output in node.outputs():
+            future = self._futures[output]
+            if not future.done():
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+                    # Dependants re-raise it; an output nobody reads must not warn
+                    future.exception()
+
+    async def _execute(self, node: Node) -> Any:
+        state = self.states[node.name]
+        try:
+            values = await asyncio.gather(*(self._futures[dep] for dep in node.deps))
+        except BaseException as e:
+            state.status = "skipped"
+            self._fail(node, e)
+            raise
+
+        state.ready = self._now()
+        state.waited_on = max(node.deps, key=lambda dep: self.produced.get(dep, 0.0)) if node.deps else None
+        state.started = self._now()
+        state.status = "running"
+        events.emit("node_started", ticker=self.name, node=node.name)
+        try:
+            result = await node.run(NodeContext(self, node, dict(zip(node.deps, values))))
+        except BaseException as e:
+            state.finished = self._now()
+            state.status = "cancelled" if isinstance(e, asyncio.CancelledError) else "failed"
+            state.error = None if isinstance(e, asyncio.CancelledError) else str(e)
+            self._fail(node, e)
+            raise
+
+        state.finished = self._now()
+        state.status = "done"
+        self.results[node.name] = result
+        self._resolve(node.name, result)
+        for output, derive in node.early.items():
+            self._resolve(f"{node.name}:{output}", derive(result))
+        events.emit("node_finished", ticker=self.name, node=node.name, duration=state.finished - state.started)
+        return result
+
+    async def execute(self) -> Dict[str, Any]:
+        """Run every node as soon as its dependencies are available.
+
+        Returns:
+            Results by node name
+
+        Raises:
+            Exception: The first node failure; the remaining nodes are cancelled
+        """
+        loop = asyncio.get_running_loop()
+        self._futures = {output: loop.create_future() for node in self.pipeline.nodes.values() for output in node.outputs()}
+        tasks = [asyncio.create_task(self._execute(node)) for node in self.pipeline.nodes.values()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            events.emit("pipeline_finished", ticker=self.name, seconds=self.seconds(), critical_path=self.critical_path())
+        return self.results
+
+    def seconds(self) -> float:
+        """Return the wall time of the run so far."""
+        finished = [state.finished for state in self.states.values() if state.finished is not None]
+        return max(finished, default=0.0)
+
+    def critical_path(self) -> List[Tuple[str, float]]:
+        """Return the chain of nodes that determined the run's wall time.
+
+        Starting from the node that finished last, each node is followed back
+        to the input it waited on longest. A node's share of the path runs from
+        its start to the moment the output its successor waited on was produced.
+
+        Returns:
+            (node, seconds) pairs in execution order
+        """
+        finished = {name: state for name, state in self.states.items() if state.finished is not None}
+        if not finished:
+            return []
+        name = max(finished, key=lambda node: finished[node].finished)
+        end = finished[name].finished
+        path = []
+        while name is not None:
+            state = self.states[name]
+            path.append((name, end - (state.started or 0.0)))
+            if state.waited_on is None:
+                break
+            end = self.produced.get(state.waited_on, state.started or 0.0)
+            name = state.waited_on.split(":", 1)[0]
+        return list(reversed(path))
+
+    def state(self) -> Dict[str, Any]:
+        """Return the run's node states as a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "seconds": self.seconds(),
+            "nodes": {name: state.to_dict() for name, state in self.states.items()},
+            "critical_path": self.critical_path(),
+        }
+
+    def save(self, path: Path) -> Path:
+        """Persist the run's node states as JSON.
+
+        Args:
+            path: File to write
+
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.state(), indent=2), encoding="utf-8")
+        return path
+
+
+class Pipeline:
+    """A DAG of nodes, run by a dependency-driven scheduler."""
+
+    def __init__(self, nodes: Iterable[Node] = ()):
+        """Initialize the pipeline.
+
+        Args:
+            nodes: Initial nodes
+        """
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: Node) -> None:
+        """Add a node.
+
+        Args:
+            node: Node to add; its name must be unique
+        """
+        if node.name in self.nodes:
+            raise ValueError(f"Pipeline already has a node {node.name!r}")
+        self.nodes[node.name] = node
+
+    def remove(self, name: str) -> None:
+        """Remove a node.
+
+        Args:
+            name: Name of the node to remove
+        """
+        del self.nodes[name]
+
+    def validate(self) -> None:
+        """Check that every dependency exists and the nodes form no cycle.
+
+        Raises:
+            ValueError: If a dependency is missing or there is a cycle
+        """
+        outputs = {output: node.name for node in self.nodes.values() for output in node.outputs()}
+        for node in self.nodes.values():
+            for dep in node.deps:
+                if dep not in outputs:
+                    raise ValueError(f"Node {node.name!r} depends on unknown output {dep!r}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through {name!r}")
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(outputs[dep])
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    async def run(self, name: str = "pipeline", state_path: Optional[Path] = None) -> PipelineRun:
+        """Validate the pipeline and run it.
+
+        Args:
+            name: Name of the run (e.g. the ticker)
+            state_path: File the node states are persisted to when the run
+                ends, successfully or not
+
+        Returns:
+            The finished run, with results and node states
+        """
+        self.validate()
+        run = PipelineRun(self, name)
+        try:
+            await run.execute()
+        finally:
+            if state_path is not None:
+                run.save(state_path)
+        return run
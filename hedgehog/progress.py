@@ -6,6 +6,8 @@ import threading
 import time
 from typing import Dict, List, Optional, Set
 
+from hedgehog.instrumentation import Event, events
+
 # Terminal colors
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -33,6 +35,8 @@ class ProgressTracker:
         self._selected_model: Optional[str] = None
         self._running = False
         self._completed_analysts: Set[str] = set()
+        self._errors: List[str] = []
+        self._deciding: Dict[str, List[str]] = {}  # {ticker: analysts waiting on the decision}
         self._display_thread = None
         self._dark_mode = dark_mode
 
@@ -88,10 +92,74 @@ class ProgressTracker:
 
             self._status[analyst][ticker] = status
 
-            # Mark as completed if the status is "Done"
-            if status.lower() == "done":
+            # Mark as completed if the status is "Done" (possibly qualified)
+            if status.lower().startswith("done"):
                 self._completed_analysts.add(f"{analyst}:{ticker}")
 
+    def handle_event(self, event: Event) -> None:
+        """Update statuses from a pipeline event.
+
+        Args:
+            event: Event emitted on the instrumentation bus
+        """
+        if event.ticker is None or event.analyst is None:
+            return
+
+        if event.name == "decision_started":
+            self._deciding[event.ticker] = list(event.data.get("analysts", []))
+            for analyst in self._deciding[event.ticker]:
+                self.update_status(analyst, event.ticker, "Making investment decision")
+            return
+        if event.name == "decision_finished":
+            for analyst in self._deciding.pop(event.ticker, event.data.get("analysts", [])):
+                self.update_status(analyst, event.ticker, "Done")
+            return
+
+        if event.name == "analysis_started":
+            status = "Preparing analysis"
+        elif event.name == "waiting_for_data":
+            status = f"Waiting for {event.data.get('source', 'data')}"
+        elif event.name == "fetch_started":
+            status = f"Fetching {event.data.get('endpoint', 'data')}"
+        elif event.name == "llm_request":
+            status = f"Sent request to {event.data.get('model', 'model')}"
+        elif event.name == "llm_cache_hit":
+            status = "Using cached response"
+        elif event.name == "llm_first_token":
+            status = "Receiving response"
+        elif event.name == "llm_partial":
+            field = event.data.get("field")
+            status = f"Receiving {field.replace('_', ' ')}: {event.data.get('text', '')}" if field else f"Receiving: {event.data.get('text', '')}"
+        elif event.name == "analysis_headline":
+            status = f"{event.data.get('recommendation')} ({event.data.get('rating')}/10), receiving details"
+        elif event.name == "llm_completed":
+            status = "Parsing response"
+        elif event.name == "analysis_finished":
+            status = "Done"
+        elif event.name == "analysis_restored":
+            status = "Done (restored from checkpoint)"
+        elif event.name == "analysis_reused":
+            status = f"Done (reused: {event.data.get('reason', 'inputs unchanged')})"
+        else:
+            return
+
+        # The decision's own progress is shown on the rows of the analysts it combines
+        if event.ticker in self._deciding and event.analyst not in self._status:
+            status = f"Decision: {status.lower()}"
+            for analyst in self._deciding[event.ticker]:
+                self.update_status(analyst, event.ticker, status)
+        else:
+            self.update_status(event.analyst, event.ticker, status)
+
+    def log_error(self, message: str) -> None:
+        """Record an error message to show below the analyst statuses.
+
+        Args:
+            message: Error message
+        """
+        with self._lock:
+            self._errors.append(message)
+
     def _get_color(self, color_type: str) -> str:
         """Get the appropriate color based on the current mode.
 
@@ -175,7 +243,7 @@ class ProgressTracker:
                     continue
 
                 # Select appropriate status indicator and color
-                if status.lower() == "done":
+                if status.lower().startswith("done"):
                     indicator = "✓"
                     color = green
                 else:
@@ -192,6 +260,12 @@ class ProgressTracker:
 
                 print(f"{indicator} {display_name:<15} [{cyan}{ticker}{RESET}] {color}{status}{RESET}")
 
+        # Print the most recent errors
+        if self._errors:
+            print("")
+            for message in self._errors[-5:]:
+                print(f"{red}✗ {message}{RESET}")
+
     def start_display(self) -> None:
         """Start the progress display."""
         if self._running:
@@ -246,4 +320,5 @@ class ProgressTracker:
             return len(self._completed_analysts) >= total_expected
 
 # Global instance - initialized with light mode by default
-progress = ProgressTracker(dark_mode=False)
\ No newline at end of file
+progress = ProgressTracker(dark_mode=False)
+events.subscribe(progress.handle_event)
\ No newline at end of file
@@ -1,16 +1,197 @@
 """API tools for fetching financial data to power the hedge fund analysis."""
 
+import asyncio
 import os
-import aiohttp
-from typing import Dict, Any, List
+import time
+from datetime import date
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Iterable, Tuple
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 
+from hedgehog.instrumentation import events
+from hedgehog.tools.cache import CACHE_DIR, DiskCache
+from hedgehog.tools.fixtures import fixtures, request_key
+from hedgehog.tools.http_client import http_client
+from hedgehog.tools.prices import PriceSeries, PriceSeriesBuilder, period_start, price_store, to_day
+from hedgehog.tools.streaming import iter_json_array
+from hedgehog.tools.ratelimit import TokenBucket
+from hedgehog.tools.singleflight import SingleFlight
+
 # Load environment variables
 load_dotenv()
 
 # API Keys
 FINANCIAL_DATASETS_API_KEY = os.getenv("FINANCIAL_DATASETS_API_KEY")
 
+BASE_URL = os.getenv("FINANCIAL_DATASETS_BASE_URL", "https://financialdatasets.ai/api/v1")
+
+# How long responses from each endpoint stay fresh in the response cache (seconds)
+ENDPOINT_TTLS = {
+    "companies": 7 * 24 * 3600,
+    "financials": 24 * 3600,
+    "peers": 30 * 24 * 3600,
+    "prices": 12 * 3600,
+    "news": 3600,
+}
+
+# Shared on-disk response cache
+response_cache = DiskCache(CACHE_DIR / "responses.sqlite3")
+
+# Coalesces identical requests made within a run
+single_flight = SingleFlight()
+
+# Default request rate (per second) and burst size for each endpoint
+DEFAULT_RATE_LIMIT = (10.0, 10)
+
+# Per-endpoint token buckets guarding network requests
+rate_limiters: Dict[str, TokenBucket] = {
+    endpoint: TokenBucket(*DEFAULT_RATE_LIMIT) for endpoint in ENDPOINT_TTLS
+}
+
+# How fetch_price_series satisfied each request: from the store, by a delta fetch, or by a full refetch
+price_sync_stats = {"current": 0, "delta": 0, "full": 0, "bars_appended": 0}
+
+# Default number of tickers fetched at once by the fetch_*_many functions
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+def configure_rate_limit(endpoint: str, rate: float, burst: int) -> None:
+    """Set the request rate limit for an API endpoint.
+
+    Args:
+        endpoint: API endpoint name (e.g. 'prices')
+        rate: Maximum sustained requests per second
+        burst: Maximum number of requests allowed in a burst
+    """
+    rate_limiters[endpoint] = TokenBucket(rate, burst)
+
+
+async def _get_json(endpoint: str, ticker: str, error_message: str, **params: Any) -> Any:
+    """Fetch a JSON payload from the financial data API.
+
+    Identical requests within a run share a single call, which reads through
+    the response cache before going to the network.
+
+    Args:
+        endpoint: API endpoint name (e.g. 'companies', 'prices')
+        ticker: Stock ticker symbol
+        error_message: Message prefix used if the request fails
+        **params: Extra query parameters
+
+    Returns:
+        The decoded JSON payload
+    """
+    key = request_key(endpoint, ticker, params)
+
+    events.emit("fetch_started", ticker=ticker, endpoint=endpoint, key=key)
+    started = time.perf_counter()
+    try:
+        data = await single_flight.do(endpoint, key, lambda: _load(endpoint, key, ticker, error_message, params))
+    except Exception as e:
+        events.emit("fetch_finished", ticker=ticker, endpoint=endpoint, key=key,
+                    duration=time.perf_counter() - started, error=str(e))
+        raise
+
+    events.emit("fetch_finished", ticker=ticker, endpoint=endpoint, key=key, duration=time.perf_counter() - started)
+    return data
+
+
+async def _load(endpoint: str, key: str, ticker: str, error_message: str, params: Dict[str, Any]) -> Any:
+    """Load a payload from the response cache, falling back to the network.
+
+    When fixtures are being recorded or replayed the response cache is
+    bypassed so that every request is captured or served from the archive.
+
+    Args:
+        endpoint: API endpoint name
+        key: Request key
+        ticker: Stock ticker symbol
+        error_message: Message prefix used if the request fails
+        params: Extra query parameters
+
+    Returns:
+        The decoded JSON payload
+    """
+    if fixtures.mode == "replay":
+        return await fixtures.replay(key)
+
+    use_cache = fixtures.mode == "off"
+    if use_cache:
+        cached = response_cache.get(endpoint, key, ttl=ENDPOINT_TTLS.get(endpoint))
+        if cached is not None:
+            return cached
+
+    limiter = rate_limiters.get(endpoint)
+    if limiter is not None:
+        await limiter.acquire()
+
+    url = f"{BASE_URL}/{endpoint}/{ticker}?{urlencode({**params, 'apikey': FINANCIAL_DATASETS_API_KEY or ''})}"
+    try:
+        data = await http_client.get_json(url, error_message)
+    except Exception as e:
+        fixtures.record_error(key, e)
+        raise
+
+    fixtures.record(key, data)
+    if use_cache:
+        response_cache.put(endpoint, key, data)
+    return data
+
+
+async def _stream_items(
+    endpoint: str,
+    ticker: str,
+    array_key: str,
+    error_message: str,
+    **params: Any
+) -> AsyncIterator[Any]:
+    """Stream the items of an array-valued API response as they are decoded.
+
+    Cached, recorded and replayed responses are served whole from the usual
+    layers; network responses are decoded incrementally from the socket and
+    are not written to the response cache (price bars are kept in the price
+    store instead).
+
+    Args:
+        endpoint: API endpoint name (e.g. 'prices')
+        ticker: Stock ticker symbol
+        array_key: Field of the response holding the array
+        error_message: Message prefix used if the request fails
+        **params: Extra query parameters
+
+    Yields:
+        Each array item, in order
+    """
+    key = request_key(endpoint, ticker, params)
+    if fixtures.mode != "off":
+        cached = await _get_json(endpoint, ticker, error_message, **params)
+    else:
+        cached = response_cache.get(endpoint, key, ttl=ENDPOINT_TTLS.get(endpoint))
+
+    if cached is not None:
+        items = cached.get(array_key) if isinstance(cached, dict) else cached
+        for item in items or []:
+            yield item
+        return
+
+    limiter = rate_limiters.get(endpoint)
+    if limiter is not None:
+        await limiter.acquire()
+
+    events.emit("fetch_started", ticker=ticker, endpoint=endpoint, key=key, streaming=True)
+    started = time.perf_counter()
+    url = f"{BASE_URL}/{endpoint}/{ticker}?{urlencode({**params, 'apikey': FINANCIAL_DATASETS_API_KEY or ''})}"
+    try:
+        async for item in iter_json_array(http_client.iter_chunks(url, error_message), array_key):
+            yield item
+    except Exception as e:
+        events.emit("fetch_finished", ticker=ticker, endpoint=endpoint, key=key, streaming=True,
+                    duration=time.perf_counter() - started, error=str(e))
+        raise
+
+    events.emit("fetch_finished", ticker=ticker, endpoint=endpoint, key=key, streaming=True,
+                duration=time.perf_counter() - started)
+
 
 async def fetch_company_data(ticker: str) -> Dict[str, Any]:
     """Fetch comprehensive company data for a given ticker.
@@ -21,50 +202,124 @@ async def fetch_company_data(ticker: str) -> Dict[str, Any]:
     Returns:
         Dict containing company information, financials, and statistics
     """
+    # Basic company info and financial statements, fetched concurrently
+    company_data, financial_data = await asyncio.gather(
+        _get_json("companies", ticker, f"Failed to fetch company data for {ticker}"),
+        _get_json("financials", ticker, f"Failed to fetch financial data for {ticker}"),
+    )
 
-    async with aiohttp.ClientSession() as session:
-        # Basic company info
-        company_url = f"https://financialdatasets.ai/api/v1/companies/{ticker}?apikey={FINANCIAL_DATASETS_API_KEY}"
-        async with session.get(company_url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch company data for {ticker}: {response.status}")
-            company_data = await response.json()
-
-        # Financial statements
-        financials_url = f"https://financialdatasets.ai/api/v1/financials/{ticker}?apikey={FINANCIAL_DATASETS_API_KEY}"
-        async with session.get(financials_url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch financial data for {ticker}: {response.status}")
-            financial_data = await response.json()
-
-        # Combine the data
-        result = {
-            "company_info": company_data,
-            "financials": financial_data
-        }
+    # Combine the data
+    result = {
+        "company_info": company_data,
+        "financials": financial_data
+    }
 
-        return result
+    return result
 
 
-async def fetch_price_history(ticker: str, period: str = "1y") -> Dict[str, Any]:
+async def fetch_price_history(ticker: str, period: str = "1y", start_date: Optional[str] = None) -> Dict[str, Any]:
     """Fetch historical price data for a given ticker.
 
     Args:
         ticker: Stock ticker symbol
         period: Time period for the data (e.g., '1d', '1m', '1y')
+        start_date: Only fetch bars from this date (YYYY-MM-DD) onwards, instead of a period
 
     Returns:
         Dict containing historical price data
     """
+    params = {"start_date": start_date} if start_date else {"period": period}
+    price_data = await _get_json("prices", ticker, f"Failed to fetch price history for {ticker}", **params)
+
+    return price_data
+
+
+def iter_price_bars(ticker: str, period: str = "1y", start_date: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Stream price bars for a ticker as they are decoded from the response.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Time period for the data (e.g., '1d', '1m', '1y')
+        start_date: Only fetch bars from this date (YYYY-MM-DD) onwards, instead of a period
+
+    Returns:
+        Async iterator of bar dicts
+    """
+    params = {"start_date": start_date} if start_date else {"period": period}
+    return _stream_items("prices", ticker, "prices", f"Failed to fetch price history for {ticker}", **params)
+
+
+async def stream_price_series(ticker: str, period: str = "1y", start_date: Optional[str] = None) -> PriceSeries:
+    """Fetch price history, decoding bars straight into typed arrays.
+
+    Identical requests within a run share a single download.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Time period for the data (e.g., '1d', '1m', '1y')
+        start_date: Only fetch bars from this date (YYYY-MM-DD) onwards, instead of a period
+
+    Returns:
+        PriceSeries with one bar per trading day
+    """
+    async def download() -> PriceSeries:
+        builder = PriceSeriesBuilder(ticker)
+        async for bar in iter_price_bars(ticker, period, start_date):
+            builder.append(bar)
+        return builder.build()
+
+    params = {"start_date": start_date} if start_date else {"period": period}
+    key = "series:" + request_key("prices", ticker, params)
+    return await single_flight.do("prices", key, download)
+
+
+async def fetch_price_series(ticker: str, period: str = "1y") -> PriceSeries:
+    """Fetch historical prices for a ticker as a columnar price series.
+
+    Bars are kept in the local price store. When the stored history already
+    covers the period, only bars from its last stored day onwards are
+    requested and appended; the full period is refetched only when there is
+    nothing stored, the stored history is too short, or the new bars reveal
+    a gap or a corporate-action adjustment.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Time period for the data (e.g., '1d', '1m', '1y')
+
+    Returns:
+        PriceSeries with one bar per trading day
+    """
+    stored = price_store.load(ticker) if response_cache.mode != "off" else None
+    today = to_day(date.today())
 
-    async with aiohttp.ClientSession() as session:
-        price_url = f"https://financialdatasets.ai/api/v1/prices/{ticker}?period={period}&apikey={FINANCIAL_DATASETS_API_KEY}"
-        async with session.get(price_url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch price history for {ticker}: {response.status}")
-            price_data = await response.json()
+    if stored is not None and len(stored):
+        start = period_start(period, today)
+        # Allow a few days of slack for weekends and holidays at the start of the period
+        covers_period = start is not None and stored.first_date <= start + 5
 
-        return price_data
+        # A series saved within the price TTL counts as current, as does one holding today's bar
+        age = price_store.age(ticker)
+        recently_saved = response_cache.mode == "use" and age is not None and age < ENDPOINT_TTLS["prices"]
+        if covers_period and (stored.last_date >= today or recently_saved):
+            price_sync_stats["current"] += 1
+            return stored.window(start)
+
+        if covers_period:
+            newer = await stream_price_series(ticker, start_date=str(stored.last_date))
+            merged = stored.merge(newer)
+            if merged is not None:
+                price_sync_stats["delta"] += 1
+                price_sync_stats["bars_appended"] += int(max(0, len(merged) - len(stored)))
+                if len(newer) and response_cache.mode != "readonly":
+                    price_store.save(merged)
+                return merged.window(start)
+
+    series = await stream_price_series(ticker, period)
+    price_sync_stats["full"] += 1
+    if len(series) and response_cache.mode != "readonly":
+        price_store.save(series)
+
+    return series.window(period_start(period, today))
 
 
 async def fetch_news_data(ticker: str, limit: int = 20) -> List[Dict[str, Any]]:
@@ -79,15 +334,9 @@ async def fetch_news_data(ticker: str, limit: int = 20) -> List[Dict[str, Any]]:
     """
     # This is a placeholder. In a real implementation, you would call actual
     # news APIs here.
+    news_data = await _get_json("news", ticker, f"Failed to fetch news for {ticker}", limit=limit)
 
-    async with aiohttp.ClientSession() as session:
-        news_url = f"https://financialdatasets.ai/api/v1/news/{ticker}?limit={limit}&apikey={FINANCIAL_DATASETS_API_KEY}"
-        async with session.get(news_url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch news for {ticker}: {response.status}")
-            news_data = await response.json()
-
-        return news_data
+    return news_data
 
 
 async def fetch_peer_companies(ticker: str) -> List[str]:
@@ -99,12 +348,153 @@ async def fetch_peer_companies(ticker: str) -> List[str]:
     Returns:
         List of peer company ticker symbols
     """
+    peer_data = await _get_json("peers", ticker, f"Failed to fetch peer companies for {ticker}")
+
+    return peer_data.get("peers", [])
+
+
+async def _fetch_many(
+    fetch: Callable[..., Awaitable[Any]],
+    tickers: Iterable[str],
+    concurrency: int,
+    **kwargs: Any
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Run a per-ticker fetcher over many tickers, yielding results as they complete.
+
+    Args:
+        fetch: Per-ticker fetch function
+        tickers: Ticker symbols to fetch
+        concurrency: Maximum number of tickers fetched at once
+        **kwargs: Extra arguments passed to the fetch function
+
+    Yields:
+        (ticker, result) tuples in completion order; result is the raised exception if the fetch failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(ticker: str) -> Tuple[str, Any]:
+        async with semaphore:
+            try:
+                return ticker, await fetch(ticker, **kwargs)
+            except Exception as e:
+                return ticker, e
+
+    tasks = [asyncio.create_task(fetch_one(ticker)) for ticker in dict.fromkeys(tickers)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Stop outstanding fetches if the consumer stops iterating early
+        for task in tasks:
+            task.cancel()
+
+
+def fetch_company_data_many(
+    tickers: Iterable[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Fetch company data for many tickers.
+
+    Args:
+        tickers: Stock ticker symbols
+        concurrency: Maximum number of tickers fetched at once
+
+    Returns:
+        Async iterator of (ticker, company data or exception) in completion order
+    """
+    return _fetch_many(fetch_company_data, tickers, concurrency)
+
+
+def fetch_price_history_many(
+    tickers: Iterable[str],
+    period: str = "1y",
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Fetch historical price data for many tickers.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period for the data (e.g., '1d', '1m', '1y')
+        concurrency: Maximum number of tickers fetched at once
+
+    Returns:
+        Async iterator of (ticker, price data or exception) in completion order
+    """
+    return _fetch_many(fetch_price_history, tickers, concurrency, period=period)
+
+
+def fetch_price_series_many(
+    tickers: Iterable[str],
+    period: str = "1y",
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Fetch price series for many tickers, updating the local price store.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period for the data (e.g., '1d', '1m', '1y')
+        concurrency: Maximum number of tickers fetched at once
+
+    Returns:
+        Async iterator of (ticker, PriceSeries or exception) in completion order
+    """
+    return _fetch_many(fetch_price_series, tickers, concurrency, period=period)
+
+
+def fetch_news_data_many(
+    tickers: Iterable[str],
+    limit: int = 20,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Fetch recent news articles for many tickers.
+
+    Args:
+        tickers: Stock ticker symbols
+        limit: Maximum number of news articles to retrieve per ticker
+        concurrency: Maximum number of tickers fetched at once
+
+    Returns:
+        Async iterator of (ticker, news articles or exception) in completion order
+    """
+    return _fetch_many(fetch_news_data, tickers, concurrency, limit=limit)
+
+
+def fetch_peer_companies_many(
+    tickers: Iterable[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Fetch peer companies for many tickers.
+
+    Args:
+        tickers: Stock ticker symbols
+        concurrency: Maximum number of tickers fetched at once
+
+    Returns:
+        Async iterator of (ticker, peer tickers or exception) in completion order
+    """
+    return _fetch_many(fetch_peer_companies, tickers, concurrency)
+
+
+def data_api_stats() -> Dict[str, Any]:
+    """Return statistics for the data API layers.
+
+    Returns:
+        Dict with connection pool, response cache, request coalescing, rate limiter,
+        fixture and price sync statistics
+    """
+    return {
+        "pool": http_client.stats(),
+        "cache": response_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "rate_limits": {endpoint: limiter.stats() for endpoint, limiter in rate_limiters.items()},
+        "fixtures": fixtures.stats(),
+        "price_sync": dict(price_sync_stats),
+    }
 
-    async with aiohttp.ClientSession() as session:
-        peers_url = f"https://financialdatasets.ai/api/v1/peers/{ticker}?apikey={FINANCIAL_DATASETS_API_KEY}"
-        async with session.get(peers_url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch peer companies for {ticker}: {response.status}")
-            peer_data = await response.json()
 
-        return peer_data.get("peers", [])
+async def close_api_clients() -> None:
+    """Shut down the shared HTTP client, flush recorded fixtures and close the caches."""
+    single_flight.reset()
+    await http_client.close()
+    response_cache.close()
+    fixtures.save()
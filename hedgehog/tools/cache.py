@@ -0,0 +1,241 @@
+"""Persistent SQLite-backed cache for API responses."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Default location for all on-disk caches
+CACHE_DIR = Path(os.getenv("HEDGEHOG_CACHE_DIR", Path.home() / ".cache" / "hedgehog"))
+
+# Supported cache modes
+CACHE_MODES = ["use", "refresh", "readonly", "off"]
+
+
+class DiskCache:
+    """Size-bounded LRU cache of JSON payloads stored compressed in SQLite.
+
+    Entries are grouped by namespace (e.g. an API endpoint) so each group can
+    be read with its own TTL and reported separately.
+
+    Modes:
+        use: Serve fresh entries from disk and store new ones
+        refresh: Ignore existing entries but store new ones
+        readonly: Serve fresh entries from disk but never store new ones
+        off: Neither read nor write the cache
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        mode: str = "use",
+        max_age: Optional[float] = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Maximum total size of compressed payloads before LRU eviction
+            mode: Cache mode (use/refresh/readonly/off)
+            max_age: Age in seconds after which entries are expired and evicted
+                regardless of size (None keeps entries until LRU eviction)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.mode = mode
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def mode(self) -> str:
+        """Get the current cache mode."""
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: str) -> None:
+        """Set the cache mode.
+
+        Args:
+            value: One of "use", "refresh", "readonly" or "off"
+        """
+        if value not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode: {value} (expected one of {', '.join(CACHE_MODES)})")
+        self._mode = value
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            if self._mode != "readonly":
+                self._expire(self._conn)
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._total_bytes = row[0]
+        return self._conn
+
+    def _expire(self, conn: sqlite3.Connection) -> None:
+        """Drop entries older than `max_age`."""
+        if self.max_age is None:
+            return
+        cutoff = time.time() - self.max_age
+        expired = conn.execute(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE created < ? GROUP BY namespace",
+            (cutoff,)
+        ).fetchall()
+        if not expired:
+            return
+        conn.execute("DELETE FROM entries WHERE created < ?", (cutoff,))
+        for namespace, count, size in expired:
+            self._count(namespace, "evictions", count)
+            self._total_bytes -= size
+
+    def _count(self, namespace: str, counter: str, amount: int = 1) -> None:
+        counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+        counters[counter] += amount
+
+    def get(self, namespace: str, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Look up a cached payload.
+
+        Args:
+            namespace: Group the entry belongs to
+            key: Entry key within the namespace
+            ttl: Maximum age in seconds (None means entries never expire,
+                apart from the cache-wide `max_age`)
+
+        Returns:
+            The cached payload, or None on a miss
+        """
+        if self.max_age is not None:
+            ttl = self.max_age if ttl is None else min(ttl, self.max_age)
+        if self._mode == "off":
+            return None
+        if self._mode == "refresh":
+            self._count(namespace, "misses")
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+            now = time.time()
+            if row is None or (ttl is not None and now - row[1] > ttl):
+                self._count(namespace, "misses")
+                return None
+
+            conn.execute(
+                "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._count(namespace, "hits")
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store a payload in the cache.
+
+        Args:
+            namespace: Group the entry belongs to
+            key: Entry key within the namespace
+            value: JSON-serializable payload
+        """
+        if self._mode in ("off", "readonly"):
+            return
+
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            previous = conn.execute(
+                "SELECT size FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, blob, len(blob), now, now)
+            )
+            self._total_bytes += len(blob) - (previous[0] if previous else 0)
+            self._count(namespace, "writes")
+
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries, then least recently used ones until the cache is back under 90% of its size limit."""
+        self._expire(conn)
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT namespace, key, size FROM entries ORDER BY accessed ASC").fetchall()
+        for namespace, key, size in rows:
+            if self._total_bytes <= target:
+                break
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            self._total_bytes -= size
+            self._count(namespace, "evictions")
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove cached entries.
+
+        Args:
+            namespace: Only clear this namespace (clears everything if None)
+        """
+        with self._lock:
+            conn = self._connect()
+            if namespace is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters per namespace and overall.
+
+        Returns:
+            Dict with per-namespace counters, totals, hit rate and stored size
+        """
+        totals = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        for counters in self._stats.values():
+            for name, value in counters.items():
+                totals[name] += value
+
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "mode": self._mode,
+            "namespaces": {namespace: dict(counters) for namespace, counters in self._stats.items()},
+            **totals,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,276 @@
+"""Compact, token-efficient serialization of API payloads for prompts.
+
+Payloads are reduced to a whitelist of fields the analysts use, nulls are
+dropped, numbers rounded to a few significant digits and price history is
+summarised statistically with a downsampled closing series. Each rendered
+payload is held to a per-prompt token budget by degrading detail step by
+step until it fits.
+"""
+
+import json
+import math
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from hedgehog.tools.prices import PriceSeries
+
+# Approximate token budget for each payload interpolated into a prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("HEDGEHOG_PROMPT_TOKEN_BUDGET", "1200"))
+
+# Rough characters per token for English text and compact JSON
+CHARS_PER_TOKEN = 4
+
+# Leaf fields kept from financial statements and metrics
+FINANCIAL_FIELDS = {
+    "report_period", "period", "fiscal_period", "fiscal_year", "date", "currency",
+    "revenue", "revenue_growth", "gross_profit", "gross_margin", "operating_income", "operating_margin",
+    "net_income", "profit_margin", "net_margin", "earnings_per_share", "eps", "ebitda",
+    "total_assets", "total_liabilities", "shareholders_equity", "total_debt", "cash_and_equivalents",
+    "current_ratio", "debt_to_equity", "return_on_equity", "return_on_assets", "roe", "roa",
+    "free_cash_flow", "net_cash_flow_from_operations", "capital_expenditure", "dividends_per_share",
+    "pe_ratio", "pb_ratio", "ps_ratio", "price_to_earnings_ratio", "price_to_book_ratio",
+    "enterprise_value", "market_cap", "shares_outstanding",
+}
+
+# Leaf fields kept from company profiles
+COMPANY_FIELDS = {
+    "company_name", "name", "ticker", "sector", "industry", "exchange", "market_cap",
+    "number_of_employees", "employees", "description", "country",
+}
+
+# Leaf fields kept from news articles
+NEWS_FIELDS = {"title", "source", "date", "published_at", "sentiment", "summary"}
+
+# Successively coarser rendering settings tried until a payload fits its budget
+DETAIL_LEVELS = [
+    {"digits": 4, "max_items": 8, "max_chars": 280, "points": 24},
+    {"digits": 3, "max_items": 4, "max_chars": 160, "points": 12},
+    {"digits": 3, "max_items": 2, "max_chars": 80, "points": 6},
+    {"digits": 2, "max_items": 1, "max_chars": 40, "points": 0},
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def round_number(value: float, digits: int = 4) -> Any:
+    """Round a number to a few significant digits.
+
+    Args:
+        value: Number to round
+        digits: Significant digits to keep
+
+    Returns:
+        The rounded number, as an int when it has no fractional part
+    """
+    if not math.isfinite(value):
+        return None
+    rounded = float(f"{value:.{digits}g}")
+    return int(rounded) if rounded.is_integer() else rounded
+
+
+def compact(
+    value: Any,
+    fields: Optional[Set[str]] = None,
+    digits: int = 4,
+    max_items: int = 8,
+    max_chars: int = 280
+) -> Any:
+    """Reduce a JSON-like payload to its relevant, non-empty parts.
+
+    Args:
+        value: Payload to reduce
+        fields: Leaf field names to keep (None keeps every field); nested
+            objects and lists are always descended into
+        digits: Significant digits numbers are rounded to
+        max_items: Maximum number of items kept from each list
+        max_chars: Maximum length of each string
+
+    Returns:
+        The reduced payload, or None if nothing relevant is left
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if not isinstance(item, (dict, list)) and fields is not None and key not in fields:
+                continue
+            item = compact(item, fields, digits, max_items, max_chars)
+            if item is not None:
+                result[key] = item
+        return result or None
+    if isinstance(value, (list, tuple)):
+        items = [compact(item, fields, digits, max_items, max_chars) for item in value[:max_items]]
+        items = [item for item in items if item is not None]
+        return items or None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return round_number(float(value), digits)
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if not value:
+            return None
+        return value if len(value) <= max_chars else value[:max_chars - 1] + "…"
+    return value
+
+
+def render(value: Any) -> str:
+    """Render a reduced payload as compact JSON.
+
+    Args:
+        value: Payload to render
+
+    Returns:
+        JSON text without insignificant whitespace
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def fit_to_budget(build: Callable[[Dict[str, int]], Any], budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Render a payload at the most detailed level that fits a token budget.
+
+    Args:
+        build: Function producing the reduced payload for a detail level
+        budget: Maximum number of tokens for the rendered payload
+
+    Returns:
+        Rendered payload, hard-truncated if even the coarsest level is too large
+    """
+    text = ""
+    for level in DETAIL_LEVELS:
+        text = render(build(level))
+        if estimate_tokens(text) <= budget:
+            return text
+    return text[:budget * CHARS_PER_TOKEN - 1] + "…"
+
+
+def summarize_prices(series: PriceSeries, points: int = 24, digits: int = 4) -> Dict[str, Any]:
+    """Summarise a price history statistically with a downsampled closing series.
+
+    Args:
+        series: Price history
+        points: Number of closes kept in the downsampled series
+        digits: Significant digits numbers are rounded to
+
+    Returns:
+        Dict of summary statistics and sampled closes keyed by date
+    """
+    if not len(series):
+        return {}
+
+    close = series.close
+    last = float(close[-1])
+
+    def change(bars: int) -> Optional[float]:
+        if len(close) <= bars or close[-bars - 1] == 0:
+            return None
+        return (last / float(close[-bars - 1]) - 1) * 100
+
+    log_returns = np.diff(np.log(close[close > 0]))
+    running_peak = np.maximum.accumulate(close)
+    drawdowns = np.where(running_peak > 0, close / running_peak - 1, 0.0)
+
+    summary = {
+        "from": str(series.first_date),
+        "to": str(series.last_date),
+        "bars": len(series),
+        "last_close": last,
+        "change_pct": {"1w": change(5), "1m": change(21), "3m": change(63), "6m": change(126), "1y": change(252)},
+        "high": float(np.nanmax(series.high)) if np.isfinite(series.high).any() else float(close.max()),
+        "low": float(np.nanmin(series.low)) if np.isfinite(series.low).any() else float(close.min()),
+        "volatility_pct": float(np.std(log_returns) * math.sqrt(252) * 100) if len(log_returns) > 1 else None,
+        "max_drawdown_pct": float(drawdowns.min() * 100),
+        "avg_volume_30d": float(np.nanmean(series.volume[-30:])) if np.isfinite(series.volume[-30:]).any() else None,
+    }
+
+    if points > 0:
+        # Evenly spaced samples that always include the latest bar
+        indices = np.unique(np.linspace(0, len(series) - 1, min(points, len(series))).round().astype(int))
+        summary["closes"] = {str(series.dates[i]): float(close[i]) for i in indices}
+
+    return compact(summary, digits=digits) or {}
+
+
+def serialize_financials(financial_data: Any, budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Serialize financial statements and metrics for a prompt.
+
+    Args:
+        financial_data: Financials payload
+        budget: Token budget for the rendered payload
+
+    Returns:
+        Compact JSON text
+    """
+    return fit_to_budget(
+        lambda level: compact(financial_data, FINANCIAL_FIELDS, level["digits"], level["max_items"], level["max_chars"]),
+        budget
+    )
+
+
+def serialize_prices(ticker: str, price_history: Any, budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Serialize price history for a prompt as a statistical summary.
+
+    Args:
+        ticker: Stock ticker symbol
+        price_history: PriceSeries, price history payload, or a dict of
+            precomputed values when no bars are available
+        budget: Token budget for the rendered payload
+
+    Returns:
+        Compact JSON text
+    """
+    series = price_history if isinstance(price_history, PriceSeries) else PriceSeries.from_payload(ticker, price_history)
+    if not len(series):
+        if isinstance(price_history, PriceSeries):
+            return render({})
+        # No bars, e.g. placeholder values; pass the fields through compacted
+        return fit_to_budget(lambda level: compact(price_history, digits=level["digits"]), budget)
+    return fit_to_budget(lambda level: summarize_prices(series, level["points"], level["digits"]), budget)
+
+
+def serialize_news(news_data: Iterable[Dict[str, Any]], budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Serialize news articles for a prompt.
+
+    Args:
+        news_data: News articles, newest first
+        budget: Token budget for the rendered payload
+
+    Returns:
+        Compact JSON text
+    """
+    if isinstance(news_data, dict):
+        news_data = news_data.get("news") or []
+    articles: List[Dict[str, Any]] = list(news_data)
+    # News is the one payload where the number of items matters more than their detail
+    return fit_to_budget(
+        lambda level: compact(articles, NEWS_FIELDS, level["digits"], level["max_items"] * 3, level["max_chars"]),
+        budget
+    )
+
+
+def serialize_company(company_data: Any, budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Serialize a company profile together with its financials for a prompt.
+
+    Args:
+        company_data: Company payload as returned by `fetch_company_data`
+        budget: Token budget for the rendered payload
+
+    Returns:
+        Compact JSON text
+    """
+    fields = COMPANY_FIELDS | FINANCIAL_FIELDS
+    return fit_to_budget(
+        lambda level: compact(company_data, fields, level["digits"], level["max_items"], level["max_chars"]),
+        budget
+    )
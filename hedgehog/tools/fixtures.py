@@ -0,0 +1,236 @@
+"""Record-and-replay fixtures for the financial data API.
+
+In record mode every network response from `hedgehog.tools.api` is captured
+into a gzip-compressed JSON Lines archive. In replay mode responses are served
+from that archive instead of the network, optionally after a synthetic
+log-normal latency, so runs are reproducible and can be profiled offline.
+
+The archive can also be served over HTTP as a local stand-in for the API:
+
+    python -m hedgehog.tools.fixtures serve fixtures.jsonl.gz --port 8765
+
+and selected by setting FINANCIAL_DATASETS_BASE_URL=http://127.0.0.1:8765/api/v1
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+# Supported fixture modes
+FIXTURE_MODES = ["off", "record", "replay"]
+
+
+def request_key(endpoint: str, ticker: str, params: Dict[str, Any]) -> str:
+    """Build the identity of an API request, leaving out the API key.
+
+    Args:
+        endpoint: API endpoint name (e.g. 'prices')
+        ticker: Stock ticker symbol
+        params: Query parameters
+
+    Returns:
+        Request key such as 'prices/AAPL?period=1y'
+    """
+    query = urlencode(sorted((name, value) for name, value in params.items() if name != "apikey"))
+    return f"{endpoint}/{ticker}?{query}"
+
+
+class FixtureArchive:
+    """Captures API responses to, and serves them from, a compressed archive."""
+
+    def __init__(self):
+        """Initialize the archive in `off` mode."""
+        self.mode = "off"
+        self.path: Optional[Path] = None
+        self.latency_ms = 0.0
+        self.latency_sigma = 0.5
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._random = random.Random()
+        self._stats = {"recorded": 0, "replayed": 0, "missing": 0}
+
+    def configure(
+        self,
+        mode: str,
+        path: Optional[Path] = None,
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.5,
+        seed: Optional[int] = None
+    ) -> None:
+        """Select the fixture mode.
+
+        Args:
+            mode: One of "off", "record" or "replay"
+            path: Archive file to write (record) or read (replay)
+            latency_ms: Median synthetic latency added to replayed responses
+            latency_sigma: Spread (log-normal sigma) of the synthetic latency
+            seed: Random seed for reproducible latency draws
+        """
+        if mode not in FIXTURE_MODES:
+            raise ValueError(f"Invalid fixture mode: {mode} (expected one of {', '.join(FIXTURE_MODES)})")
+        if mode != "off" and path is None:
+            raise ValueError(f"An archive path is required in {mode} mode")
+
+        self.mode = mode
+        self.path = Path(path) if path is not None else None
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self._random = random.Random(seed)
+        self._entries = self.load(self.path) if mode == "replay" else {}
+
+    @staticmethod
+    def load(path: Path) -> Dict[str, Dict[str, Any]]:
+        """Read an archive.
+
+        Args:
+            path: Archive file
+
+        Returns:
+            Dict of request key to recorded entry
+        """
+        entries = {}
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry["key"]] = entry
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, key: str, payload: Any) -> None:
+        """Capture a successful response.
+
+        Args:
+            key: Request key
+            payload: Decoded JSON payload
+        """
+        if self.mode == "record":
+            self._entries[key] = {"key": key, "body": payload}
+            self._stats["recorded"] += 1
+
+    def record_error(self, key: str, error: Exception) -> None:
+        """Capture a failed request so replays fail the same way.
+
+        Args:
+            key: Request key
+            error: Exception raised by the request
+        """
+        if self.mode == "record":
+            self._entries[key] = {"key": key, "error": str(error)}
+            self._stats["recorded"] += 1
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        """Return the recorded entry for a request.
+
+        Args:
+            key: Request key
+
+        Returns:
+            Recorded entry with either a `body` or an `error`
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["missing"] += 1
+            raise Exception(f"No recorded response for {key} in {self.path}")
+        self._stats["replayed"] += 1
+        return entry
+
+    def sample_latency(self) -> float:
+        """Draw a synthetic latency in seconds."""
+        if self.latency_ms <= 0:
+            return 0.0
+        return self._random.lognormvariate(0.0, self.latency_sigma) * self.latency_ms / 1000
+
+    async def replay(self, key: str) -> Any:
+        """Serve a recorded response.
+
+        Args:
+            key: Request key
+
+        Returns:
+            The recorded payload
+        """
+        entry = self.lookup(key)
+        delay = self.sample_latency()
+        if delay:
+            await asyncio.sleep(delay)
+        if "error" in entry:
+            raise Exception(entry["error"])
+        return entry["body"]
+
+    def save(self) -> None:
+        """Write recorded responses to the archive (record mode only)."""
+        if self.mode != "record" or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as archive:
+            for entry in self._entries.values():
+                archive.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return record/replay counters."""
+        return {"mode": self.mode, **self._stats}
+
+
+# Global instance used by hedgehog.tools.api
+fixtures = FixtureArchive()
+
+
+def serve(path: Path, host: str = "127.0.0.1", port: int = 8765, latency_ms: float = 0.0, latency_sigma: float = 0.5) -> None:
+    """Serve an archive over HTTP as a stand-in for the financial data API.
+
+    Args:
+        path: Archive file
+        host: Interface to bind
+        port: Port to listen on
+        latency_ms: Median synthetic latency added to every response
+        latency_sigma: Spread (log-normal sigma) of the synthetic latency
+    """
+    from aiohttp import web
+
+    archive = FixtureArchive()
+    archive.configure("replay", path, latency_ms=latency_ms, latency_sigma=latency_sigma)
+
+    async def handle(request: web.Request) -> web.Response:
+        endpoint, _, ticker = request.match_info["path"].partition("/")
+        key = request_key(endpoint, ticker, dict(request.query))
+        try:
+            entry = archive.lookup(key)
+        except Exception as e:
+            return web.json_response({"error": str(e)}, status=404)
+
+        delay = archive.sample_latency()
+        if delay:
+            await asyncio.sleep(delay)
+        if "error" in entry:
+            return web.json_response({"error": entry["error"]}, status=502)
+        return web.json_response(entry["body"])
+
+    app = web.Application()
+    app.router.add_get("/api/v1/{path:.+}", handle)
+    print(f"Serving {len(archive)} recorded responses from {path} on http://{host}:{port}/api/v1")
+    web.run_app(app, host=host, port=port, print=None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Financial data API fixtures")
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    serve_parser = subparsers.add_parser("serve", help="Serve a recorded archive over HTTP")
+    serve_parser.add_argument("archive", help="Archive file to serve")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve_parser.add_argument("--latency-ms", type=float, default=0.0, help="Median synthetic latency in milliseconds")
+    serve_parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread of the synthetic latency")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(Path(args.archive), args.host, args.port, args.latency_ms, args.latency_sigma)
+    else:
+        parser.print_help()
@@ -0,0 +1,269 @@
+"""Hedged LLM requests for tail-latency control.
+
+A hedged call sends its request and, if no result has arrived after a
+delay learned from recent calls to the same model (a high latency
+percentile), sends a duplicate, optionally to a fallback model. Whichever
+request returns first wins and the other is cancelled. The duplicate needs a
+free slot of the LLM concurrency cap and is not sent when there is none, so
+hedging never puts more requests in flight than the cap. Hedges stop once the
+extra spend they cause reaches a share of the run's LLM spend, or, while the
+spend is unknown (models without a price), once that share of calls has been
+hedged.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+# Latency percentile of recent calls after which a duplicate request is sent
+DEFAULT_HEDGE_PERCENTILE = 95.0
+
+# Share of the run's LLM spend that hedges may add (share of calls while the spend is unknown)
+DEFAULT_HEDGE_BUDGET = 0.1
+
+# Never hedge a call sooner than this many seconds after it was sent
+MIN_HEDGE_DELAY = 1.0
+
+# Completed calls per model kept to learn the delay from, and needed before hedging
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+class HedgedCall:
+    """How a call went through the hedger."""
+
+    __slots__ = ("delay", "winner", "skipped", "cancelled_share")
+
+    def __init__(self, delay: Optional[float]):
+        """Initialize an unhedged call.
+
+        Args:
+            delay: Seconds after which the call is hedged (None if it is not)
+        """
+        self.delay = delay
+        self.winner: Optional[str] = None
+        self.skipped: Optional[str] = None
+        self.cancelled_share = 0.0
+
+    @property
+    def hedged(self) -> bool:
+        """Whether a duplicate request was sent."""
+        return self.winner is not None
+
+
+class LatencyHedger:
+    """Learns per-model latencies and hedges calls that take longer than usual.
+
+    Disabled until configured; while disabled calls run unhedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        budget: float = DEFAULT_HEDGE_BUDGET,
+        fallback_model: Optional[str] = None,
+        min_delay: float = MIN_HEDGE_DELAY
+    ):
+        """Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile after which a call is hedged
+            budget: Share of the LLM spend hedges may add (share of calls
+                while the spend is unknown)
+            fallback_model: Model the duplicate request is sent to (None
+                sends it to the same model)
+            min_delay: Minimum seconds before a call is hedged
+        """
+        self.enabled = False
+        self.percentile = percentile
+        self.budget = budget
+        self.fallback_model = fallback_model
+        self.min_delay = min_delay
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "over_budget": 0, "no_slot": 0, "spend": 0.0, "extra_spend": 0.0}
+
+    def configure(
+        self,
+        enabled: bool,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        budget: float = DEFAULT_HEDGE_BUDGET,
+        fallback_model: Optional[str] = None
+    ) -> None:
+        """Enable or disable hedging and set its policy.
+
+        Args:
+            enabled: Whether slow calls are hedged
+            percentile: Latency percentile after which a call is hedged
+            budget: Share of the LLM spend hedges may add
+            fallback_model: Model the duplicate request is sent to
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.fallback_model = fallback_model
+
+    def delay(self, model_name: str) -> Optional[float]:
+        """Return how long a call to a model may take before it is hedged.
+
+        Args:
+            model_name: Model the call is sent to
+
+        Returns:
+            Delay in seconds, or None while too few calls have been observed
+        """
+        latencies = self._latencies.get(model_name)
+        if not latencies or len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return max(self.min_delay, float(np.percentile(latencies, self.percentile)))
+
+    def observe(
+        self,
+        model_name: str,
+        seconds: float,
+        cost: Optional[float],
+        extra_cost: float = 0.0,
+        winner: Optional[str] = None
+    ) -> None:
+        """Record a completed call.
+
+        The latency is only learned from calls the model answered itself; a
+        call won by its hedge says nothing about the model's latency beyond
+        that it exceeded the delay.
+
+        Args:
+            model_name: Model the call was sent to
+            seconds: Latency of the call as seen by its caller
+            cost: Cost of the winning request
+            extra_cost: Estimated cost of the cancelled request, if hedged
+            winner: Which request won, as returned by `run`
+        """
+        if winner != "hedge":
+            self._latencies.setdefault(model_name, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+        self._stats["spend"] += cost or 0.0
+        self._stats["extra_spend"] += extra_cost
+
+    def within_budget(self) -> bool:
+        """Return whether hedges have used less than their budget so far.
+
+        The budget applies to the extra spend of hedges; while no call has
+        had a known cost it applies to the share of calls hedged instead.
+        """
+        if self._stats["spend"] > 0:
+            return self._stats["extra_spend"] < self.budget * self._stats["spend"]
+        return self._stats["hedged"] < self.budget * self._stats["calls"]
+
+    async def run(
+        self,
+        model_name: str,
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Callable[[], Awaitable[Any]],
+        slots: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[Any, HedgedCall]:
+        """Run a call, hedging it if it is slower than the learned delay.
+
+        Args:
+            model_name: Model the primary request is sent to
+            primary: Starts the primary request
+            hedge: Starts the duplicate request
+            slots: Concurrency cap the primary request holds a slot of; the
+                duplicate is only sent if it can take a free slot at once
+
+        Returns:
+            Tuple of the first successful result and how the call went: which
+            request won ("primary" or "hedge", None if the call was not
+            hedged), why a due hedge was not sent ("budget" or "no_slot"),
+            and the share of the winner's time in flight the cancelled
+            request was in flight for
+
+        Raises:
+            Exception: The primary request's error, or the first error if
+                both requests failed
+        """
+        call = HedgedCall(self.delay(model_name) if self.enabled else None)
+        self._stats["calls"] += 1
+        started = time.perf_counter()
+        primary_task = asyncio.ensure_future(primary())
+        if call.delay is None:
+            return await primary_task, call
+
+        tasks = {primary_task: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=call.delay)
+            if done:
+                return primary_task.result(), call
+            if not self.within_budget():
+                self._stats["over_budget"] += 1
+                call.skipped = "budget"
+                return await primary_task, call
+            if slots is not None and slots.locked():
+                self._stats["no_slot"] += 1
+                call.skipped = "no_slot"
+                return await primary_task, call
+
+            if slots is not None:
+                # Free, so this returns at once; the slot is held until the duplicate ends
+                await slots.acquire()
+            self._stats["hedged"] += 1
+            hedge_started = time.perf_counter()
+            hedge_task = asyncio.ensure_future(hedge())
+            if slots is not None:
+                hedge_task.add_done_callback(lambda _: slots.release())
+            tasks[hedge_task] = "hedge"
+            pending = set(tasks)
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        finished = time.perf_counter()
+                        in_flight = {"primary": finished - started, "hedge": finished - hedge_started}
+                        call.winner = tasks[task]
+                        loser = "hedge" if call.winner == "primary" else "primary"
+                        call.cancelled_share = min(1.0, in_flight[loser] / max(in_flight[call.winner], 1e-9))
+                        if call.winner == "hedge":
+                            self._stats["hedge_wins"] += 1
+                        return task.result(), call
+                    errors.append((tasks[task], task.exception()))
+            # Both failed; report the primary request's error
+            raise dict(errors)["primary"]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters and the current delay per model.
+
+        Returns:
+            Dict with calls, hedged calls, hedge wins, hedges refused for
+            budget or for lack of a free slot, the spend and the extra
+            spend of hedges
+        """
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "delays": {model: self.delay(model) for model in sorted(self._latencies)},
+        }
+
+
+# Global hedger used by the workflow
+llm_hedging = LatencyHedger()
+
+
+def configure_hedging(
+    enabled: bool,
+    percentile: float = DEFAULT_HEDGE_PERCENTILE,
+    budget: float = DEFAULT_HEDGE_BUDGET,
+    fallback_model: Optional[str] = None
+) -> None:
+    """Apply a hedging policy to the global hedger.
+
+    Args:
+        enabled: Whether slow calls are hedged
+        percentile: Latency percentile after which a call is hedged
+        budget: Share of the LLM spend hedges may add
+        fallback_model: Model the duplicate request is sent to
+    """
+    llm_hedging.configure(enabled, percentile, budget, fallback_model)
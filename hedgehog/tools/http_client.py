@@ -0,0 +1,161 @@
+"""Shared pooled HTTP client for the financial data API."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+import aiohttp
+
+
+class HttpClient:
+    """Process-wide aiohttp client with a keep-alive connection pool.
+
+    The underlying session is created lazily on first use so it binds to the
+    running event loop, and is torn down by `close()` at the end of a run.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        timeout: float = 60.0
+    ):
+        """Initialize the HTTP client.
+
+        Args:
+            limit: Maximum number of simultaneous connections in the pool
+            limit_per_host: Maximum number of simultaneous connections per host
+            keepalive_timeout: Seconds an idle connection is kept open for reuse
+            dns_cache_ttl: Seconds DNS lookups are cached for
+            timeout: Total timeout in seconds for a single request
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+        }
+
+    def configure(self, **settings: Any) -> None:
+        """Update pool settings; takes effect the next time the session is created.
+
+        Args:
+            **settings: Any of limit, limit_per_host, keepalive_timeout, dns_cache_ttl, timeout
+        """
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise ValueError(f"Unknown HTTP client setting: {name}")
+            setattr(self, name, value)
+
+    async def _on_connection_create(self, session, context, params) -> None:
+        self._stats["connections_created"] += 1
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self._stats["connections_reused"] += 1
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use.
+
+        Returns:
+            The pooled aiohttp session
+        """
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                trace_config = aiohttp.TraceConfig()
+                trace_config.on_connection_create_end.append(self._on_connection_create)
+                trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    trace_configs=[trace_config],
+                )
+        return self._session
+
+    async def get_json(self, url: str, error_message: str) -> Any:
+        """Perform a GET request and decode the JSON body.
+
+        Args:
+            url: URL to request
+            error_message: Message prefix used if the response is not a 200
+
+        Returns:
+            The decoded JSON payload
+        """
+        session = await self.session()
+        self._stats["requests"] += 1
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"{error_message}: {response.status}")
+            return await response.json()
+
+    async def iter_chunks(self, url: str, error_message: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Perform a GET request and yield the body as it arrives.
+
+        Args:
+            url: URL to request
+            error_message: Message prefix used if the response is not a 200
+            chunk_size: Maximum size of each yielded chunk in bytes
+
+        Yields:
+            Raw body chunks
+        """
+        session = await self.session()
+        self._stats["requests"] += 1
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"{error_message}: {response.status}")
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics.
+
+        Returns:
+            Dict with request and connection counters, reuse rate and open
+            sockets; the socket count is best-effort and None when it cannot
+            be determined
+        """
+        stats = dict(self._stats)
+        acquired = stats["connections_created"] + stats["connections_reused"]
+        stats["reuse_rate"] = stats["connections_reused"] / acquired if acquired else 0.0
+
+        open_sockets: Optional[int] = 0
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            # aiohttp has no public pool introspection and traces no closes; its
+            # private `_conns` (idle) and `_acquired` (busy) are read if present
+            idle_conns = getattr(connector, "_conns", None)
+            busy_conns = getattr(connector, "_acquired", None)
+            if idle_conns is None or busy_conns is None:
+                open_sockets = None
+            else:
+                open_sockets = sum(len(conns) for conns in idle_conns.values()) + len(busy_conns)
+        stats["open_sockets"] = open_sockets
+        return stats
+
+    async def close(self) -> None:
+        """Close the shared session and release all pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._lock = asyncio.Lock()
+
+
+# Global instance shared by every fetcher
+http_client = HttpClient()
@@ -0,0 +1,277 @@
+"""Incremental re-analysis: reuse analyses whose inputs have not materially changed.
+
+Every analyst declares the exact inputs it reads. When incremental analysis
+is enabled, each computed analysis is stored with those inputs and their
+fingerprint, and a later run of the same analyst on the same ticker reuses
+it when the fingerprint matches, or when every number in the inputs is
+within the analyst's materiality tolerance of the stored one and nothing
+else changed. Inputs are compared against those the stored analysis was
+computed from, so small changes cannot add up across reuses.
+
+Materiality files are JSON:
+
+    {
+        "max_age_days": 7,
+        "tolerance": 0.02,
+        "tolerances": {"technical": 0, "sentiment": 0, "investor": 0.05}
+    }
+
+Tolerances are relative (0.02 allows 2% moves) and are looked up like
+routing roles: an analyses key, "investor" for every investor without a
+tolerance of its own, then the default.
+"""
+
+import hashlib
+import importlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from hedgehog.tools.cache import CACHE_DIR, DiskCache
+
+# Relative change of any input number below which an analysis is reused
+DEFAULT_TOLERANCE = float(os.getenv("HEDGEHOG_MATERIALITY_TOLERANCE", "0.02"))
+
+# Analyses older than this are recomputed regardless of their inputs (default 7 days)
+DEFAULT_MAX_AGE = float(os.getenv("HEDGEHOG_ANALYSIS_MAX_AGE", str(7 * 24 * 3600)))
+
+# Technical analyses quote the latest price, so they are only reused on identical inputs
+DEFAULT_TOLERANCES = {"technical": 0.0}
+
+
+def fingerprint(inputs: Any) -> str:
+    """Fingerprint an analyst's inputs.
+
+    Args:
+        inputs: JSON-like inputs, as compacted by `compact`
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON of the inputs
+    """
+    identity = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def material_change(old: Any, new: Any, tolerance: float, path: str = "") -> Optional[str]:
+    """Find the first material difference between two sets of inputs.
+
+    Numbers differ materially when their relative difference exceeds the
+    tolerance; anything else differs materially when it is not equal.
+
+    Args:
+        old: Inputs the stored analysis was computed from
+        new: Current inputs
+        tolerance: Relative tolerance for numbers
+        path: Location of the values within the inputs, for the description
+
+    Returns:
+        Path of the first material difference, or None if there is none
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in sorted(old.keys() | new.keys()):
+            if key not in old or key not in new:
+                return f"{path}.{key}".lstrip(".")
+            change = material_change(old[key], new[key], tolerance, f"{path}.{key}")
+            if change is not None:
+                return change
+        return None
+    if isinstance(old, list) and isinstance(new, list):
+        if len(old) != len(new):
+            return path.lstrip(".") or "inputs"
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            change = material_change(old_item, new_item, tolerance, f"{path}[{index}]")
+            if change is not None:
+                return change
+        return None
+    numeric = (int, float)
+    if isinstance(old, numeric) and isinstance(new, numeric) and not isinstance(old, bool) and not isinstance(new, bool):
+        return None if math.isclose(old, new, rel_tol=tolerance) else path.lstrip(".") or "inputs"
+    return None if old == new else path.lstrip(".") or "inputs"
+
+
+class IncrementalAnalyses:
+    """Store of computed analyses, reused while their inputs stay within materiality thresholds.
+
+    Disabled until configured; while disabled nothing is looked up or stored.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        tolerance: float = DEFAULT_TOLERANCE,
+        tolerances: Optional[Dict[str, float]] = None,
+        max_age: float = DEFAULT_MAX_AGE
+    ):
+        """Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file
+            tolerance: Default relative tolerance for input numbers
+            tolerances: Tolerances per analyses key or "investor"
+            max_age: Age in seconds after which an analysis is recomputed
+        """
+        self._cache = DiskCache(path, max_age=max_age)
+        self.enabled = False
+        self.tolerance = tolerance
+        self.tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def load_materiality(path: Union[str, Path]) -> Dict[str, Any]:
+        """Load materiality thresholds from a JSON file.
+
+        Args:
+            path: Path of the materiality file
+
+        Returns:
+            Dict with `tolerance`, `tolerances` and `max_age` (seconds)
+        """
+        with open(path, "r", encoding="utf-8") as materiality_file:
+            config = json.load(materiality_file)
+        return {
+            "tolerance": config.get("tolerance", DEFAULT_TOLERANCE),
+            "tolerances": {**DEFAULT_TOLERANCES, **config.get("tolerances", {})},
+            "max_age": config.get("max_age_days", DEFAULT_MAX_AGE / 86400) * 86400,
+        }
+
+    def configure(
+        self,
+        enabled: bool,
+        tolerance: float = DEFAULT_TOLERANCE,
+        tolerances: Optional[Dict[str, float]] = None,
+        max_age: float = DEFAULT_MAX_AGE
+    ) -> None:
+        """Enable or disable reuse and set the materiality thresholds.
+
+        Args:
+            enabled: Whether analyses are stored and reused
+            tolerance: Default relative tolerance for input numbers
+            tolerances: Tolerances per analyses key or "investor"
+            max_age: Age in seconds after which an analysis is recomputed
+        """
+        self.enabled = enabled
+        self.tolerance = tolerance
+        self.tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+        self._cache.max_age = max_age
+
+    def tolerance_for(self, role: str) -> float:
+        """Return the materiality tolerance of an analyst.
+
+        Args:
+            role: Analyses key (e.g. 'fundamental' or 'investor_warren_buffett')
+
+        Returns:
+            Relative tolerance for input numbers
+        """
+        if role in self.tolerances:
+            return self.tolerances[role]
+        if role.startswith("investor_") and "investor" in self.tolerances:
+            return self.tolerances["investor"]
+        return self.tolerance
+
+    def _count(self, role: str, outcome: str) -> None:
+        counters = self._stats.setdefault(role, {"unchanged": 0, "immaterial": 0, "recomputed": 0})
+        counters[outcome] += 1
+
+    def lookup(self, ticker: str, role: str, inputs: Any, settings: Dict[str, Any]) -> Optional[Tuple[BaseModel, str]]:
+        """Find a stored analysis that can be reused for the current inputs.
+
+        Args:
+            ticker: Stock ticker symbol
+            role: Analyses key of the analyst
+            inputs: Compacted inputs the analyst reads
+            settings: Settings the analysis depends on besides its inputs
+                (models, reasoning); they must match exactly
+
+        Returns:
+            The stored analysis and why it was reused, or None if the
+            analyst has to run
+        """
+        if not self.enabled:
+            return None
+        stored = self._cache.get(role, ticker)
+        if stored is None or stored["settings"] != json.loads(json.dumps(settings, default=str)):
+            self._count(role, "recomputed")
+            return None
+
+        if stored["fingerprint"] == fingerprint(inputs):
+            reason = "inputs unchanged"
+            outcome = "unchanged"
+        else:
+            change = material_change(stored["inputs"], inputs, self.tolerance_for(role))
+            if change is not None:
+                self._count(role, "recomputed")
+                return None
+            reason = "changes within materiality thresholds"
+            outcome = "immaterial"
+
+        module_name, _, type_name = stored["type"].partition(":")
+        try:
+            analysis = getattr(importlib.import_module(module_name), type_name).model_validate(stored["analysis"])
+        except (ImportError, AttributeError, ValueError):
+            # Stored under an older version of the schema
+            self._count(role, "recomputed")
+            return None
+        self._count(role, outcome)
+        return analysis, reason
+
+    def record(self, ticker: str, role: str, inputs: Any, settings: Dict[str, Any], analysis: BaseModel) -> None:
+        """Store a computed analysis with the inputs it was computed from.
+
+        Args:
+            ticker: Stock ticker symbol
+            role: Analyses key of the analyst
+            inputs: Compacted inputs the analyst read
+            settings: Settings the analysis depends on besides its inputs
+            analysis: The computed analysis
+        """
+        if not self.enabled:
+            return
+        self._cache.put(role, ticker, {
+            "fingerprint": fingerprint(inputs),
+            "inputs": inputs,
+            "settings": settings,
+            "type": f"{type(analysis).__module__}:{type(analysis).__qualname__}",
+            "analysis": analysis.model_dump(mode="json"),
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reuse counters per analyst and overall.
+
+        Returns:
+            Dict with analyses reused on unchanged inputs, reused within
+            materiality thresholds and recomputed, per analyses key and in total
+        """
+        totals = {"unchanged": 0, "immaterial": 0, "recomputed": 0}
+        for counters in self._stats.values():
+            for name, value in counters.items():
+                totals[name] += value
+        return {
+            "enabled": self.enabled,
+            "by_role": {role: dict(counters) for role, counters in sorted(self._stats.items())},
+            **totals,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._cache.close()
+
+
+# Global store used by the workflow
+incremental_analyses = IncrementalAnalyses(CACHE_DIR / "analyses.sqlite3")
+
+
+def configure_incremental(enabled: bool, materiality_path: Optional[Union[str, Path]] = None) -> None:
+    """Enable incremental re-analysis, optionally with thresholds from a file.
+
+    Args:
+        enabled: Whether analyses are stored and reused
+        materiality_path: JSON file of materiality thresholds
+    """
+    thresholds = IncrementalAnalyses.load_materiality(materiality_path) if materiality_path else {}
+    incremental_analyses.configure(enabled, **thresholds)
+
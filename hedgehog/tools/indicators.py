@@ -0,0 +1,417 @@
+"""Vectorized technical indicators over a (tickers x days) price matrix.
+
+Every indicator is computed for all tickers at once on 2-D NumPy arrays, one
+row per ticker. Series of different lengths are right-aligned on their most
+recent bar and left-padded with NaN; each indicator is NaN until it has
+enough history.
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from hedgehog.tools.prices import PriceSeries
+
+# Bars of history loaded into the matrix; enough for the 200-day average plus warm-up
+DEFAULT_LOOKBACK = 260
+
+# Bars on each side a swing high/low must dominate to count as a pivot
+PIVOT_SPAN = 5
+
+# Bars searched for the nearest support and resistance pivots
+PIVOT_LOOKBACK = 120
+
+
+class PriceMatrix:
+    """OHLCV columns of several tickers aligned into 2-D arrays."""
+
+    def __init__(self, tickers: List[str], dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Initialize the matrix.
+
+        Args:
+            tickers: Row labels
+            dates: Per-row date of each column (datetime64[D], NaT where padded)
+            columns: open/high/low/close/volume arrays of shape (tickers, days)
+        """
+        self.tickers = tickers
+        self.dates = dates
+        self.open = columns["open"]
+        self.high = columns["high"]
+        self.low = columns["low"]
+        self.close = columns["close"]
+        self.volume = columns["volume"]
+
+    @classmethod
+    def from_series(cls, series: Mapping[str, PriceSeries], lookback: int = DEFAULT_LOOKBACK) -> "PriceMatrix":
+        """Right-align the most recent bars of each series into a matrix.
+
+        Missing values inside a series are carried forward from the previous
+        bar, and missing highs and lows fall back to the close.
+
+        Args:
+            series: Price series by ticker
+            lookback: Maximum number of bars kept per ticker
+
+        Returns:
+            PriceMatrix with one row per ticker
+        """
+        tickers = list(series)
+        days = max([min(len(s), lookback) for s in series.values()] + [1])
+        dates = np.full((len(tickers), days), np.datetime64("NaT"), dtype="datetime64[D]")
+        columns = {field: np.full((len(tickers), days), np.nan) for field in ("open", "high", "low", "close", "volume")}
+
+        for row, ticker in enumerate(tickers):
+            recent = series[ticker].tail(lookback)
+            if not len(recent):
+                continue
+            dates[row, days - len(recent):] = recent.dates
+            for field, values in columns.items():
+                values[row, days - len(recent):] = getattr(recent, field)
+
+        close = _forward_fill(columns["close"])
+        columns["close"] = close
+        for field in ("open", "high", "low"):
+            columns[field] = np.where(np.isnan(columns[field]), close, columns[field])
+        columns["volume"] = _forward_fill(columns["volume"])
+        return cls(tickers, dates, columns)
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last valid value of each row forward over NaNs."""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = values[np.arange(values.shape[0])[:, None], index]
+    # Leading NaNs have no earlier value to carry
+    filled[~np.maximum.accumulate(valid, axis=1)] = np.nan
+    return filled
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    """Index of the first non-NaN column of each row (the row length if there is none)."""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), values.shape[1])
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average along each row.
+
+    Args:
+        values: Array of shape (tickers, days)
+        window: Number of bars averaged
+
+    Returns:
+        Array of the same shape, NaN until a full window is available
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return result
+    # Windows reaching into the NaN padding are left out
+    valid = ~np.isnan(values)
+    zeros = np.zeros((values.shape[0], 1))
+    totals = np.cumsum(np.concatenate([zeros, np.where(valid, values, 0.0)], axis=1), axis=1)
+    counts = np.cumsum(np.concatenate([zeros, valid], axis=1), axis=1)
+    full = (counts[:, window:] - counts[:, :-window]) == window
+    result[:, window - 1:] = np.where(full, (totals[:, window:] - totals[:, :-window]) / window, np.nan)
+    return result
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling population standard deviation along each row.
+
+    Args:
+        values: Array of shape (tickers, days)
+        window: Number of bars in each window
+
+    Returns:
+        Array of the same shape, NaN until a full window is available
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return result
+    result[:, window - 1:] = sliding_window_view(values, window, axis=1).std(axis=2)
+    return result
+
+
+def smooth(values: np.ndarray, alpha: float, min_periods: int = 1, seed_periods: int = 1) -> np.ndarray:
+    """Exponential smoothing along each row, seeded with the mean of each row's first values.
+
+    Computes y[t] = alpha * x[t] + (1 - alpha) * y[t - 1] as a linear filter
+    over the whole matrix at once. Leading NaN padding is excluded by seeding
+    the filter from the first valid values of each row; the smoothed value
+    equals the seed for the first `seed_periods` bars.
+
+    Args:
+        values: Array of shape (tickers, days)
+        alpha: Smoothing factor in (0, 1]
+        min_periods: Bars of history required before a value is reported
+        seed_periods: Valid bars averaged into the seed (1 seeds with the
+            first value)
+
+    Returns:
+        Array of the same shape, NaN before `min_periods` valid bars
+    """
+    if values.shape[1] == 0:
+        return values.copy()
+    first = _first_valid(values)
+    columns = np.arange(values.shape[1])
+    seeding = (columns[None, :] >= first[:, None]) & (columns[None, :] < (first + seed_periods)[:, None])
+    seeding &= ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        seed = np.where(seeding, values, 0.0).sum(axis=1) / seeding.sum(axis=1)
+
+    # Replace the padding and the seed bars with the seed so the filter starts at steady state
+    padded = columns[None, :] < (first + seed_periods)[:, None]
+    filled = np.where(padded, seed[:, None], values)
+    filled = np.nan_to_num(filled, nan=0.0)
+
+    b, a = [alpha], [1.0, alpha - 1.0]
+    result, _ = lfilter(b, a, filled, axis=1, zi=((1.0 - alpha) * seed)[:, None])
+    result[columns[None, :] < (first + min_periods - 1)[:, None]] = np.nan
+    return result
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with the conventional alpha = 2 / (span + 1).
+
+    Args:
+        values: Array of shape (tickers, days)
+        span: EMA span in bars
+
+    Returns:
+        Array of the same shape
+    """
+    return smooth(values, 2.0 / (span + 1), min_periods=span)
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (alpha = 1 / period), as used by RSI and ATR.
+
+    Seeded, as Wilder defined it, with the simple average of the first
+    `period` values.
+
+    Args:
+        values: Array of shape (tickers, days)
+        period: Smoothing period in bars
+
+    Returns:
+        Array of the same shape
+    """
+    return smooth(values, 1.0 / period, min_periods=period, seed_periods=period)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index.
+
+    Args:
+        close: Closing prices of shape (tickers, days)
+        period: RSI period in bars
+
+    Returns:
+        RSI between 0 and 100
+    """
+    change = np.diff(close, axis=1, prepend=np.nan)
+    gains = wilder(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), period)
+    losses = wilder(np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0)), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = gains / losses
+        result = 100.0 - 100.0 / (1.0 + strength)
+    # No losses at all means maximum strength
+    return np.where((losses == 0) & (gains > 0), 100.0, np.where((losses == 0) & (gains == 0), 50.0, result))
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Moving Average Convergence Divergence.
+
+    Args:
+        close: Closing prices of shape (tickers, days)
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal line EMA span
+
+    Returns:
+        Tuple of (MACD line, signal line, histogram)
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close: np.ndarray, window: int = 20, width: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger bands.
+
+    Args:
+        close: Closing prices of shape (tickers, days)
+        window: Moving average window
+        width: Band width in standard deviations
+
+    Returns:
+        Tuple of (upper band, middle band, lower band)
+    """
+    middle = sma(close, window)
+    deviation = rolling_std(close, window)
+    return middle + width * deviation, middle, middle - width * deviation
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range.
+
+    Args:
+        high: High prices of shape (tickers, days)
+        low: Low prices
+        close: Closing prices
+        period: Smoothing period in bars
+
+    Returns:
+        ATR in price units
+    """
+    previous = np.roll(close, 1, axis=1)
+    previous[:, 0] = np.nan
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+    return wilder(true_range, period)
+
+
+def pivots(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    span: int = PIVOT_SPAN,
+    lookback: int = PIVOT_LOOKBACK
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Nearest support and resistance from swing lows and highs.
+
+    A swing low (high) is a bar whose low (high) is the extreme of the
+    `span` bars on either side. Support is the highest swing low below the
+    last close and resistance the lowest swing high above it, within the
+    last `lookback` bars.
+
+    Args:
+        high: High prices of shape (tickers, days)
+        low: Low prices
+        close: Closing prices
+        span: Bars on each side a pivot must dominate
+        lookback: Bars searched for pivots
+
+    Returns:
+        Tuple of (support, resistance), one value per ticker (NaN if none)
+    """
+    tickers, days = close.shape
+    window = 2 * span + 1
+    if days < window:
+        return np.full(tickers, np.nan), np.full(tickers, np.nan)
+
+    # Centre bars of each full window, within the lookback
+    centre_high = high[:, span:days - span]
+    centre_low = low[:, span:days - span]
+    swing_high = centre_high == sliding_window_view(high, window, axis=1).max(axis=2)
+    swing_low = centre_low == sliding_window_view(low, window, axis=1).min(axis=2)
+    recent = np.arange(span, days - span) >= days - lookback
+
+    last = close[:, -1:]
+    with np.errstate(invalid="ignore"):
+        supports = np.where(swing_low & recent & (centre_low < last), centre_low, np.nan)
+        resistances = np.where(swing_high & recent & (centre_high > last), centre_high, np.nan)
+    support = np.full(tickers, np.nan)
+    resistance = np.full(tickers, np.nan)
+    has_support = ~np.isnan(supports).all(axis=1)
+    has_resistance = ~np.isnan(resistances).all(axis=1)
+    support[has_support] = np.nanmax(supports[has_support], axis=1)
+    resistance[has_resistance] = np.nanmin(resistances[has_resistance], axis=1)
+    return support, resistance
+
+
+def compute_indicators(
+    series: Mapping[str, PriceSeries],
+    lookback: int = DEFAULT_LOOKBACK
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """Compute the latest technical indicators for every ticker in one pass.
+
+    Args:
+        series: Price series by ticker
+        lookback: Bars of history used per ticker
+
+    Returns:
+        Dict of ticker to indicator values (None where history is too short)
+    """
+    if not series:
+        return {}
+    matrix = PriceMatrix.from_series(series, lookback)
+    close, high, low, volume = matrix.close, matrix.high, matrix.low, matrix.volume
+
+    macd_line, macd_signal, macd_histogram = macd(close)
+    bollinger_upper, bollinger_middle, bollinger_lower = bollinger(close)
+    support, resistance = pivots(high, low, close)
+
+    latest = {
+        "current_price": close[:, -1],
+        "moving_average_50d": sma(close, 50)[:, -1],
+        "moving_average_200d": sma(close, 200)[:, -1],
+        "ema_12d": ema(close, 12)[:, -1],
+        "ema_26d": ema(close, 26)[:, -1],
+        "rsi_14": rsi(close)[:, -1],
+        "macd": macd_line[:, -1],
+        "macd_signal": macd_signal[:, -1],
+        "macd_histogram": macd_histogram[:, -1],
+        "bollinger_upper": bollinger_upper[:, -1],
+        "bollinger_middle": bollinger_middle[:, -1],
+        "bollinger_lower": bollinger_lower[:, -1],
+        "atr_14": atr(high, low, close)[:, -1],
+        "volume_avg_30d": sma(volume, 30)[:, -1],
+        "support": support,
+        "resistance": resistance,
+    }
+
+    return {
+        ticker: {
+            name: (float(values[row]) if np.isfinite(values[row]) else None)
+            for name, values in latest.items()
+        }
+        for row, ticker in enumerate(matrix.tickers)
+    }
+
+
+def indicator_signals(values: Mapping[str, Optional[float]]) -> Tuple[str, List[str]]:
+    """Derive a trend and trading signals from indicator values.
+
+    Args:
+        values: Indicator values as returned by `compute_indicators`
+
+    Returns:
+        Tuple of (trend, signals), trend being Bullish, Bearish or Neutral
+    """
+    price = values.get("current_price")
+    ma_50d = values.get("moving_average_50d")
+    ma_200d = values.get("moving_average_200d")
+    signals = []
+
+    if price is not None and ma_50d is not None and ma_200d is not None:
+        if price > ma_50d > ma_200d:
+            trend = "Bullish"
+        elif price < ma_50d < ma_200d:
+            trend = "Bearish"
+        else:
+            trend = "Neutral"
+        signals.append("50-day MA above 200-day MA" if ma_50d > ma_200d else "50-day MA below 200-day MA")
+    else:
+        trend = "Neutral"
+
+    rsi_14 = values.get("rsi_14")
+    if rsi_14 is not None:
+        if rsi_14 >= 70:
+            signals.append(f"RSI overbought ({rsi_14:.0f})")
+        elif rsi_14 <= 30:
+            signals.append(f"RSI oversold ({rsi_14:.0f})")
+
+    histogram = values.get("macd_histogram")
+    if histogram is not None:
+        signals.append("MACD above signal line" if histogram > 0 else "MACD below signal line")
+
+    if price is not None:
+        if values.get("bollinger_upper") is not None and price > values["bollinger_upper"]:
+            signals.append("Price above upper Bollinger band")
+        elif values.get("bollinger_lower") is not None and price < values["bollinger_lower"]:
+            signals.append("Price below lower Bollinger band")
+
+    return trend, signals
@@ -0,0 +1,205 @@
+"""Shared OpenRouter models and agents.
+
+Models and agents are created once per model name and reused for every
+ticker and run in the process. All of them talk to OpenRouter through one
+pooled httpx client, so connections stay open between LLM calls instead of
+being re-established for each ticker.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from hedgehog.tools.llm_cache import llm_cache
+
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+DEFAULT_MODEL = "anthropic/claude-3.5-sonnet"
+
+# Times an invalid structured result is sent back to the model for repair
+STRUCTURED_OUTPUT_RETRIES = 1
+
+# OpenRouter list prices in USD per million (input, output) tokens, used for cost estimates.
+# HEDGEHOG_MODEL_PRICES may hold a JSON object of the same shape to add or override models.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "openai/gpt-4o": (2.5, 10.0),
+    "openai/gpt-4.5-preview": (75.0, 150.0),
+    "openai/o3-mini": (1.1, 4.4),
+    "openai/o3-mini-high": (1.1, 4.4),
+    "openai/o1": (15.0, 60.0),
+    "openai/o1-mini": (1.1, 4.4),
+    "anthropic/claude-3.5-sonnet": (3.0, 15.0),
+    "anthropic/claude-3.7-sonnet": (3.0, 15.0),
+    "deepseek/deepseek-r1-distill-llama-70b": (0.23, 0.69),
+    "deepseek/deepseek-r1-distill-qwen-32b": (0.12, 0.18),
+    **{name: tuple(prices) for name, prices in json.loads(os.getenv("HEDGEHOG_MODEL_PRICES", "{}")).items()},
+}
+
+
+def estimate_cost(model_name: str, input_tokens: Optional[int], output_tokens: Optional[int]) -> Optional[float]:
+    """Estimate the cost of a call from its token counts.
+
+    Args:
+        model_name: OpenRouter model name
+        input_tokens: Prompt tokens
+        output_tokens: Completion tokens
+
+    Returns:
+        Cost in USD, or None if the model's price is unknown
+    """
+    prices = MODEL_PRICES.get(model_name)
+    if prices is None:
+        return None
+    return ((input_tokens or 0) * prices[0] + (output_tokens or 0) * prices[1]) / 1_000_000
+
+
+class ModelRegistry:
+    """Process-wide registry of OpenRouter models and agents sharing one connection pool.
+
+    The httpx client is created lazily on first use so it binds to the running
+    event loop, and is torn down by `close()` at the end of a run.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 120.0
+    ):
+        """Initialize the registry.
+
+        Args:
+            max_connections: Maximum number of simultaneous connections to OpenRouter
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open for reuse
+            timeout: Timeout in seconds for a single LLM request
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._provider: Optional[OpenAIProvider] = None
+        self._models: Dict[str, OpenAIModel] = {}
+        self._agents: Dict[str, Agent] = {}
+        self._stats = {"requests": 0, "models_created": 0, "agents_created": 0}
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self._stats["requests"] += 1
+
+    def http_client(self) -> httpx.AsyncClient:
+        """Return the shared httpx client, creating it on first use.
+
+        Returns:
+            The pooled httpx client
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                event_hooks={"request": [self._on_request]},
+            )
+            # Models hold the provider of the previous client, so they are rebuilt too
+            self._provider = None
+            self._models.clear()
+            self._agents.clear()
+        return self._http_client
+
+    def provider(self) -> OpenAIProvider:
+        """Return the OpenRouter provider bound to the shared client.
+
+        Returns:
+            The shared provider
+        """
+        http_client = self.http_client()
+        if self._provider is None:
+            self._provider = OpenAIProvider(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=os.getenv("OPENROUTER_API_KEY"),
+                http_client=http_client,
+            )
+        return self._provider
+
+    def model(self, model_name: str = DEFAULT_MODEL) -> OpenAIModel:
+        """Return the shared model for a model name.
+
+        Args:
+            model_name: OpenRouter model name (e.g. 'anthropic/claude-3.5-sonnet')
+
+        Returns:
+            The model, created on first use
+        """
+        provider = self.provider()
+        if model_name not in self._models:
+            self._models[model_name] = OpenAIModel(model_name, provider=provider)
+            self._stats["models_created"] += 1
+        return self._models[model_name]
+
+    def agent(self, model_name: str = DEFAULT_MODEL) -> Agent:
+        """Return the shared agent for a model name.
+
+        Agents keep no per-run state, so one agent serves every ticker.
+
+        Args:
+            model_name: OpenRouter model name
+
+        Returns:
+            The agent, created on first use
+        """
+        model = self.model(model_name)
+        if model_name not in self._agents:
+            self._agents[model_name] = Agent(model, result_retries=STRUCTURED_OUTPUT_RETRIES)
+            self._stats["agents_created"] += 1
+        return self._agents[model_name]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return registry and connection pool statistics.
+
+        Returns:
+            Dict with request, model and agent counters and open connections
+        """
+        stats = dict(self._stats)
+        open_connections = 0
+        if self._http_client is not None and not self._http_client.is_closed:
+            # httpx keeps its httpcore connection pool on the transport
+            pool = getattr(self._http_client._transport, "_pool", None)
+            open_connections = len(getattr(pool, "connections", ()))
+        stats["open_connections"] = open_connections
+        return stats
+
+    async def close(self) -> None:
+        """Close the shared client and drop the models and agents bound to it."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._provider = None
+        self._models.clear()
+        self._agents.clear()
+
+
+# Global instance shared by the workflow and the backtester
+model_registry = ModelRegistry()
+
+
+def llm_stats() -> Dict[str, Any]:
+    """Return statistics for the OpenRouter client and the LLM cache.
+
+    Returns:
+        Dict with `client` and `cache` statistics
+    """
+    return {"client": model_registry.stats(), "cache": llm_cache.stats()}
+
+
+async def close_llm_clients() -> None:
+    """Close the shared OpenRouter client and the LLM cache."""
+    await model_registry.close()
+    llm_cache.close()
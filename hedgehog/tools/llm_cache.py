@@ -0,0 +1,168 @@
+"""Content-addressed cache of LLM completions.
+
+Completions are keyed by model name, a hash of the normalised prompt and the
+generation settings, so re-running an analysis or a backtest on unchanged
+inputs never pays for the same completion twice.
+"""
+
+import hashlib
+import json
+import os
+import re
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from hedgehog.tools.cache import CACHE_DIR, DiskCache
+
+# Completions older than this are expired (default 30 days)
+LLM_CACHE_MAX_AGE = float(os.getenv("HEDGEHOG_LLM_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("HEDGEHOG_LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalise whitespace that does not change a prompt's meaning.
+
+    Common indentation, trailing spaces and runs of blank lines are removed so
+    prompts built from differently indented f-strings hash the same.
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        Normalised prompt text
+    """
+    lines = [line.rstrip() for line in textwrap.dedent(prompt).strip().splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines))
+
+
+def completion_key(model_name: str, prompt: str, settings: Optional[Dict[str, Any]] = None) -> str:
+    """Build the content address of a completion.
+
+    Args:
+        model_name: Model the completion is requested from
+        prompt: Prompt text
+        settings: Generation settings (temperature, result type, ...)
+
+    Returns:
+        Hex SHA-256 digest identifying the completion
+    """
+    identity = json.dumps(
+        {"model": model_name, "prompt": normalize_prompt(prompt), "settings": settings or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed cache of LLM completions with size- and age-based eviction.
+
+    Each model gets its own namespace in the underlying DiskCache, so hit
+    rates are reported per model. Modes are those of DiskCache: `refresh`
+    bypasses lookups, `readonly` serves hits without storing new completions
+    and `off` disables the cache.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        max_age: Optional[float] = LLM_CACHE_MAX_AGE,
+        mode: str = "use"
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Maximum total size of stored completions before LRU eviction
+            max_age: Age in seconds after which completions expire
+            mode: Cache mode (use/refresh/readonly/off)
+        """
+        self._cache = DiskCache(path, max_bytes=max_bytes, mode=mode, max_age=max_age)
+
+    @property
+    def mode(self) -> str:
+        """Get the current cache mode."""
+        return self._cache.mode
+
+    @mode.setter
+    def mode(self, value: str) -> None:
+        """Set the cache mode.
+
+        Args:
+            value: One of "use", "refresh", "readonly" or "off"
+        """
+        self._cache.mode = value
+
+    def get(
+        self,
+        model_name: str,
+        prompt: str,
+        settings: Optional[Dict[str, Any]] = None,
+        result_type: Type = str
+    ) -> Any:
+        """Look up a completion.
+
+        Args:
+            model_name: Model the completion is requested from
+            prompt: Prompt text
+            settings: Generation settings
+            result_type: Type the completion is decoded into
+
+        Returns:
+            The cached result data, or None on a miss
+        """
+        payload = self._cache.get(model_name, completion_key(model_name, prompt, settings))
+        if payload is None:
+            return None
+        data = payload["data"]
+        if isinstance(result_type, type) and issubclass(result_type, BaseModel):
+            try:
+                data = result_type.model_validate(data)
+            except ValueError:
+                # Stored under an older version of the schema
+                return None
+        return data
+
+    def put(self, model_name: str, prompt: str, data: Any, settings: Optional[Dict[str, Any]] = None) -> None:
+        """Store a completion.
+
+        Args:
+            model_name: Model the completion came from
+            prompt: Prompt text
+            data: Result data (a string or a pydantic model)
+            settings: Generation settings
+        """
+        if isinstance(data, BaseModel):
+            data = data.model_dump(mode="json")
+        self._cache.put(model_name, completion_key(model_name, prompt, settings), {"data": data})
+
+    def clear(self, model_name: Optional[str] = None) -> None:
+        """Remove cached completions.
+
+        Args:
+            model_name: Only clear completions of this model (clears everything if None)
+        """
+        self._cache.clear(model_name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters per model and overall.
+
+        Returns:
+            Dict with per-model counters, totals, hit rate and stored size
+        """
+        return self._cache.stats()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._cache.close()
+
+
+# Global instance used by the workflow
+llm_cache = LLMCache(CACHE_DIR / "llm.sqlite3")
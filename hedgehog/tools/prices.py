@@ -0,0 +1,421 @@
+"""Columnar price history storage backed by NumPy arrays."""
+
+import shutil
+import time
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from hedgehog.tools.cache import CACHE_DIR
+
+# Numeric columns held for every bar, in storage order
+PRICE_FIELDS = ("open", "high", "low", "close", "adj_close", "volume")
+
+# Payload keys that may carry each column
+_PAYLOAD_KEYS = {
+    "open": ("open",),
+    "high": ("high",),
+    "low": ("low",),
+    "close": ("close",),
+    "adj_close": ("adj_close", "adjusted_close", "adjClose"),
+    "volume": ("volume",),
+}
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+# Calendar days between two bars beyond which a stored history is considered to have a gap
+MAX_GAP_DAYS = 5
+
+# Relative price difference on an overlapping bar that signals a split or dividend adjustment
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Length of each API period unit in days
+_PERIOD_UNITS = {"d": 1, "w": 7, "m": 31, "y": 366}
+
+
+def to_day(value: DateLike) -> np.datetime64:
+    """Convert a date-like value to a day-resolution datetime64.
+
+    Args:
+        value: Date string (YYYY-MM-DD or ISO timestamp), date, datetime or datetime64
+
+    Returns:
+        numpy.datetime64 with day resolution
+    """
+    if isinstance(value, str):
+        value = value[:10]
+    elif isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def period_start(period: str, today: Optional[DateLike] = None) -> Optional[np.datetime64]:
+    """Return the oldest date an API period reaches back to.
+
+    Args:
+        period: Period string such as '5d', '3m' or '1y' ('max' has no start)
+        today: Reference date (defaults to today)
+
+    Returns:
+        Start date, or None if the period is unbounded or not understood
+    """
+    today = to_day(today if today is not None else date.today())
+    if period == "ytd":
+        return np.datetime64(f"{str(today)[:4]}-01-01", "D")
+
+    count, unit = period[:-1], period[-1:]
+    if not count.isdigit() or unit not in _PERIOD_UNITS:
+        return None
+    return today - np.timedelta64(int(count) * _PERIOD_UNITS[unit], "D")
+
+
+class PriceSeries:
+    """Daily price bars for one ticker stored as contiguous, date-sorted columns."""
+
+    def __init__(
+        self,
+        ticker: str,
+        dates: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        adj_close: np.ndarray,
+        volume: np.ndarray
+    ):
+        """Initialize the series from already sorted columns.
+
+        Args:
+            ticker: Stock ticker symbol
+            dates: Bar dates as datetime64[D], ascending
+            open: Opening prices
+            high: High prices
+            low: Low prices
+            close: Closing prices
+            adj_close: Closing prices adjusted for splits and dividends
+            volume: Traded volume
+        """
+        self.ticker = ticker
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.adj_close = adj_close
+        self.volume = volume
+
+    @classmethod
+    def empty(cls, ticker: str) -> "PriceSeries":
+        """Create a series with no bars."""
+        columns = {field: np.empty(0, dtype=np.float64) for field in PRICE_FIELDS}
+        return cls(ticker, np.empty(0, dtype="datetime64[D]"), **columns)
+
+    @classmethod
+    def from_bars(cls, ticker: str, bars: List[Dict[str, Any]]) -> "PriceSeries":
+        """Build a series from a list of bar dicts.
+
+        Args:
+            ticker: Stock ticker symbol
+            bars: Bars with a `time` or `date` key and OHLCV values
+
+        Returns:
+            PriceSeries sorted by date with one bar per day
+        """
+        builder = PriceSeriesBuilder(ticker)
+        for bar in bars:
+            builder.append(bar)
+        return builder.build()
+
+    @classmethod
+    def from_payload(cls, ticker: str, payload: Any) -> "PriceSeries":
+        """Build a series from a price history API payload.
+
+        Args:
+            ticker: Stock ticker symbol
+            payload: Dict with a `prices` list, or a list of bars
+
+        Returns:
+            PriceSeries for the payload's bars
+        """
+        if isinstance(payload, dict):
+            payload = payload.get("prices") or []
+        return cls.from_bars(ticker, payload if isinstance(payload, list) else [])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def first_date(self) -> Optional[np.datetime64]:
+        """Date of the oldest bar, or None if the series is empty."""
+        return self.dates[0] if len(self) else None
+
+    @property
+    def last_date(self) -> Optional[np.datetime64]:
+        """Date of the most recent bar, or None if the series is empty."""
+        return self.dates[-1] if len(self) else None
+
+    @property
+    def latest_price(self) -> Optional[float]:
+        """Close of the most recent bar, or None if the series is empty."""
+        return float(self.close[-1]) if len(self) else None
+
+    def index_as_of(self, when: DateLike) -> int:
+        """Return the index of the last bar on or before a date (-1 if there is none).
+
+        Args:
+            when: Lookup date
+
+        Returns:
+            Bar index found by binary search
+        """
+        return int(np.searchsorted(self.dates, to_day(when), side="right")) - 1
+
+    def as_of(self, when: DateLike) -> Optional[Dict[str, Any]]:
+        """Return the last bar on or before a date.
+
+        Args:
+            when: Lookup date
+
+        Returns:
+            Bar dict, or None if the series has no bar on or before the date
+        """
+        index = self.index_as_of(when)
+        if index < 0:
+            return None
+        bar = {field: float(getattr(self, field)[index]) for field in PRICE_FIELDS}
+        bar["date"] = str(self.dates[index])
+        return bar
+
+    def price_as_of(self, when: DateLike) -> Optional[float]:
+        """Return the close of the last bar on or before a date.
+
+        Args:
+            when: Lookup date
+
+        Returns:
+            Closing price, or None if the series has no bar on or before the date
+        """
+        index = self.index_as_of(when)
+        return float(self.close[index]) if index >= 0 else None
+
+    def _slice(self, selection: slice) -> "PriceSeries":
+        return PriceSeries(
+            self.ticker,
+            self.dates[selection],
+            **{field: getattr(self, field)[selection] for field in PRICE_FIELDS}
+        )
+
+    def window(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> "PriceSeries":
+        """Return the bars between two dates (inclusive) as views on this series.
+
+        Args:
+            start: First date to include (defaults to the beginning)
+            end: Last date to include (defaults to the end)
+
+        Returns:
+            PriceSeries sharing memory with this one
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, to_day(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, to_day(end), side="right"))
+        return self._slice(slice(lo, hi))
+
+    def tail(self, bars: int) -> "PriceSeries":
+        """Return the most recent bars as views on this series.
+
+        Args:
+            bars: Number of bars to keep
+
+        Returns:
+            PriceSeries sharing memory with this one
+        """
+        return self._slice(slice(max(0, len(self) - bars), None))
+
+    def merge(self, newer: "PriceSeries") -> Optional["PriceSeries"]:
+        """Append newer bars to this series.
+
+        The newer bars are expected to start at (or just after) this series'
+        last bar. If they overlap the last bar with a different price, the
+        history has been adjusted for a corporate action; if they start too
+        long after it, bars are missing. Both cases need a full refresh.
+
+        Args:
+            newer: Bars starting at or after this series' last bar
+
+        Returns:
+            The combined series, or None if a full refresh is required
+        """
+        if not len(newer):
+            return self
+        if not len(self):
+            return newer
+
+        overlap = self.index_as_of(newer.first_date)
+        if overlap >= 0 and self.dates[overlap] == newer.first_date:
+            for field in ("close", "adj_close"):
+                stored, fresh = getattr(self, field)[overlap], getattr(newer, field)[0]
+                if abs(fresh - stored) > ADJUSTMENT_TOLERANCE * max(abs(stored), 1e-12):
+                    return None
+            keep = overlap
+        elif (newer.first_date - self.last_date).astype(int) > MAX_GAP_DAYS:
+            return None
+        else:
+            keep = overlap + 1
+
+        return PriceSeries(
+            self.ticker,
+            np.concatenate([self.dates[:keep], newer.dates]),
+            **{field: np.concatenate([getattr(self, field)[:keep], getattr(newer, field)]) for field in PRICE_FIELDS}
+        )
+
+    def to_bars(self) -> List[Dict[str, Any]]:
+        """Convert the series back to a list of bar dicts."""
+        columns = {field: getattr(self, field).tolist() for field in PRICE_FIELDS}
+        return [
+            {"date": str(day), **{field: columns[field][i] for field in PRICE_FIELDS}}
+            for i, day in enumerate(self.dates)
+        ]
+
+
+class PriceSeriesBuilder:
+    """Accumulates bars one at a time into typed arrays, then builds a PriceSeries.
+
+    Used to decode streamed responses without holding every bar as a dict.
+    """
+
+    def __init__(self, ticker: str):
+        """Initialize an empty builder.
+
+        Args:
+            ticker: Stock ticker symbol
+        """
+        self.ticker = ticker
+        self._days = array("q")
+        self._columns = {field: array("d") for field in PRICE_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def append(self, bar: Dict[str, Any]) -> None:
+        """Add one bar; bars without a `time` or `date` are ignored.
+
+        Args:
+            bar: Bar dict with OHLCV values
+        """
+        when = bar.get("time") or bar.get("date")
+        if not when:
+            return
+        self._days.append(int(to_day(when).astype(np.int64)))
+        for field, keys in _PAYLOAD_KEYS.items():
+            value = next((bar[key] for key in keys if bar.get(key) is not None), None)
+            self._columns[field].append(np.nan if value is None else float(value))
+
+    def build(self) -> PriceSeries:
+        """Build the series, sorted by date with one bar per day.
+
+        Returns:
+            PriceSeries holding the appended bars
+        """
+        if not self._days:
+            return PriceSeries.empty(self.ticker)
+
+        dates = np.frombuffer(self._days, dtype=np.int64).astype("datetime64[D]")
+        columns = {field: np.frombuffer(values, dtype=np.float64).copy() for field, values in self._columns.items()}
+
+        # Fall back to the raw close where no adjusted close was provided
+        missing = np.isnan(columns["adj_close"])
+        columns["adj_close"][missing] = columns["close"][missing]
+
+        # Sort by date and keep the last bar seen for each day
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        keep = np.append(dates[1:] != dates[:-1], True)
+        return PriceSeries(self.ticker, dates[keep], **{field: values[order][keep] for field, values in columns.items()})
+
+
+class PriceStore:
+    """On-disk store of price series, one directory of `.npy` columns per ticker.
+
+    Columns are kept as separate uncompressed `.npy` files rather than an
+    `.npz` archive so they can be memory-mapped on load.
+    """
+
+    def __init__(self, root: Path):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory per ticker
+        """
+        self.root = Path(root)
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / ticker.upper()
+
+    def save(self, series: PriceSeries) -> None:
+        """Write a series to disk, replacing any previous version atomically.
+
+        Args:
+            series: Price series to store
+        """
+        path = self._path(series.ticker)
+        staging = path.with_name(f".{path.name}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        np.save(staging / "dates.npy", np.ascontiguousarray(series.dates, dtype="datetime64[D]"))
+        for field in PRICE_FIELDS:
+            np.save(staging / f"{field}.npy", np.ascontiguousarray(getattr(series, field), dtype=np.float64))
+
+        previous = path.with_name(f".{path.name}.old")
+        shutil.rmtree(previous, ignore_errors=True)
+        if path.exists():
+            path.rename(previous)
+        staging.rename(path)
+        shutil.rmtree(previous, ignore_errors=True)
+
+    def age(self, ticker: str) -> Optional[float]:
+        """Return how many seconds ago a ticker's series was last saved.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Age in seconds, or None if nothing is stored for the ticker
+        """
+        path = self._path(ticker) / "dates.npy"
+        if not path.exists():
+            return None
+        return time.time() - path.stat().st_mtime
+
+    def load(self, ticker: str, mmap: bool = True) -> Optional[PriceSeries]:
+        """Load a stored series.
+
+        Args:
+            ticker: Stock ticker symbol
+            mmap: Memory-map the columns instead of reading them into memory
+
+        Returns:
+            PriceSeries, or None if nothing is stored for the ticker
+        """
+        path = self._path(ticker)
+        if not (path / "dates.npy").exists():
+            return None
+
+        mmap_mode = "r" if mmap else None
+        dates = np.load(path / "dates.npy", mmap_mode=mmap_mode)
+        columns = {field: np.load(path / f"{field}.npy", mmap_mode=mmap_mode) for field in PRICE_FIELDS}
+        return PriceSeries(ticker.upper(), dates, **columns)
+
+    def delete(self, ticker: str) -> None:
+        """Remove a stored series.
+
+        Args:
+            ticker: Stock ticker symbol
+        """
+        shutil.rmtree(self._path(ticker), ignore_errors=True)
+
+
+# Shared price store under the cache directory
+price_store = PriceStore(CACHE_DIR / "prices")
@@ -0,0 +1,56 @@
+"""Token-bucket rate limiting for outbound API requests."""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket holds
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._stats = {"acquired": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and take them.
+
+        Args:
+            tokens: Number of tokens to take
+        """
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                wait = (tokens - self._tokens) / self.rate
+                self._stats["throttled"] += 1
+                self._stats["wait_seconds"] += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= tokens
+            self._stats["acquired"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how often and for how long callers were throttled.
+
+        Returns:
+            Dict with acquired, throttled and total wait seconds
+        """
+        return dict(self._stats)
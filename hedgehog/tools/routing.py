@@ -0,0 +1,156 @@
+"""Per-role model routing with escalation to stronger models.
+
+A routing table maps each analyst role to a cascade of models, cheapest
+first. A role is an analyses key ("fundamental", "technical", "sentiment",
+"investor_warren_buffett", ...), "investor" for every investor without a
+route of their own, or "decision" for the portfolio manager. Roles without a
+route use the run's model, so an empty table routes everything to it.
+
+Routing files are JSON:
+
+    {
+        "min_confidence": 5,
+        "routes": {
+            "sentiment": ["deepseek/deepseek-r1-distill-qwen-32b", "anthropic/claude-3.5-sonnet"],
+            "technical": ["deepseek/deepseek-r1-distill-qwen-32b", "anthropic/claude-3.5-sonnet"],
+            "decision": "anthropic/claude-3.7-sonnet"
+        }
+    }
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from hedgehog.tools.llm import estimate_cost
+
+# Analyst confidence (1-10) below which a result is escalated to the next model
+DEFAULT_MIN_CONFIDENCE = 5
+
+
+class RoutingTable:
+    """Cascades of models per analyst role."""
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, Union[str, List[str]]]] = None,
+        min_confidence: int = DEFAULT_MIN_CONFIDENCE
+    ):
+        """Initialize the table.
+
+        Args:
+            routes: Model name or cascade of model names (cheapest first) per role
+            min_confidence: Confidence below which a structured result is escalated
+        """
+        self.routes = {
+            role: [models] if isinstance(models, str) else list(models)
+            for role, models in (routes or {}).items()
+        }
+        for role, models in self.routes.items():
+            if not models:
+                raise ValueError(f"Route for {role!r} lists no models")
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "RoutingTable":
+        """Load a routing table from a JSON file.
+
+        Args:
+            path: Path of the routing file
+
+        Returns:
+            The routing table
+        """
+        with open(path, "r", encoding="utf-8") as routing_file:
+            config = json.load(routing_file)
+        return cls(config.get("routes", {}), config.get("min_confidence", DEFAULT_MIN_CONFIDENCE))
+
+    def models(self, role: str, default_model: str) -> List[str]:
+        """Return the cascade of models for a role.
+
+        Args:
+            role: Analyses key, "investor" or "decision"
+            default_model: Model used by roles without a route
+
+        Returns:
+            Model names, cheapest first
+        """
+        if role in self.routes:
+            return self.routes[role]
+        if role.startswith("investor_") and "investor" in self.routes:
+            return self.routes["investor"]
+        return [default_model]
+
+    def is_routed(self) -> bool:
+        """Return whether any role is routed away from the run's model."""
+        return bool(self.routes)
+
+    def report(self, records: List[Dict[str, Any]], baseline_model: str) -> Dict[str, Any]:
+        """Compare the LLM calls of a run against sending every call to one model.
+
+        The baseline makes one call per routed call, with the same tokens, on
+        `baseline_model`; attempts that were escalated are pure overhead of
+        the cascade. Baseline latency is estimated from the seconds per output
+        token the baseline model showed in this run, so it is unknown if the
+        baseline model served no call.
+
+        Args:
+            records: LLM call records as kept by the call recorder
+            baseline_model: Model every call would have used without routing
+
+        Returns:
+            Dict with call and escalation counts and actual versus baseline
+            cost and latency
+        """
+        calls = [record for record in records if record["kind"] == "llm" and not record.get("cached")]
+        accepted = [record for record in calls if not record.get("escalated") and not record.get("error")]
+
+        # Seconds per output token of the baseline model, from its own calls
+        baseline_calls = [record for record in accepted if record.get("model") == baseline_model and record.get("output_tokens")]
+        baseline_output = sum(record["output_tokens"] for record in baseline_calls)
+        seconds_per_token = sum(record["duration"] for record in baseline_calls) / baseline_output if baseline_output else None
+
+        actual_cost = sum(record.get("cost") or 0.0 for record in calls)
+        baseline_cost = sum(
+            estimate_cost(baseline_model, record.get("input_tokens"), record.get("output_tokens")) or 0.0
+            for record in accepted
+        )
+        actual_seconds = sum(record["duration"] for record in calls)
+        baseline_seconds = None
+        if seconds_per_token is not None:
+            baseline_seconds = sum(
+                record["duration"] if record.get("model") == baseline_model
+                else (record.get("output_tokens") or 0) * seconds_per_token
+                for record in accepted
+            )
+
+        by_model: Dict[str, int] = {}
+        for record in accepted:
+            by_model[record.get("model") or "unknown"] = by_model.get(record.get("model") or "unknown", 0) + 1
+
+        return {
+            "baseline_model": baseline_model,
+            "calls": len(accepted),
+            "calls_by_model": dict(sorted(by_model.items())),
+            "escalations": sum(1 for record in calls if record.get("escalated")),
+            "actual_cost": actual_cost,
+            "baseline_cost": baseline_cost,
+            "cost_saved": baseline_cost - actual_cost,
+            "actual_seconds": actual_seconds,
+            "baseline_seconds": baseline_seconds,
+            "seconds_saved": baseline_seconds - actual_seconds if baseline_seconds is not None else None,
+        }
+
+
+# Global routing table used by the workflow
+model_routing = RoutingTable()
+
+
+def configure_routing(table: RoutingTable) -> None:
+    """Apply a routing table to the global one.
+
+    Args:
+        table: Routing table to use
+    """
+    model_routing.routes = table.routes
+    model_routing.min_confidence = table.min_confidence
@@ -0,0 +1,72 @@
+"""Single-flight coalescing of identical requests within a run."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Share one in-flight call, and its result, between identical requests.
+
+    The first caller for a key starts the call; concurrent and later callers
+    for the same key await the same task instead of issuing a duplicate.
+    Successful results are kept until `reset()` is called at the end of the
+    run, while failed calls are forgotten so they can be retried.
+    """
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._stats.setdefault(namespace, {"calls": 0, "absorbed": 0})
+        counters[counter] += 1
+
+    def _forget_failed(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished call from the group if it did not succeed."""
+        if (task.cancelled() or task.exception() is not None) and self._calls.get(key) is task:
+            del self._calls[key]
+
+    async def do(self, namespace: str, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `factory` once per key and share its result.
+
+        Args:
+            namespace: Group used for reporting (e.g. an API endpoint)
+            key: Identity of the request
+            factory: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda done, key=key: self._forget_failed(key, done))
+            self._calls[key] = task
+            self._count(namespace, "calls")
+        else:
+            self._count(namespace, "absorbed")
+
+        # Shield the shared task so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many calls were made and how many duplicates were absorbed.
+
+        Returns:
+            Dict with per-namespace counters and totals
+        """
+        calls = sum(counters["calls"] for counters in self._stats.values())
+        absorbed = sum(counters["absorbed"] for counters in self._stats.values())
+        return {
+            "namespaces": {namespace: dict(counters) for namespace, counters in self._stats.items()},
+            "calls": calls,
+            "absorbed": absorbed,
+        }
+
+    def reset(self) -> None:
+        """Forget all shared results, cancelling any call that is still in flight."""
+        for task in self._calls.values():
+            if not task.done():
+                task.cancel()
+        self._calls.clear()
@@ -0,0 +1,87 @@
+"""Incremental decoding of large JSON API responses."""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Optional
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes], key: Optional[str] = None) -> AsyncIterator[Any]:
+    """Decode the items of a JSON array as the response body streams in.
+
+    Only the item currently being decoded is buffered, so a response holding
+    thousands of records never has to be held, or parsed into one object
+    tree, as a whole. Items are expected to be objects, arrays or strings.
+
+    Args:
+        chunks: Response body chunks
+        key: Name of the top-level field holding the array; the body itself
+            may also be a bare array
+
+    Yields:
+        Each decoded array item, in order
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    start_pattern = re.compile(rf'"{re.escape(key)}"\s*:\s*\[') if key else None
+
+    buffer = ""
+    position = 0
+    in_array = False
+    finished = False
+
+    async def read_more() -> bool:
+        nonlocal buffer, position
+        async for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                buffer = buffer[position:] + text
+                position = 0
+                return True
+        buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        position = 0
+        return False
+
+    more = True
+    while not finished:
+        if not in_array:
+            stripped = buffer.lstrip()
+            if stripped.startswith("["):
+                position = len(buffer) - len(stripped) + 1
+                in_array = True
+                continue
+            match = start_pattern.search(buffer) if start_pattern else None
+            if match:
+                position = match.end()
+                in_array = True
+                continue
+            if stripped and not stripped.startswith("{"):
+                raise ValueError("Response body is not a JSON object or array")
+            if not more:
+                # The array was never found, e.g. an empty or error payload
+                return
+            more = await read_more()
+            continue
+
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == ",":
+            position = _WHITESPACE.match(buffer, position + 1).end()
+        if position < len(buffer) and buffer[position] == "]":
+            finished = True
+            continue
+
+        if position < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                item, end = None, None
+            if end is not None and (end < len(buffer) or not more):
+                position = end
+                yield item
+                continue
+
+        if not more:
+            raise ValueError("Response body ended inside a JSON array")
+        more = await read_more()
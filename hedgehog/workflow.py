@@ -1,23 +1,420 @@
 """Workflow implementation for the Hedgehog AI Hedge Fund analysis process."""
 
-from typing import Dict, Any, List, Optional
+from typing import Annotated, Awaitable, Callable, Dict, Any, List, Optional, Tuple, Union
 import asyncio
-from pydantic import BaseModel, Field
+import time
+from pydantic import BaseModel, BeforeValidator, Field, ValidationError
+from pydantic_core import from_json
 from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.exceptions import UnexpectedModelBehavior, UsageLimitExceeded
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.usage import Usage, UsageLimits
 from hedgehog.tools.logfire_setup import *
 # Import our API functions
 from hedgehog.tools.api import (
     fetch_company_data,
-    fetch_price_history,
+    fetch_price_series,
     fetch_news_data,
     fetch_peer_companies,
 )
 
-# Import our progress tracker
+# Import our progress tracker and instrumentation hooks
 from hedgehog.progress import progress
+from hedgehog.checkpoint import checkpoints
+from hedgehog.instrumentation import call_recorder, events, instrument_context
+from hedgehog.pipeline import PIPELINE_STATE_DIR, Node, NodeContext, Pipeline
+from hedgehog.tools.llm import DEFAULT_MODEL, STRUCTURED_OUTPUT_RETRIES, estimate_cost, model_registry
+from hedgehog.tools.hedging import HedgedCall, llm_hedging
+from hedgehog.tools.incremental import incremental_analyses
+from hedgehog.tools.llm_cache import llm_cache
+from hedgehog.tools.routing import model_routing
+from hedgehog.tools.compact import (
+    COMPANY_FIELDS,
+    FINANCIAL_FIELDS,
+    NEWS_FIELDS,
+    compact,
+    render,
+    serialize_company,
+    serialize_financials,
+    serialize_news,
+    serialize_prices,
+    summarize_prices,
+)
+from hedgehog.tools.indicators import compute_indicators, indicator_signals
+from hedgehog.tools.prices import PriceSeries
+
+# An agent, or a cascade of agents from cheapest to strongest
+AgentCascade = Union[Agent, List[Agent]]
+
+# Analysts used when none are selected
+DEFAULT_ANALYSTS = [
+    "Fundamental Analyst",
+    "Technical Analyst",
+    "Warren Buffett"
+]
+
+# Default cap on LLM calls in flight across all tickers
+DEFAULT_MAX_LLM_CALLS = 8
+
+# Caps in-flight LLM calls independently of the data API connection pool
+llm_semaphore = asyncio.Semaphore(DEFAULT_MAX_LLM_CALLS)
+
+
+# Whether analyst and decision calls stream their responses
+llm_streaming = False
+
+# Seconds partial results are grouped by before they are parsed and reported
+STREAM_DEBOUNCE = 0.1
+
+# Characters of streamed text shown in the progress display
+STREAM_PREVIEW_CHARS = 48
+
+
+def configure_llm_streaming(enabled: bool) -> None:
+    """Enable or disable streaming of LLM responses.
+
+    Args:
+        enabled: Whether responses are streamed
+    """
+    global llm_streaming
+    llm_streaming = enabled
+
+
+# What happens to the portfolio manager's synthesis call when the analysts agree:
+# "always" makes it, "skip" replaces it with a summary of the vote and "defer"
+# makes it in the background while the run continues
+DECISION_POLICIES = ["always", "skip", "defer"]
+decision_policy = "always"
+
+# Share of analysts agreeing on the majority recommendation for the policy to apply
+consensus_threshold = 1.0
+
+# Syntheses deferred by the "defer" policy, by ticker
+deferred_syntheses: Dict[str, asyncio.Task] = {}
+
+
+def configure_decision_policy(policy: str, threshold: float = 1.0) -> None:
+    """Set how the portfolio manager's synthesis call is handled on consensus.
+
+    Args:
+        policy: One of DECISION_POLICIES
+        threshold: Share of analysts (0-1) that must agree on the majority recommendation
+    """
+    global decision_policy, consensus_threshold
+    if policy not in DECISION_POLICIES:
+        raise ValueError(f"Unknown decision policy {policy!r}, expected one of {DECISION_POLICIES}")
+    decision_policy = policy
+    consensus_threshold = threshold
+
 
-# Define our model schemas
+def configure_llm_concurrency(max_calls: int) -> None:
+    """Set the maximum number of LLM calls in flight across all tickers.
+
+    Args:
+        max_calls: Maximum number of concurrent LLM calls
+    """
+    global llm_semaphore
+    llm_semaphore = asyncio.Semaphore(max_calls)
+
+
+def _analyst_display_name(key: str) -> str:
+    """Map an analyses dict key (e.g. 'investor_warren_buffett') to the analyst's display name.
+
+    Args:
+        key: Key in the analyses dict
+
+    Returns:
+        Analyst name as shown by the progress tracker
+    """
+    for name, spec in ANALYSTS.items():
+        if spec.key == key:
+            return name
+    if key.startswith("investor_"):
+        parts = key.replace("investor_", "").split("_")
+        return " ".join(part.capitalize() for part in parts)
+    return f"{key.capitalize()} Analyst"
+
+
+def _partial_fields(message: ModelResponse, complete: bool) -> Tuple[Dict[str, Any], Optional[str], Any]:
+    """Parse the fields of a structured result that is still being streamed.
+
+    Args:
+        message: Response received so far
+        complete: Whether the response is complete
+
+    Returns:
+        Tuple of the fields whose values are complete, the name of the field
+        still being generated (None once the response is complete) and its
+        value so far
+    """
+    for part in message.parts:
+        if isinstance(part, ToolCallPart):
+            args = part.args
+            if isinstance(args, str):
+                try:
+                    args = from_json(args, allow_partial="trailing-strings") if args else {}
+                except ValueError:
+                    args = {}
+            if not isinstance(args, dict) or not args:
+                return {}, None, None
+            if complete:
+                return dict(args), None, None
+            # Keys are generated in order, so every key but the last one is final
+            *done, current = args.keys()
+            return {key: args[key] for key in done}, current, args[current]
+    return {}, None, None
+
+
+def _preview(text: str) -> str:
+    """Shorten streamed text to its tail for the progress display."""
+    text = " ".join(text.split())
+    return text if len(text) <= STREAM_PREVIEW_CHARS else "…" + text[-STREAM_PREVIEW_CHARS + 1:]
+
+
+async def _stream_agent(
+    agent: Agent,
+    prompt: str,
+    ticker: Optional[str],
+    analyst: Optional[str],
+    model_settings: Optional[Dict[str, Any]],
+    result_type: type,
+    on_partial: Optional[Callable[[Dict[str, Any]], None]],
+    started: float
+) -> Tuple[Any, Usage, Optional[float]]:
+    """Run an agent with a streamed response, reporting partial results as they arrive.
+
+    Args:
+        agent: Agent to run
+        prompt: User prompt
+        ticker: Ticker the call is for
+        analyst: Analyst making the call
+        model_settings: Generation settings passed to the model
+        result_type: Type of the result (str for free text, or a pydantic model)
+        on_partial: Called with the complete fields of a structured result
+            each time more of it has arrived
+        started: perf_counter() value the request was sent at
+
+    Returns:
+        Tuple of the result data, the usage and the time to first token in seconds
+    """
+    ttft = None
+    async with agent.run_stream(
+        prompt,
+        result_type=None if result_type is str else result_type,
+        model_settings=model_settings,
+        usage_limits=UsageLimits(request_limit=1 + STRUCTURED_OUTPUT_RETRIES)
+    ) as stream:
+        if result_type is str:
+            data = ""
+            async for data in stream.stream_text(debounce_by=STREAM_DEBOUNCE):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                    events.emit("llm_first_token", ticker=ticker, analyst=analyst, ttft=ttft)
+                events.emit("llm_partial", ticker=ticker, analyst=analyst, field=None, text=_preview(data))
+            return data, stream.usage(), ttft
+
+        message = None
+        async for message, last in stream.stream_structured(debounce_by=STREAM_DEBOUNCE):
+            fields, current, value = _partial_fields(message, complete=last)
+            if ttft is None and (fields or current):
+                ttft = time.perf_counter() - started
+                events.emit("llm_first_token", ticker=ticker, analyst=analyst, ttft=ttft)
+            if on_partial is not None and fields:
+                on_partial(fields)
+            if isinstance(value, str):
+                events.emit("llm_partial", ticker=ticker, analyst=analyst, field=current, text=_preview(value))
+        data = await stream.validate_structured_result(message)
+        return data, stream.usage(), ttft
+
+
+def _model_name(agent: Agent) -> str:
+    """Return the name of the model an agent runs on."""
+    return getattr(agent.model, "model_name", str(agent.model))
+
+
+async def _run_agent(
+    agent: Agent,
+    prompt: str,
+    ticker: Optional[str] = None,
+    analyst: Optional[str] = None,
+    model_settings: Optional[Dict[str, Any]] = None,
+    result_type: type = str,
+    on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Any:
+    """Run an agent under the global LLM concurrency cap, emitting LLM events.
+
+    Structured results are requested as a tool call and validated against
+    `result_type`; an invalid result is sent back to the model for repair at
+    most STRUCTURED_OUTPUT_RETRIES times. Completions are served from the LLM
+    cache when the same model, prompt and settings were seen before. When
+    streaming is enabled, partial results are reported as they arrive and an
+    invalid streamed result is requested again without streaming. When
+    hedging is enabled, a request without streaming that is slower than usual
+    is duplicated, possibly to a fallback model, when a slot of the LLM
+    concurrency cap is free, and the first result wins.
+
+    Args:
+        agent: Agent to run
+        prompt: User prompt
+        ticker: Ticker the call is for
+        analyst: Analyst making the call
+        model_settings: Generation settings passed to the model
+        result_type: Type of the result (str for free text, or a pydantic model)
+        on_partial: Called with the complete fields of a structured result
+            as they are streamed
+
+    Returns:
+        The result data
+    """
+    model_name = _model_name(agent)
+    settings = dict(model_settings or {})
+    if result_type is not str:
+        settings["result_type"] = result_type.__name__
+    cached = llm_cache.get(model_name, prompt, settings, result_type)
+    if cached is not None:
+        events.emit("llm_cache_hit", ticker=ticker, analyst=analyst, model=model_name)
+        return cached
+
+    queued = time.perf_counter()
+    slots = llm_semaphore
+    async with slots:
+        events.emit("llm_request", ticker=ticker, analyst=analyst, model=model_name)
+        started = time.perf_counter()
+        ttft = None
+        completed_model, hedge_model = model_name, None
+        hedged = HedgedCall(None)
+        try:
+            data = None
+            if llm_streaming:
+                try:
+                    data, usage, ttft = await _stream_agent(
+                        agent, prompt, ticker, analyst, model_settings, result_type, on_partial, started
+                    )
+                except (ValidationError, UnexpectedModelBehavior):
+                    # Streamed results are not repaired; ask again without streaming
+                    data = None
+            if data is None:
+                async def request(request_agent: Agent) -> Tuple[str, Any]:
+                    result = await request_agent.run(
+                        prompt,
+                        result_type=None if result_type is str else result_type,
+                        model_settings=model_settings,
+                        usage_limits=UsageLimits(request_limit=1 + STRUCTURED_OUTPUT_RETRIES)
+                    )
+                    return _model_name(request_agent), result
+
+                hedge_agent = agent
+                if llm_hedging.enabled and llm_hedging.fallback_model:
+                    hedge_agent = model_registry.agent(llm_hedging.fallback_model)
+                hedge_model = _model_name(hedge_agent)
+                # The duplicate takes a slot of its own, so hedging never exceeds the cap
+                (completed_model, result), hedged = await llm_hedging.run(
+                    model_name, lambda: request(agent), lambda: request(hedge_agent), slots=slots
+                )
+                data, usage = result.data, result.usage()
+        except Exception as e:
+            events.emit("llm_failed", ticker=ticker, analyst=analyst, model=model_name,
+                        duration=time.perf_counter() - started, queued=started - queued, error=str(e))
+            raise
+        duration = time.perf_counter() - started
+        cost = estimate_cost(completed_model, usage.request_tokens, usage.response_tokens)
+        # The cancelled request of a hedged call is charged the same prompt, and the
+        # winner's output pro-rated by how long it was in flight compared to the winner
+        extra_cost = 0.0
+        if hedged.hedged:
+            cancelled_model = hedge_model if hedged.winner == "primary" else model_name
+            cancelled_output = round((usage.response_tokens or 0) * hedged.cancelled_share)
+            extra_cost = estimate_cost(cancelled_model, usage.request_tokens, cancelled_output) or 0.0
+        llm_hedging.observe(model_name, duration, cost, extra_cost, winner=hedged.winner)
+        events.emit("llm_completed", ticker=ticker, analyst=analyst, model=completed_model,
+                    duration=duration, queued=started - queued, ttft=ttft,
+                    input_tokens=usage.request_tokens, output_tokens=usage.response_tokens,
+                    requests=usage.requests, cost=cost,
+                    hedge=hedged.winner, hedge_delay=hedged.delay if hedged.hedged else None,
+                    hedge_skipped=hedged.skipped, extra_cost=extra_cost)
+
+    # Stored under the requested model, which is what later lookups ask for
+    llm_cache.put(model_name, prompt, data, settings)
+    return data
+
+
+async def _run_cascade(
+    agents: AgentCascade,
+    prompt: str,
+    ticker: Optional[str] = None,
+    analyst: Optional[str] = None,
+    model_settings: Optional[Dict[str, Any]] = None,
+    result_type: type = str,
+    on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Any:
+    """Run a prompt on a cascade of agents, escalating while the result is unusable.
+
+    The next, stronger agent is tried when a result is still invalid after its
+    repair attempts, or when a structured result's confidence is below the
+    routing table's `min_confidence`. Partial results of an agent that may
+    still be escalated from are only reported once their confidence is known
+    to be high enough.
+
+    Args:
+        agents: Agent, or agents from cheapest to strongest
+        prompt: User prompt
+        ticker: Ticker the call is for
+        analyst: Analyst making the call
+        model_settings: Generation settings passed to the model
+        result_type: Type of the result (str for free text, or a pydantic model)
+        on_partial: Called with the complete fields of a structured result
+            as they are streamed
+
+    Returns:
+        The result data of the first agent whose result is accepted
+    """
+    agents = [agents] if isinstance(agents, Agent) else list(agents)
+    for index, agent in enumerate(agents):
+        last = index == len(agents) - 1
+        report_partial = on_partial
+        if on_partial is not None and not last:
+            def report_partial(fields: Dict[str, Any], on_partial=on_partial) -> None:
+                confidence = fields.get("confidence")
+                if isinstance(confidence, (int, float)) and confidence >= model_routing.min_confidence:
+                    on_partial(fields)
+
+        try:
+            data = await _run_agent(agent, prompt, ticker, analyst, model_settings, result_type, report_partial)
+        except (UnexpectedModelBehavior, UsageLimitExceeded, ValidationError):
+            if last:
+                raise
+            reason = "invalid result"
+        else:
+            confidence = getattr(data, "confidence", None)
+            if last or confidence is None or confidence >= model_routing.min_confidence:
+                return data
+            reason = f"confidence {confidence}/10"
+
+        events.emit("llm_escalated", ticker=ticker, analyst=analyst, model=_model_name(agent),
+                    to_model=_model_name(agents[index + 1]), reason=reason)
+
+
+def _normalize_recommendation(value: Any) -> Any:
+    """Map recommendation wording such as 'BUY' or 'Strong Sell' onto Buy/Hold/Sell."""
+    if not isinstance(value, str):
+        return value
+    text = value.strip().lower()
+    if text.startswith("strong "):
+        text = text[len("strong "):]
+    for option in ("Buy", "Hold", "Sell"):
+        if text == option.lower():
+            return option
+    raise ValueError(f"Recommendation must be Buy, Hold or Sell, not {value!r}")
+
+
+# Buy/Hold/Sell, accepting any casing from the model
+Recommendation = Annotated[str, BeforeValidator(_normalize_recommendation)]
+
+
+# Define our model schemas. Models generate fields in schema order, so the analyst
+# models lead with rating, recommendation, confidence and reasoning and end with
+# detailed_reasoning: a streamed result carries what the decision and the model
+# cascade need before the verbose parts.
 class FinancialMetrics(BaseModel):
     """Key financial metrics for a company."""
 
@@ -34,14 +431,15 @@ class FundamentalAnalysis(BaseModel):
     """Fundamental analysis of a company."""
 
     ticker: str = Field(..., description="Stock ticker symbol")
+    rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
+    recommendation: Recommendation = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
+    confidence: int = Field(..., ge=1, le=10, description="Confidence in the recommendation from 1-10")
+    reasoning: str = Field(..., description="Reasoning behind recommendation")
     company_name: str = Field(..., description="Full company name")
     sector: str = Field(..., description="Industry sector")
     metrics: FinancialMetrics = Field(..., description="Key financial metrics")
     strengths: List[str] = Field(..., description="Fundamental strengths")
     weaknesses: List[str] = Field(..., description="Fundamental weaknesses")
-    rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
-    recommendation: str = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
-    reasoning: str = Field(..., description="Reasoning behind recommendation")
     detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
 
 
@@ -52,38 +450,49 @@ class TechnicalIndicators(BaseModel):
     moving_average_200d: Optional[float] = Field(None, description="200-day moving average")
     rsi_14: Optional[float] = Field(None, description="14-day Relative Strength Index")
     macd: Optional[float] = Field(None, description="Moving Average Convergence Divergence")
+    ema_12d: Optional[float] = Field(None, description="12-day exponential moving average")
+    ema_26d: Optional[float] = Field(None, description="26-day exponential moving average")
+    macd_signal: Optional[float] = Field(None, description="MACD signal line")
+    macd_histogram: Optional[float] = Field(None, description="MACD histogram")
     bollinger_upper: Optional[float] = Field(None, description="Upper Bollinger Band")
+    bollinger_middle: Optional[float] = Field(None, description="Middle Bollinger Band")
     bollinger_lower: Optional[float] = Field(None, description="Lower Bollinger Band")
+    atr_14: Optional[float] = Field(None, description="14-day Average True Range")
     volume_avg_30d: Optional[float] = Field(None, description="30-day average volume")
+    support: Optional[float] = Field(None, description="Nearest support level below the price")
+    resistance: Optional[float] = Field(None, description="Nearest resistance level above the price")
 
 
 class TechnicalAnalysis(BaseModel):
     """Technical analysis of a stock."""
 
     ticker: str = Field(..., description="Stock ticker symbol")
+    rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
+    recommendation: Recommendation = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
+    confidence: int = Field(..., ge=1, le=10, description="Confidence in the recommendation from 1-10")
+    reasoning: str = Field(..., description="Reasoning behind recommendation")
+    current_price: Optional[float] = Field(None, description="Latest closing price")
     indicators: TechnicalIndicators = Field(..., description="Key technical indicators")
     patterns: List[str] = Field(..., description="Chart patterns identified")
     signals: List[str] = Field(..., description="Trading signals")
-    rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
-    recommendation: str = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
-    reasoning: str = Field(..., description="Reasoning behind recommendation")
-    detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
     chart_url: Optional[str] = Field(None, description="URL of the chart image")
     trend: str = Field(..., description="Trend identified (Bullish/Bearish/Neutral)")
+    detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
 
 
 class SentimentAnalysis(BaseModel):
     """Sentiment analysis based on news and social media."""
 
     ticker: str = Field(..., description="Stock ticker symbol")
+    rating: int = Field(..., ge=1, le=10, description="Overall sentiment rating from 1-10")
+    recommendation: Recommendation = Field(..., description="Sentiment-based recommendation (Buy/Hold/Sell)")
+    confidence: int = Field(..., ge=1, le=10, description="Confidence in the recommendation from 1-10")
+    reasoning: str = Field(..., description="Reasoning behind recommendation")
     company_name: str = Field(..., description="Full company name")
     overall_sentiment: str = Field(..., description="Overall market sentiment (Positive/Neutral/Negative)")
     news_sentiment: str = Field(..., description="Sentiment from news articles")
     social_sentiment: str = Field(..., description="Sentiment from social media")
     key_topics: List[str] = Field(..., description="Key topics being discussed")
-    rating: int = Field(..., ge=1, le=10, description="Overall sentiment rating from 1-10")
-    recommendation: str = Field(..., description="Sentiment-based recommendation (Buy/Hold/Sell)")
-    reasoning: str = Field(..., description="Reasoning behind recommendation")
     detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
 
 
@@ -91,15 +500,38 @@ class InvestorAnalysis(BaseModel):
     """Analysis based on famous investor's principles."""
 
     ticker: str = Field(..., description="Stock ticker symbol")
+    rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
+    recommendation: Recommendation = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
+    confidence: int = Field(..., ge=1, le=10, description="Confidence in the recommendation from 1-10")
+    reasoning: str = Field(..., description="Reasoning behind recommendation")
     company_name: str = Field(..., description="Full company name")
     investor_name: str = Field(..., description="Name of the investor (e.g., Warren Buffett)")
     strengths: List[str] = Field(..., description="Key strengths from investor's perspective")
     concerns: List[str] = Field(..., description="Key concerns from investor's perspective")
     would_invest: bool = Field(..., description="Whether the investor would likely invest")
+    detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
+
+
+class AnalystHeadline(BaseModel):
+    """The part of an analysis the investment decision is made from."""
+
     rating: int = Field(..., ge=1, le=10, description="Overall rating from 1-10")
-    recommendation: str = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
+    recommendation: Recommendation = Field(..., description="Investment recommendation (Buy/Hold/Sell)")
     reasoning: str = Field(..., description="Reasoning behind recommendation")
-    detailed_reasoning: Optional[str] = Field(None, description="Detailed reasoning and analysis")
+    investor_name: Optional[str] = Field(None, description="Name of the investor, for investor analyses")
+    current_price: Optional[float] = Field(None, description="Latest closing price, for technical analyses")
+
+    @classmethod
+    def from_analysis(cls, analysis: BaseModel) -> "AnalystHeadline":
+        """Take the headline of a complete analysis.
+
+        Args:
+            analysis: Any analyst result
+
+        Returns:
+            The analysis' headline
+        """
+        return cls(**{name: getattr(analysis, name, None) for name in cls.model_fields})
 
 
 class InvestmentDecision(BaseModel):
@@ -128,236 +560,230 @@ class CompanyAnalysisOutput(BaseModel):
     technical_analysis: Optional[TechnicalAnalysis] = Field(None, description="Technical analysis results")
     sentiment_analysis: Optional[SentimentAnalysis] = Field(None, description="Sentiment analysis results")
     investor_analyses: List[InvestorAnalysis] = Field(default_factory=list, description="Analyses from different investor perspectives")
+    other_analyses: Dict[str, Any] = Field(default_factory=dict, description="Analyses of registered analysts beyond the built-in ones, by key")
     investment_decision: InvestmentDecision = Field(..., description="Final investment decision")
 
 
-async def analyze_fundamentals(agent: Agent, ticker: str, financial_data: Dict[str, Any], show_reasoning: bool = False) -> FundamentalAnalysis:
-    """Run fundamental analysis on a company.
+# Fields of a streamed analysis the investment decision waits for
+HEADLINE_FIELDS = ("rating", "recommendation", "reasoning")
+
+
+def _headline_watcher(
+    on_headline: Optional[Callable[[AnalystHeadline], None]],
+    **known: Any
+) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """Build an `on_partial` callback that publishes an analysis' headline as soon as it has streamed.
 
     Args:
-        agent: Agent to use for the analysis
-        ticker: Stock ticker symbol
-        financial_data: Financial data for the company
-        show_reasoning: Whether to include detailed reasoning in the output
+        on_headline: Called once with the headline (no callback is built if None)
+        **known: Headline values known locally (investor name, current price)
 
     Returns:
-        FundamentalAnalysis: Results of the fundamental analysis
+        Callback for `_run_agent`, or None
     """
-    # Status updates with more variety
-    status_messages = [
-        "Analyzing balance sheet",
-        "Checking income statement",
-        "Calculating financial ratios",
-        "Evaluating earnings growth",
-        "Assessing debt levels",
-        "Analyzing cash flow",
-        "Calculating ROE and ROA",
-        "Evaluating profitability",
-        "Finalizing fundamental score"
-    ]
+    if on_headline is None:
+        return None
+    published = False
 
-    # Show initial status
-    progress.update_status("Fundamental Analyst", ticker, status_messages[0])
+    def watch(fields: Dict[str, Any]) -> None:
+        nonlocal published
+        if published or not all(name in fields for name in HEADLINE_FIELDS):
+            return
+        try:
+            headline = AnalystHeadline(**{name: fields[name] for name in HEADLINE_FIELDS}, **known)
+        except ValidationError:
+            # Left to the complete, repaired result
+            return
+        published = True
+        on_headline(headline)
 
-    # Generate the analysis
-    prompt = f"""
-        You are a skilled fundamental analyst examining {ticker}.
-        Analyze the following financial data and provide an investment recommendation:
+    return watch
 
-        Financial Data:
-        {financial_data}
 
-        Be thorough in your analysis and provide a clear BUY, HOLD, or SELL recommendation.
+def _reasoning_instruction(show_reasoning: bool) -> str:
+    """Tell the model whether to spend tokens on `detailed_reasoning`.
+
+    Args:
+        show_reasoning: Whether detailed reasoning is shown to the user
+
+    Returns:
+        Instruction appended to analyst prompts
     """
+    if show_reasoning:
+        return "Put your full step-by-step analysis in detailed_reasoning."
+    return "Leave detailed_reasoning empty."
+
+
+async def analyze_fundamentals(
+    agent: AgentCascade,
+    ticker: str,
+    financial_data: Dict[str, Any],
+    show_reasoning: bool = False,
+    on_headline: Optional[Callable[[AnalystHeadline], None]] = None
+) -> FundamentalAnalysis:
+    """Run fundamental analysis on a company.
 
-    # Show a few status updates to simulate work
-    for i in range(1, min(4, len(status_messages))):
-        await asyncio.sleep(0.3)  # Short delay
-        progress.update_status("Fundamental Analyst", ticker, status_messages[i])
+    Args:
+        agent: Agent to use for the analysis, or a cascade of agents
+        ticker: Stock ticker symbol
+        financial_data: Financial data for the company
+        show_reasoning: Whether to include detailed reasoning in the output
+        on_headline: Called with the rating, recommendation and reasoning as
+            soon as they have streamed, before the rest of the analysis
 
-    # Call the agent with just the prompt
-    result = await agent.run(prompt)
+    Returns:
+        FundamentalAnalysis: Results of the fundamental analysis
+    """
+    events.emit("analysis_started", ticker=ticker, analyst="Fundamental Analyst")
 
     # Extract financial metrics from the financial_data
-    pe_ratio = financial_data.get("pe_ratio")
-    pb_ratio = financial_data.get("pb_ratio")
-    roe = financial_data.get("return_on_equity")
-    debt_to_equity = financial_data.get("debt_to_equity")
-    revenue_growth = financial_data.get("revenue_growth")
-    profit_margin = financial_data.get("profit_margin")
-    fcf = financial_data.get("free_cash_flow")
-
-    # Parse recommendation from result (simplified example)
-    recommendation = "Hold"  # Default
-    if "buy" in result.data.lower():
-        recommendation = "Buy"
-    elif "sell" in result.data.lower():
-        recommendation = "Sell"
-
-    # Rating (1-10) extraction (simplified)
-    rating = 5  # Default neutral rating
+    metrics = FinancialMetrics(
+        pe_ratio=financial_data.get("pe_ratio"),
+        pb_ratio=financial_data.get("pb_ratio"),
+        roe=financial_data.get("return_on_equity"),
+        debt_to_equity=financial_data.get("debt_to_equity"),
+        revenue_growth=financial_data.get("revenue_growth"),
+        profit_margin=financial_data.get("profit_margin"),
+        free_cash_flow=financial_data.get("free_cash_flow")
+    )
 
     # Extract company information
     company_info = await fetch_company_data(ticker)
     company_name = company_info.get("company_name", f"{ticker} Inc.")
     sector = company_info.get("sector", "Technology")
 
-    # Create a FundamentalAnalysis object with extracted data
-    analysis = FundamentalAnalysis(
-        ticker=ticker,
-        company_name=company_name,
-        sector=sector,
-        metrics=FinancialMetrics(
-            pe_ratio=pe_ratio,
-            pb_ratio=pb_ratio,
-            roe=roe,
-            debt_to_equity=debt_to_equity,
-            revenue_growth=revenue_growth,
-            profit_margin=profit_margin,
-            free_cash_flow=fcf
-        ),
-        strengths=["Strong market position", "Solid financial performance"],
-        weaknesses=["Competitive pressures", "Regulatory challenges"],
-        rating=rating,
-        recommendation=recommendation,
-        reasoning="Based on fundamental analysis of financial metrics.",
-        detailed_reasoning=result.data if show_reasoning else None
+    # Generate the analysis
+    prompt = f"""
+        You are a skilled fundamental analyst examining {ticker} ({company_name}, {sector}).
+        Analyze the following financial data and provide an investment recommendation:
+
+        Financial Data:
+        {serialize_financials(financial_data)}
+
+        Identify the company's fundamental strengths and weaknesses, rate it from 1 to 10,
+        and give a Buy, Hold or Sell recommendation with your confidence in it from 1 to 10 and a short reasoning.
+        Fill metrics from the financial data where available. {_reasoning_instruction(show_reasoning)}
+    """
+
+    data = await _run_cascade(
+        agent, prompt, ticker=ticker, analyst="Fundamental Analyst", result_type=FundamentalAnalysis,
+        on_partial=_headline_watcher(on_headline)
     )
 
-    # Update status to done
-    progress.update_status("Fundamental Analyst", ticker, "Done")
+    # Values known locally always win over what the model echoes back
+    analysis = data.model_copy(update={
+        "ticker": ticker,
+        "company_name": company_name,
+        "sector": sector,
+        "metrics": data.metrics.model_copy(update=metrics.model_dump(exclude_none=True)),
+        "detailed_reasoning": data.detailed_reasoning if show_reasoning else None,
+    })
+
+    events.emit("analysis_finished", ticker=ticker, analyst="Fundamental Analyst")
 
     return analysis
 
 
-async def analyze_technicals(agent: Agent, ticker: str, price_history: Dict[str, Any], show_reasoning: bool = False) -> TechnicalAnalysis:
+async def analyze_technicals(
+    agent: AgentCascade,
+    ticker: str,
+    price_history: Union[PriceSeries, Dict[str, Any]],
+    show_reasoning: bool = False,
+    on_headline: Optional[Callable[[AnalystHeadline], None]] = None
+) -> TechnicalAnalysis:
     """Run technical analysis on a stock.
 
+    Indicators are computed locally from the price history; the LLM only
+    interprets them.
+
     Args:
-        agent: Agent to use for the analysis
+        agent: Agent to use for the analysis, or a cascade of agents
         ticker: Stock ticker symbol
-        price_history: Historical price data
+        price_history: Historical prices as a PriceSeries or an API payload
         show_reasoning: Whether to include detailed reasoning in the output
+        on_headline: Called with the rating, recommendation and reasoning as
+            soon as they have streamed, before the rest of the analysis
 
     Returns:
         TechnicalAnalysis: Results of the technical analysis
     """
-    # Status updates for technical analysis
-    status_messages = [
-        "Analyzing price trends",
-        "Calculating moving averages",
-        "Evaluating RSI levels",
-        "Checking MACD signals",
-        "Analyzing Bollinger Bands",
-        "Calculating support levels",
-        "Evaluating resistance levels",
-        "Checking volume patterns",
-        "Finalizing technical score"
-    ]
-
-    # Show initial status
-    progress.update_status("Technical Analyst", ticker, status_messages[0])
+    events.emit("analysis_started", ticker=ticker, analyst="Technical Analyst")
+
+    series = price_history if isinstance(price_history, PriceSeries) else PriceSeries.from_payload(ticker, price_history)
+    values = compute_indicators({ticker: series})[ticker]
+    if isinstance(price_history, dict):
+        # Keep indicators the payload provides where there is no history to compute them from
+        for name in ["current_price", *TechnicalIndicators.model_fields]:
+            if values.get(name) is None and price_history.get(name) is not None:
+                values[name] = price_history[name]
+    trend, signals = indicator_signals(values)
+
+    patterns = []
+    if values.get("support") is not None:
+        patterns.append(f"Support at {values['support']:.2f}")
+    if values.get("resistance") is not None:
+        patterns.append(f"Resistance at {values['resistance']:.2f}")
 
     # Generate the prompt for analysis
     prompt = f"""
         You are a skilled technical analyst examining {ticker}.
-        Analyze the following price history data and provide an investment recommendation:
+        Analyze the following technical indicators and price history summary and provide an investment recommendation:
 
-        Price History Data:
-        {price_history}
+        Technical Indicators:
+        {render(compact(values) or {})}
 
-        Be thorough in your technical analysis and provide a clear BUY, HOLD, or SELL recommendation.
+        Price History Summary:
+        {serialize_prices(ticker, price_history)}
+
+        Computed trend: {trend}. Computed signals: {"; ".join(signals) or "none"}.
+
+        Identify chart patterns and trading signals, confirm or revise the trend (Bullish/Bearish/Neutral),
+        rate the stock from 1 to 10 and give a Buy, Hold or Sell recommendation with your confidence in it from 1 to 10 and a short reasoning.
+        The indicators are filled in from the data above; do not recompute them. {_reasoning_instruction(show_reasoning)}
     """
 
-    # Show a few status updates to simulate work
-    for i in range(1, min(4, len(status_messages))):
-        await asyncio.sleep(0.3)  # Short delay
-        progress.update_status("Technical Analyst", ticker, status_messages[i])
-
-    # Call the agent with just the prompt
-    result = await agent.run(prompt)
-
-    # Extract technical indicators from price history
-    ma_50d = price_history.get("moving_average_50d") or price_history.get("ma_50d")
-    ma_200d = price_history.get("moving_average_200d") or price_history.get("ma_200d")
-    rsi_14 = price_history.get("rsi_14")
-    macd = price_history.get("macd")
-    bollinger_upper = price_history.get("bollinger_upper")
-    bollinger_lower = price_history.get("bollinger_lower")
-    volume_avg = price_history.get("volume_avg_30d") or price_history.get("volume_avg")
-
-    # Parse signals from the result (simplified example)
-    trend = "Neutral"
-    if "uptrend" in result.data.lower() or "bullish" in result.data.lower():
-        trend = "Bullish"
-    elif "downtrend" in result.data.lower() or "bearish" in result.data.lower():
-        trend = "Bearish"
-
-    # Parse recommendation from result (simplified)
-    recommendation = "Hold"  # Default
-    if "buy" in result.data.lower():
-        recommendation = "Buy"
-    elif "sell" in result.data.lower():
-        recommendation = "Sell"
-
-    # Rating (1-10) extraction (simplified)
-    rating = 5  # Default neutral rating
-
-    # Create a TechnicalAnalysis object with extracted data
-    analysis = TechnicalAnalysis(
-        ticker=ticker,
-        indicators=TechnicalIndicators(
-            moving_average_50d=ma_50d,
-            moving_average_200d=ma_200d,
-            rsi_14=rsi_14,
-            macd=macd,
-            bollinger_upper=bollinger_upper,
-            bollinger_lower=bollinger_lower,
-            volume_avg_30d=volume_avg
-        ),
-        patterns=["Support at recent lows", "Resistance at recent highs"],
-        chart_url=chart_image_url,
-        trend=trend,
-        signals=["Moving average crossover", "RSI oversold"],
-        rating=rating,
-        recommendation=recommendation,
-        reasoning="Based on technical indicators and chart patterns.",
-        detailed_reasoning=result.data if show_reasoning else None
+    data = await _run_cascade(
+        agent, prompt, ticker=ticker, analyst="Technical Analyst", result_type=TechnicalAnalysis,
+        on_partial=_headline_watcher(on_headline, current_price=values.get("current_price"))
     )
 
-    # Update status to done
-    progress.update_status("Technical Analyst", ticker, "Done")
+    # Indicators and price come from the local engine, not from the model
+    analysis = data.model_copy(update={
+        "ticker": ticker,
+        "current_price": values.get("current_price"),
+        "indicators": TechnicalIndicators(**{name: values.get(name) for name in TechnicalIndicators.model_fields}),
+        "patterns": data.patterns or patterns,
+        "signals": data.signals or signals,
+        "chart_url": None,
+        "detailed_reasoning": data.detailed_reasoning if show_reasoning else None,
+    })
+
+    events.emit("analysis_finished", ticker=ticker, analyst="Technical Analyst")
 
     return analysis
 
 
-async def analyze_sentiment(agent: Agent, ticker: str, news_data: List[Dict[str, Any]], show_reasoning: bool = False) -> SentimentAnalysis:
+async def analyze_sentiment(
+    agent: AgentCascade,
+    ticker: str,
+    news_data: List[Dict[str, Any]],
+    show_reasoning: bool = False,
+    on_headline: Optional[Callable[[AnalystHeadline], None]] = None
+) -> SentimentAnalysis:
     """Run sentiment analysis on a company.
 
     Args:
-        agent: Agent to use for the analysis
+        agent: Agent to use for the analysis, or a cascade of agents
         ticker: Stock ticker symbol
         news_data: News and social media data
         show_reasoning: Whether to include detailed reasoning in the output
+        on_headline: Called with the rating, recommendation and reasoning as
+            soon as they have streamed, before the rest of the analysis
 
     Returns:
         SentimentAnalysis: Results of the sentiment analysis
     """
-    # Status updates with more variety
-    status_messages = [
-        "Fetching insider trades",
-        "Scanning Twitter sentiment",
-        "Analyzing news headlines",
-        "Monitoring Reddit threads",
-        "Checking StockTwits activity",
-        "Tracking analyst revisions",
-        "Measuring public sentiment",
-        "Analyzing conference calls",
-        "Evaluating news events"
-    ]
-
-    # Show initial status
-    progress.update_status("Sentiment Analyst", ticker, status_messages[0])
+    events.emit("analysis_started", ticker=ticker, analyst="Sentiment Analyst")
 
     # Generate the analysis
     prompt = f"""
@@ -365,76 +791,53 @@ async def analyze_sentiment(agent: Agent, ticker: str, news_data: List[Dict[str,
         Analyze the following news and social media data and provide an investment recommendation:
 
         News and Social Media Data:
-        {news_data}
+        {serialize_news(news_data)}
 
-        Identify key topics, sentiment trends, and overall market perception.
-        Be thorough in your analysis and provide a clear BUY, HOLD, or SELL recommendation.
+        Identify key topics and the overall, news and social media sentiment (Positive/Neutral/Negative),
+        rate the sentiment from 1 to 10 and give a Buy, Hold or Sell recommendation with your confidence in it from 1 to 10 and a short reasoning.
+        {_reasoning_instruction(show_reasoning)}
     """
 
-    # Show a few status updates to simulate work
-    for i in range(1, min(4, len(status_messages))):
-        await asyncio.sleep(0.3)  # Short delay
-        progress.update_status("Sentiment Analyst", ticker, status_messages[i])
-
-    # Call the agent with just the prompt
-    result = await agent.run(prompt)
-
-    # Create a SentimentAnalysis object with default values
-    analysis = SentimentAnalysis(
-        ticker=ticker,
-        company_name=f"{ticker} Inc.",
-        overall_sentiment="Positive",
-        news_sentiment="Positive",
-        social_sentiment="Neutral",
-        key_topics=["Earnings report", "Product launch", "Industry trends"],
-        rating=7,
-        recommendation="Buy",
-        reasoning="Positive sentiment in news and social media indicates market optimism.",
-        detailed_reasoning=result.data if show_reasoning else None
+    data = await _run_cascade(
+        agent, prompt, ticker=ticker, analyst="Sentiment Analyst", result_type=SentimentAnalysis,
+        on_partial=_headline_watcher(on_headline)
     )
 
-    # Update status to done
-    progress.update_status("Sentiment Analyst", ticker, "Done")
+    analysis = data.model_copy(update={
+        "ticker": ticker,
+        "detailed_reasoning": data.detailed_reasoning if show_reasoning else None,
+    })
+
+    events.emit("analysis_finished", ticker=ticker, analyst="Sentiment Analyst")
 
     return analysis
 
 
 async def analyze_with_investor(
-    agent: Agent,
+    agent: AgentCascade,
     ticker: str,
     company_data: Dict[str, Any],
     investor_name: str,
     show_reasoning: bool = False,
-    peer_companies: List[str] = None
+    peer_companies: List[str] = None,
+    on_headline: Optional[Callable[[AnalystHeadline], None]] = None
 ) -> InvestorAnalysis:
     """Analyze a company using a famous investor's principles.
 
     Args:
-        agent: Agent to use for the analysis
+        agent: Agent to use for the analysis, or a cascade of agents
         ticker: Stock ticker symbol
         company_data: Company data
         investor_name: Name of the investor to emulate
         show_reasoning: Whether to include detailed reasoning in the output
         peer_companies: List of peer companies for comparison
+        on_headline: Called with the rating, recommendation and reasoning as
+            soon as they have streamed, before the rest of the analysis
 
     Returns:
         InvestorAnalysis: Results of the investor-focused analysis
     """
-    # Create status messages
-    verbs = ["Thinking", "Analyzing", "Evaluating", "Considering", "Examining"]
-    objects = ["business model", "competitive position", "management team", "financials", "growth prospects"]
-
-    status_messages = []
-    for verb in verbs:
-        for obj in objects:
-            status_messages.append(f"{verb} {obj}")
-
-    # Shuffle status messages
-    import random
-    random.shuffle(status_messages)
-
-    # Update status
-    progress.update_status(investor_name, ticker, status_messages[0])
+    events.emit("analysis_started", ticker=ticker, analyst=investor_name)
 
     # Generate the investor-specific analysis with peer comparison
     peer_companies_text = ""
@@ -446,45 +849,64 @@ async def analyze_with_investor(
         Given your investment philosophy and principles, examine this company:
 
         Company Data:
-        {company_data}
+        {serialize_company(company_data)}
         {peer_companies_text}
 
-        Provide your detailed analysis and a clear BUY, HOLD, or SELL recommendation.
+        List the strengths and concerns you see, say whether you would invest, rate the company from 1 to 10
+        and give a Buy, Hold or Sell recommendation with your confidence in it from 1 to 10 and a short reasoning in your own voice.
+        {_reasoning_instruction(show_reasoning)}
     """
 
-    # Show a few status updates to simulate work
-    for i in range(1, min(3, len(status_messages))):
-        await asyncio.sleep(0.5)  # Slightly longer delay
-        progress.update_status(investor_name, ticker, status_messages[i])
-
-    # Call the agent with just the prompt
-    result = await agent.run(prompt)
-
-    # Create an InvestorAnalysis object
-    analysis = InvestorAnalysis(
-        ticker=ticker,
-        investor_name=investor_name,
-        investment_principles=[
-            f"{investor_name}'s investment principle 1",
-            f"{investor_name}'s investment principle 2"
-        ],
-        strengths=["Strong market position", "Good management team"],
-        weaknesses=["High valuation", "Competitive threats"],
-        intrinsic_value=None,  # Can be calculated more precisely based on investor
-        rating=7,
-        recommendation="Buy",
-        reasoning=f"{investor_name} would likely approve of this investment.",
-        detailed_reasoning=result.data if show_reasoning else None
+    data = await _run_cascade(
+        agent, prompt, ticker=ticker, analyst=investor_name, result_type=InvestorAnalysis,
+        on_partial=_headline_watcher(on_headline, investor_name=investor_name)
     )
 
-    # Update status to done
-    progress.update_status(investor_name, ticker, "Done")
+    analysis = data.model_copy(update={
+        "ticker": ticker,
+        "investor_name": investor_name,
+        "detailed_reasoning": data.detailed_reasoning if show_reasoning else None,
+    })
+
+    events.emit("analysis_finished", ticker=ticker, analyst=investor_name)
 
     return analysis
 
 
+async def _synthesize_later(agent: AgentCascade, prompt: str, ticker: str) -> Optional[str]:
+    """Make a deferred synthesis call, swallowing its failure.
+
+    Args:
+        agent: Agent to use for the synthesis, or a cascade of agents
+        prompt: Synthesis prompt
+        ticker: Stock ticker symbol
+
+    Returns:
+        The synthesis text, or None if the call failed
+    """
+    try:
+        return await _run_cascade(agent, prompt, ticker=ticker, analyst="Portfolio Manager")
+    except Exception as e:
+        progress.log_error(f"Deferred decision reasoning failed for {ticker}: {str(e)}")
+        return None
+
+
+async def collect_deferred_reasoning(outputs: List["CompanyAnalysisOutput"]) -> None:
+    """Wait for deferred syntheses and fill them in as the decisions' detailed reasoning.
+
+    Args:
+        outputs: Analysis results whose deferred reasoning is needed
+    """
+    for output in outputs:
+        task = deferred_syntheses.pop(output.ticker, None)
+        if task is not None:
+            output.investment_decision.detailed_reasoning = await task
+            checkpoints.save(output.ticker, "decision", output.investment_decision)
+            checkpoints.save(output.ticker, "output", output)
+
+
 async def make_investment_decision(
-    agent: Agent,
+    agent: AgentCascade,
     ticker: str,
     company_name: str,
     analyses: Dict[str, Any],
@@ -492,40 +914,25 @@ async def make_investment_decision(
 ) -> InvestmentDecision:
     """Make a final investment decision based on all analyses.
 
+    The order, conviction and position size come from a vote over the
+    analysts. The LLM synthesis is only used as detailed reasoning, so it is
+    not requested without `show_reasoning`. When at least `consensus_threshold`
+    of the analysts agree, the decision policy may skip it or defer it to a
+    background task collected by `collect_deferred_reasoning`.
+
     Args:
-        agent: Agent to use for the decision
+        agent: Agent to use for the decision, or a cascade of agents
         ticker: Stock ticker symbol
         company_name: Company name
-        analyses: Dictionary of all analyses
+        analyses: Dictionary of all analyses, or of their AnalystHeadlines
         show_reasoning: Whether to include detailed reasoning in the output
 
     Returns:
         InvestmentDecision: Final investment decision
     """
-    # Status updates with more variety
-    status_messages = [
-        "Analyzing all reports",
-        "Weighing investor opinions",
-        "Calculating risk factors",
-        "Determining position size",
-        "Setting price targets",
-        "Finalizing recommendation",
-        "Making investment decision"
-    ]
-
-    # Update status for all analysts - start with first status
-    for analyst_name in analyses.keys():
-        if analyst_name.startswith("investor_"):
-            # Extract the investor name from the key
-            parts = analyst_name.replace("investor_", "").split("_")
-            investor_name = " ".join(part.capitalize() for part in parts)
-            progress.update_status(investor_name, ticker, status_messages[0])
-        elif analyst_name == "fundamental":
-            progress.update_status("Fundamental Analyst", ticker, status_messages[0])
-        elif analyst_name == "technical":
-            progress.update_status("Technical Analyst", ticker, status_messages[0])
-        elif analyst_name == "sentiment":
-            progress.update_status("Sentiment Analyst", ticker, status_messages[0])
+    # Analyst rows that show the progress of the decision
+    analyst_names = [_analyst_display_name(key) for key in analyses.keys()]
+    events.emit("decision_started", ticker=ticker, analyst="Portfolio Manager", analysts=analyst_names)
 
     # Prepare the prompt with all available analyses
     prompt_parts = [f"Make an investment decision for {ticker} ({company_name}) by synthesizing the following analyses:"]
@@ -552,6 +959,15 @@ async def make_investment_decision(
     for inv in investor_analyses:
         prompt_parts.append(f"{inv.investor_name}'s Analysis: {inv.recommendation} (Rating: {inv.rating}/10) - {inv.reasoning}")
 
+    # Add analyses of analysts registered beyond the built-in ones
+    other_analyses = [
+        (key, analysis) for key, analysis in analyses.items()
+        if key not in BUILTIN_ANALYSIS_KEYS and not key.startswith("investor_")
+    ]
+    for key, other in other_analyses:
+        label = key.replace("_", " ").title()
+        prompt_parts.append(f"{label} Analysis: {other.recommendation} (Rating: {other.rating}/10) - {other.reasoning}")
+
     # Add guidelines for making the decision
     prompt_parts.append("Based on these analyses, make a final investment decision. Consider the following:")
     prompt_parts.append("1. The consensus among the different analyses")
@@ -561,28 +977,6 @@ async def make_investment_decision(
 
     prompt = "\n\n".join(prompt_parts)
 
-    # Show status updates to simulate processing
-    for i in range(1, len(status_messages)):
-        await asyncio.sleep(0.4)  # Delay between status updates
-
-        # Update status for all analysts
-        for analyst_name in analyses.keys():
-            if analyst_name.startswith("investor_"):
-                # Extract the investor name from the key
-                parts = analyst_name.replace("investor_", "").split("_")
-                investor_name = " ".join(part.capitalize() for part in parts)
-                progress.update_status(investor_name, ticker, status_messages[i])
-            elif analyst_name == "fundamental":
-                progress.update_status("Fundamental Analyst", ticker, status_messages[i])
-            elif analyst_name == "technical":
-                progress.update_status("Technical Analyst", ticker, status_messages[i])
-            elif analyst_name == "sentiment":
-                progress.update_status("Sentiment Analyst", ticker, status_messages[i])
-
-    # Generate the investment decision
-    result = await agent.run(prompt)
-
-    # Create an InvestmentDecision object with default values and reasoning from the LLM
     # Determine order type based on overall sentiment in the analyses
     recommendations = []
     if "fundamental" in analyses:
@@ -593,6 +987,8 @@ async def make_investment_decision(
         recommendations.append(analyses["sentiment"].recommendation.upper())
     for inv in investor_analyses:
         recommendations.append(inv.recommendation.upper())
+    for _, other in other_analyses:
+        recommendations.append(other.recommendation.upper())
 
     # Count recommendations
     buy_count = recommendations.count("BUY")
@@ -617,15 +1013,39 @@ async def make_investment_decision(
         ratings.append(analyses["sentiment"].rating)
     for inv in investor_analyses:
         ratings.append(inv.rating)
+    for _, other in other_analyses:
+        ratings.append(other.rating)
 
     # Average rating determines conviction
     avg_rating = sum(ratings) / len(ratings) if ratings else 5
     conviction = min(10, max(1, round(avg_rating)))
 
+    # The LLM synthesis only ever becomes the detailed reasoning; the decision is the vote
+    majority = max(("BUY", buy_count), ("SELL", sell_count), ("HOLD", hold_count), key=lambda vote: vote[1])
+    consensus = majority[1] / len(recommendations) if recommendations else 0.0
+    if not show_reasoning:
+        action = "skipped"
+    elif decision_policy != "always" and consensus >= consensus_threshold:
+        action = "deferred" if decision_policy == "defer" else "skipped"
+    else:
+        action = "called"
+    events.emit("decision_synthesis", ticker=ticker, analyst="Portfolio Manager", action=action, consensus=consensus)
+
+    detailed_reasoning = None
+    if action == "called":
+        detailed_reasoning = await _run_cascade(agent, prompt, ticker=ticker, analyst="Portfolio Manager")
+    elif action == "deferred":
+        deferred_syntheses[ticker] = asyncio.create_task(_synthesize_later(agent, prompt, ticker))
+    elif show_reasoning:
+        detailed_reasoning = (
+            f"{majority[1]} of {len(recommendations)} analysts recommend {majority[0]} "
+            f"(average rating {avg_rating:.1f}/10); the synthesis was skipped on consensus."
+        )
+
     # Current price (from technical analysis if available)
     current_price = 0
     if "technical" in analyses:
-        current_price = analyses["technical"].current_price
+        current_price = analyses["technical"].current_price or 0
 
     # Create decision object
     decision = InvestmentDecision(
@@ -640,125 +1060,269 @@ async def make_investment_decision(
         key_factors=["Analyst consensus", "Technical indicators", "Fundamental strength"],
         risks=["Market volatility", "Sector risks", "Company-specific factors"],
         reasoning=f"Based on the analysis from multiple perspectives, the consensus recommendation is to {order_type} with a conviction level of {conviction}/10.",
-        detailed_reasoning=result.data if show_reasoning else None
+        detailed_reasoning=detailed_reasoning
     )
 
-    # Update status to done for all analysts
-    for analyst_name in analyses.keys():
-        if analyst_name.startswith("investor_"):
-            # Extract the investor name from the key
-            parts = analyst_name.replace("investor_", "").split("_")
-            investor_name = " ".join(part.capitalize() for part in parts)
-            progress.update_status(investor_name, ticker, "Done")
-        elif analyst_name == "fundamental":
-            progress.update_status("Fundamental Analyst", ticker, "Done")
-        elif analyst_name == "technical":
-            progress.update_status("Technical Analyst", ticker, "Done")
-        elif analyst_name == "sentiment":
-            progress.update_status("Sentiment Analyst", ticker, "Done")
+    events.emit("decision_finished", ticker=ticker, analyst="Portfolio Manager", analysts=analyst_names)
 
     return decision
 
 
+# Data sources the pipeline can fetch: label, fetch function and placeholder for failures
+DATA_SOURCES: Dict[str, Tuple[str, Callable[[str], Awaitable[Any]], Callable[[str], Any]]] = {
+    "company": (
+        "company data", lambda ticker: fetch_company_data(ticker),
+        lambda ticker: {"company_name": f"{ticker} Inc.", "sector": "Technology"}
+    ),
+    "prices": ("price history", lambda ticker: fetch_price_series(ticker, "1y"), PriceSeries.empty),
+    "news": (
+        "news", lambda ticker: fetch_news_data(ticker),
+        lambda ticker: [{"title": f"Positive news about {ticker}", "sentiment": "positive"}]
+    ),
+    "peers": ("peer companies", lambda ticker: fetch_peer_companies(ticker), lambda ticker: []),
+}
+
+# Analyses with a field of their own in CompanyAnalysisOutput (besides investor_* analyses)
+BUILTIN_ANALYSIS_KEYS = ("fundamental", "technical", "sentiment")
+
+
+class AnalystSpec:
+    """How an analyst plugs into the per-ticker pipeline."""
+
+    def __init__(
+        self,
+        key: str,
+        sources: List[str],
+        waits_for: str,
+        analyze: Callable[[AgentCascade, str, Dict[str, Any], bool, Callable[[AnalystHeadline], None]], Awaitable[BaseModel]],
+        inputs: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        """Initialize the spec.
+
+        Args:
+            key: Key of the analysis in the analyses dict, also its node name and routing role
+            sources: DATA_SOURCES the analyst reads
+            waits_for: Description of the data, shown while waiting for it
+            analyze: Coroutine function taking the agents, ticker, fetched data by
+                source, show_reasoning flag and headline callback, and returning
+                an analysis with rating, recommendation and reasoning fields
+            inputs: Function extracting the exact inputs the analyst reads from
+                the fetched data, as compact JSON-like values; incremental
+                re-analysis compares them between runs (defaults to every
+                source, compacted)
+        """
+        self.key = key
+        self.sources = sources
+        self.waits_for = waits_for
+        self.analyze = analyze
+        self.inputs = inputs or (lambda data: compact({source: data[source] for source in sources}))
+
+
+# Analysts available to the pipeline, by display name
+ANALYSTS: Dict[str, AnalystSpec] = {}
+
+
+def register_analyst(name: str, spec: AnalystSpec) -> None:
+    """Make an analyst available for selection.
+
+    Args:
+        name: Display name used to select the analyst (e.g. 'Technical Analyst')
+        spec: How the analyst plugs into the pipeline
+    """
+    if spec.key in ("decision", "output") or spec.key in DATA_SOURCES:
+        raise ValueError(f"Analyst key {spec.key!r} clashes with a pipeline node")
+    ANALYSTS[name] = spec
+
+
+register_analyst("Fundamental Analyst", AnalystSpec(
+    "fundamental", ["company"], "financials",
+    lambda agents, ticker, data, show_reasoning, on_headline: analyze_fundamentals(
+        agents, ticker, data["company"].get("financials", {}), show_reasoning, on_headline
+    ),
+    inputs=lambda data: compact(data["company"].get("financials", {}), FINANCIAL_FIELDS)
+))
+register_analyst("Technical Analyst", AnalystSpec(
+    "technical", ["prices"], "price history",
+    lambda agents, ticker, data, show_reasoning, on_headline: analyze_technicals(
+        agents, ticker, data["prices"], show_reasoning, on_headline
+    ),
+    inputs=lambda data: summarize_prices(data["prices"]) if isinstance(data["prices"], PriceSeries) else compact(data["prices"])
+))
+register_analyst("Sentiment Analyst", AnalystSpec(
+    "sentiment", ["news"], "news",
+    lambda agents, ticker, data, show_reasoning, on_headline: analyze_sentiment(
+        agents, ticker, data["news"], show_reasoning, on_headline
+    ),
+    inputs=lambda data: compact(data["news"], NEWS_FIELDS, max_items=24)
+))
+for _investor in ["Warren Buffett", "Charlie Munger", "Ben Graham", "Bill Ackman", "Cathie Wood"]:
+    register_analyst(_investor, AnalystSpec(
+        f"investor_{_investor.lower().replace(' ', '_')}", ["company", "peers"], "company data",
+        lambda agents, ticker, data, show_reasoning, on_headline, investor=_investor: analyze_with_investor(
+            agents, ticker, data["company"], investor, show_reasoning,
+            peer_companies=data["peers"], on_headline=on_headline
+        ),
+        inputs=lambda data: {"company": compact(data["company"], COMPANY_FIELDS | FINANCIAL_FIELDS), "peers": data["peers"]}
+    ))
+
+
 async def analyze_company(
     ticker: str,
-    model: OpenAIModel,
+    model_name: str = DEFAULT_MODEL,
     selected_analysts: List[str] = None,
-    show_reasoning: bool = False
+    show_reasoning: bool = False,
+    track_progress: bool = True
 ) -> CompanyAnalysisOutput:
     """Run the full company analysis workflow for a given ticker.
 
+    The workflow runs as a pipeline of fetch nodes, one node per selected
+    analyst, the decision and an output sink; independent nodes run
+    concurrently and the node states are persisted under the run's id.
+    While a run is checkpointed, nodes that finished in an earlier attempt
+    of the run are restored instead of run again.
+
     Args:
         ticker: Stock ticker symbol to analyze
-        model: The AI model to use for the analysis
+        model_name: OpenRouter model to use for roles the routing table has no route for
         selected_analysts: List of selected analysts to use (if None, uses all)
         show_reasoning: Whether to include detailed reasoning in the output
+        track_progress: Whether to set up and tear down the progress display
+            (disable when the caller manages it across several tickers)
 
     Returns:
         CompanyAnalysisOutput: Comprehensive analysis results
     """
-    # Create an agent with the model
-    agent = Agent(model)
+    # Agents are shared across tickers through the model registry; each role
+    # gets the cascade of models the routing table lists for it
+    def agents(role: str) -> List[Agent]:
+        return [model_registry.agent(name) for name in model_routing.models(role, model_name)]
 
     # Default to all analysts if none specified
     if not selected_analysts:
-        selected_analysts = [
-            "Fundamental Analyst",
-            "Technical Analyst",
-            "Warren Buffett"
-        ]
-
-    # Initialize progress tracker with selected analysts
-    progress.set_analysts(selected_analysts)
-    # Set the model being used
-    progress.set_model(model.model_name)
-    # Start the progress display
-    progress.start_display()
-
-    # Fetch real data using our API functions
-    try:
-        # Fetch company data
-        company_data = await fetch_company_data(ticker)
-        # Fetch price history (1 year by default)
-        price_history = await fetch_price_history(ticker)
-        # Fetch news data (20 articles by default)
-        news_data = await fetch_news_data(ticker)
-        # Fetch peer companies for comparison
-        peer_companies = await fetch_peer_companies(ticker)
-    except Exception as e:
-        # If API calls fail, log error and use placeholder data
-        progress.log_error(f"Error fetching data for {ticker}: {str(e)}")
-        # Fallback to placeholder data
-        company_data = {"company_name": f"{ticker} Inc.", "sector": "Technology"}
-        price_history = {"current_price": 150.0, "ma_50d": 145.0, "rsi_14": 60.0}
-        news_data = [{"title": f"Positive news about {ticker}", "sentiment": "positive"}]
-        peer_companies = []
-
-    # Extract financial data from company_data
-    financial_data = company_data.get("financials", {})
-
-    # Analyses to track
-    analyses = {}
-
-    # Run the selected analyses
-    if "Fundamental Analyst" in selected_analysts:
-        fundamental = await analyze_fundamentals(agent, ticker, financial_data, show_reasoning)
-        analyses["fundamental"] = fundamental
-
-    if "Technical Analyst" in selected_analysts:
-        technical = await analyze_technicals(agent, ticker, price_history, show_reasoning)
-        analyses["technical"] = technical
-
-    if "Sentiment Analyst" in selected_analysts:
-        sentiment = await analyze_sentiment(agent, ticker, news_data, show_reasoning)
-        analyses["sentiment"] = sentiment
-
-    # Run investor-based analyses
-    investor_analyses = []
-    for investor in ["Warren Buffett", "Charlie Munger", "Ben Graham", "Bill Ackman", "Cathie Wood"]:
-        if investor in selected_analysts:
-            investor_analysis = await analyze_with_investor(
-                agent, ticker, company_data, investor, show_reasoning, peer_companies=peer_companies
-            )
-            analyses[f"investor_{investor.lower().replace(' ', '_')}"] = investor_analysis
-            investor_analyses.append(investor_analysis)
-
-    # Make the final investment decision
-    company_name = company_data.get("company_name", f"{ticker} Inc.")
-    decision = await make_investment_decision(agent, ticker, company_name, analyses, show_reasoning)
-
-    # Compile all results
-    result = CompanyAnalysisOutput(
-        ticker=ticker,
-        company_name=company_name,
-        fundamental_analysis=analyses.get("fundamental"),
-        technical_analysis=analyses.get("technical"),
-        sentiment_analysis=analyses.get("sentiment"),
-        investor_analyses=investor_analyses,
-        investment_decision=decision
-    )
+        selected_analysts = DEFAULT_ANALYSTS
+
+    if track_progress:
+        # Initialize progress tracker with selected analysts
+        progress.set_analysts(selected_analysts)
+        # Set the model being used
+        progress.set_model(model_name)
+        # Start the progress display
+        progress.start_display()
+
+    specs = {name: spec for name, spec in ANALYSTS.items() if name in selected_analysts}
+
+    # A resumed run reuses the nodes that finished before it was interrupted
+    restored_output = checkpoints.restore(ticker, "output")
+    if restored_output is not None:
+        for name in specs:
+            events.emit("analysis_restored", ticker=ticker, analyst=name)
+        if track_progress:
+            progress.stop_display()
+        return restored_output
+    restored = {
+        key: value for key in [*(spec.key for spec in specs.values()), "decision"]
+        if (value := checkpoints.restore(ticker, key)) is not None
+    }
+
+    # Each analyst row waits until the pipeline has the data it reads
+    for name, spec in specs.items():
+        if spec.key in restored:
+            events.emit("analysis_restored", ticker=ticker, analyst=name)
+        else:
+            events.emit("waiting_for_data", ticker=ticker, analyst=name, source=spec.waits_for)
+
+    # Fetch nodes; each source falls back to placeholder data on failure
+    def fetch_node(source: str) -> Node:
+        label, fetch, default = DATA_SOURCES[source]
+
+        async def run(ctx: NodeContext) -> Any:
+            try:
+                return await fetch(ticker)
+            except Exception as e:
+                progress.log_error(f"Error fetching {label} for {ticker}: {str(e)}")
+                return default(ticker)
+
+        return Node(source, run)
+
+    # Analyst nodes publish their headline early, for the decision to start from
+    def analyst_node(name: str, spec: AnalystSpec) -> Node:
+        async def run(ctx: NodeContext) -> BaseModel:
+            def publish(headline: AnalystHeadline) -> None:
+                if ctx.publish("headline", headline):
+                    events.emit("analysis_headline", recommendation=headline.recommendation, rating=headline.rating)
+
+            # With incremental re-analysis, an analysis whose inputs did not
+            # materially change since it was computed is reused
+            reused = None
+            if incremental_analyses.enabled:
+                inputs = spec.inputs(ctx.inputs)
+                settings = {"models": model_routing.models(spec.key, model_name), "show_reasoning": show_reasoning}
+                reused = incremental_analyses.lookup(ticker, spec.key, inputs, settings)
+            if reused is not None:
+                analysis, reason = reused
+                events.emit("analysis_reused", ticker=ticker, analyst=name, reason=reason)
+            else:
+                with instrument_context(ticker, name):
+                    analysis = await spec.analyze(agents(spec.key), ticker, ctx.inputs, show_reasoning, publish)
+                if incremental_analyses.enabled:
+                    incremental_analyses.record(ticker, spec.key, inputs, settings, analysis)
+            checkpoints.save(ticker, spec.key, analysis)
+            return analysis
+
+        return Node(spec.key, run, deps=spec.sources, early={"headline": AnalystHeadline.from_analysis})
+
+    # Restored nodes need no inputs and publish their headline on completion
+    def restored_node(key: str, early: Optional[Dict[str, Callable[[Any], Any]]] = None) -> Node:
+        async def run(ctx: NodeContext) -> BaseModel:
+            return restored[key]
+
+        return Node(key, run, early=early)
+
+    async def decide(ctx: NodeContext) -> InvestmentDecision:
+        company_name = ctx.inputs["company"].get("company_name", f"{ticker} Inc.")
+        headlines = {spec.key: ctx.inputs[f"{spec.key}:headline"] for spec in specs.values()}
+        decision = await make_investment_decision(agents("decision"), ticker, company_name, headlines, show_reasoning)
+        checkpoints.save(ticker, "decision", decision)
+        return decision
+
+    # Sink: compile all results
+    async def compile_output(ctx: NodeContext) -> CompanyAnalysisOutput:
+        analyses = {spec.key: ctx.inputs[spec.key] for spec in specs.values()}
+        output = CompanyAnalysisOutput(
+            ticker=ticker,
+            company_name=ctx.inputs["company"].get("company_name", f"{ticker} Inc."),
+            fundamental_analysis=analyses.get("fundamental"),
+            technical_analysis=analyses.get("technical"),
+            sentiment_analysis=analyses.get("sentiment"),
+            investor_analyses=[analysis for key, analysis in analyses.items() if key.startswith("investor_")],
+            other_analyses={
+                key: analysis for key, analysis in analyses.items()
+                if key not in BUILTIN_ANALYSIS_KEYS and not key.startswith("investor_")
+            },
+            investment_decision=ctx.inputs["decision"]
+        )
+        checkpoints.save(ticker, "output", output)
+        return output
+
+    # Only the sources read by analysts that still have to run are fetched
+    pending = [spec for spec in specs.values() if spec.key not in restored]
+    sources = ["company", *sorted({source for spec in pending for source in spec.sources} - {"company"})]
+    pipeline = Pipeline(fetch_node(source) for source in sources)
+    for name, spec in specs.items():
+        if spec.key in restored:
+            pipeline.add(restored_node(spec.key, early={"headline": AnalystHeadline.from_analysis}))
+        else:
+            pipeline.add(analyst_node(name, spec))
+    if "decision" in restored:
+        pipeline.add(restored_node("decision"))
+    else:
+        pipeline.add(Node("decision", decide, deps=["company", *(f"{spec.key}:headline" for spec in specs.values())]))
+    pipeline.add(Node("output", compile_output, deps=["company", *(spec.key for spec in specs.values()), "decision"]))
+
+    run = await pipeline.run(ticker, state_path=PIPELINE_STATE_DIR / call_recorder.run_id / f"{ticker}.json")
 
-    # Stop the progress display
-    progress.stop_display()
+    if track_progress:
+        # Stop the progress display
+        progress.stop_display()
 
-    return result
\ No newline at end of file
+    return run.results["output"]
@@ -0,0 +1,12 @@
+"""Shared test setup: placeholder credentials and a throwaway cache directory."""
+
+import os
+import tempfile
+
+# Modules read these at import time; tests never reach the real services
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+os.environ.setdefault("FINANCIAL_DATASETS_API_KEY", "test")
+os.environ.setdefault("LOGFIRE_TOKEN", "test")
+os.environ.setdefault("LOGFIRE_SEND_TO_LOGFIRE", "false")
+os.environ.setdefault("STAGE", "test")
+os.environ["HEDGEHOG_CACHE_DIR"] = tempfile.mkdtemp(prefix="hedgehog-tests-")
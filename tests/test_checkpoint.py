@@ -0,0 +1,48 @@
+"""Tests for checkpointing and resuming runs."""
+
+import pytest
+from pydantic import BaseModel
+
+from hedgehog.checkpoint import CheckpointStore
+
+
+class Result(BaseModel):
+    rating: int
+
+
+def test_resumed_run_restores_saved_results(tmp_path):
+    store = CheckpointStore(tmp_path)
+    store.open("run1", {"tickers": ["AAPL"]})
+    store.save("AAPL", "fundamental", Result(rating=7))
+    store.close()
+
+    config = store.resume("run1")
+
+    assert config == {"tickers": ["AAPL"]}
+    assert store.restore("AAPL", "fundamental") == Result(rating=7)
+    assert store.restore("AAPL", "technical") is None
+    store.close()
+
+
+def test_each_resume_gets_its_own_attempt_id(tmp_path):
+    store = CheckpointStore(tmp_path)
+    store.open("run1")
+    assert store.attempt_id == "run1"
+    store.close()
+
+    store.resume("run1")
+    assert store.attempt_id == "run1.r1"
+    store.close()
+
+    store.resume("run1")
+    assert store.attempt_id == "run1.r2"
+    store.close()
+
+    store.open("run2")
+    assert store.attempt_id == "run2"
+    store.close()
+
+
+def test_resuming_an_unknown_run_fails(tmp_path):
+    with pytest.raises(ValueError, match="No checkpoint"):
+        CheckpointStore(tmp_path).resume("missing")
@@ -0,0 +1,96 @@
+"""Replay the fetch layer and the analysis workflow from a recorded archive."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+
+from hedgehog import workflow
+from hedgehog.tools import api
+from hedgehog.tools.fixtures import FixtureArchive, request_key
+
+ARCHIVE = Path(__file__).parent / "fixtures" / "aapl.jsonl.gz"
+
+# One canned result covering the fields of every analysis and of the decision;
+# each result type picks out its own fields
+RESULT_ARGS = {
+    "ticker": "AAPL",
+    "company_name": "Apple Inc.",
+    "sector": "Technology",
+    "rating": 7,
+    "recommendation": "Buy",
+    "confidence": 6,
+    "reasoning": "Strong margins and cash flow.",
+    "metrics": {},
+    "strengths": ["Margins"],
+    "weaknesses": ["Valuation"],
+    "concerns": ["Valuation"],
+    "investor_name": "Warren Buffett",
+    "would_invest": True,
+    "order_type": "BUY",
+    "conviction_level": 6,
+    "position_size": 10,
+    "target_price": 210.0,
+    "time_horizon": "Long-term",
+    "key_factors": ["Margins"],
+    "risks": ["Valuation"],
+}
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Serve API responses from the checked-in archive, bypassing every cache."""
+    monkeypatch.setattr(api.response_cache, "mode", "off")
+    monkeypatch.setattr(workflow.llm_cache, "mode", "off")
+    archive = FixtureArchive()
+    archive.configure("replay", ARCHIVE)
+    monkeypatch.setattr(api, "fixtures", archive)
+    return archive
+
+
+def test_request_key_ignores_api_key_and_param_order():
+    assert request_key("news", "AAPL", {"limit": 20, "apikey": "secret"}) == "news/AAPL?limit=20"
+    assert request_key("prices", "AAPL", {"b": 1, "a": 2}) == "prices/AAPL?a=2&b=1"
+
+
+def test_fetch_layer_replays_archive(replay):
+    async def fetch():
+        return await asyncio.gather(
+            api.fetch_company_data("AAPL"),
+            api.stream_price_series("AAPL", "1y"),
+            api.fetch_news_data("AAPL"),
+            api.fetch_peer_companies("AAPL"),
+        )
+
+    company, series, news, peers = asyncio.run(fetch())
+
+    assert company["company_info"]["company_name"] == "Apple Inc."
+    assert company["financials"]["pe_ratio"] == 29.5
+    assert len(series) == 60
+    assert str(series.first_date) == "2024-01-02"
+    assert [article["sentiment"] for article in news] == ["positive", "negative"]
+    assert peers == ["MSFT", "GOOGL"]
+    assert replay.stats()["missing"] == 0
+
+
+def test_unrecorded_request_fails(replay):
+    with pytest.raises(Exception, match="No recorded response"):
+        asyncio.run(api.fetch_company_data("MSFT"))
+
+
+def test_analyze_company_replays_archive(replay, monkeypatch):
+    agent = Agent(TestModel(custom_result_args=RESULT_ARGS))
+    monkeypatch.setattr(workflow.model_registry, "agent", lambda model_name=None: agent)
+
+    output = asyncio.run(workflow.analyze_company(
+        "AAPL", selected_analysts=["Fundamental Analyst", "Warren Buffett"], track_progress=False
+    ))
+
+    assert output.ticker == "AAPL"
+    assert output.fundamental_analysis.rating == 7
+    assert [analysis.investor_name for analysis in output.investor_analyses] == ["Warren Buffett"]
+    assert output.investor_analyses[0].recommendation == "Buy"
+    assert output.investment_decision.order_type == "BUY"
+    assert replay.stats()["missing"] == 0
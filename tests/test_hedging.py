@@ -0,0 +1,119 @@
+"""Tests for hedged LLM requests."""
+
+import asyncio
+
+import pytest
+
+from hedgehog.tools.hedging import MIN_LATENCY_SAMPLES, LatencyHedger
+
+
+def warmed_up(cost=None, seconds: float = 0.01) -> LatencyHedger:
+    """A hedger that has learned a short delay for model 'm'."""
+    hedger = LatencyHedger(min_delay=0.0)
+    hedger.configure(True, percentile=50.0, budget=0.5)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedger.observe("m", seconds, cost)
+    return hedger
+
+
+async def request(name: str, seconds: float):
+    await asyncio.sleep(seconds)
+    return name
+
+
+def call(hedger: LatencyHedger, primary_seconds: float, hedge_seconds: float, slots=None):
+    return asyncio.run(hedger.run(
+        "m", lambda: request("primary", primary_seconds), lambda: request("hedge", hedge_seconds), slots=slots
+    ))
+
+
+def test_slow_call_is_hedged_and_the_duplicate_wins():
+    hedger = warmed_up(cost=0.01)
+
+    result, hedged = call(hedger, 0.5, 0.0)
+
+    assert (result, hedged.winner, hedged.skipped) == ("hedge", "hedge", None)
+    assert hedged.delay == 0.01
+    # The primary was in flight longer than the winning duplicate
+    assert hedged.cancelled_share == 1.0
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+def test_cancelled_duplicate_is_charged_for_its_time_in_flight():
+    hedger = warmed_up(cost=0.01, seconds=0.1)
+
+    result, hedged = call(hedger, 0.2, 1.0)
+
+    assert (result, hedged.winner) == ("primary", "primary")
+    assert hedged.cancelled_share == pytest.approx(0.5, abs=0.1)
+
+
+def test_fast_call_is_not_hedged():
+    hedger = warmed_up(cost=0.01, seconds=0.2)
+
+    result, hedged = call(hedger, 0.0, 0.0)
+
+    assert (result, hedged.hedged, hedged.skipped) == ("primary", False, None)
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_duplicate_needs_a_free_slot():
+    hedger = warmed_up(cost=0.01)
+
+    async def run_with(slots: asyncio.Semaphore):
+        async with slots:
+            return await hedger.run(
+                "m", lambda: request("primary", 0.05), lambda: request("hedge", 0.0), slots=slots
+            )
+
+    async def scenario():
+        full = asyncio.Semaphore(1)
+        skipped = await run_with(full)
+        spare = asyncio.Semaphore(2)
+        taken = await run_with(spare)
+        await asyncio.sleep(0)
+        # Both slots are given back once the requests are done
+        await spare.acquire()
+        return skipped, taken, not spare.locked()
+
+    (result, skipped), (_, taken), slot_free = asyncio.run(scenario())
+
+    assert (result, skipped.hedged, skipped.skipped) == ("primary", False, "no_slot")
+    assert taken.winner == "hedge"
+    assert slot_free
+    assert hedger.stats()["no_slot"] == 1
+
+
+def test_hedge_wins_do_not_lower_the_learned_delay():
+    hedger = warmed_up(cost=0.01, seconds=1.0)
+
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedger.observe("m", 0.01, 0.01, winner="hedge")
+    hedger.observe("m", 3.0, 0.01, winner="primary")
+
+    assert hedger.delay("m") == 1.0
+    assert hedger.stats()["spend"] > 0.01 * MIN_LATENCY_SAMPLES
+
+
+def test_unpriced_model_hedges_within_a_share_of_calls():
+    hedger = warmed_up(cost=None)
+
+    outcomes = []
+    for _ in range(4):
+        _, hedged = call(hedger, 0.05, 0.0)
+        hedger.observe("m", 0.05, None, winner=hedged.winner)
+        outcomes.append(hedged.winner or hedged.skipped)
+
+    # Budget 0.5: the first call is hedged, then every other call
+    assert outcomes == ["hedge", "budget", "hedge", "budget"]
+    assert hedger.stats()["over_budget"] == 2
+
+
+def test_priced_model_hedges_within_a_share_of_spend():
+    hedger = warmed_up(cost=0.01)
+
+    _, hedged = call(hedger, 0.05, 0.0)
+    hedger.observe("m", 0.05, 0.01, extra_cost=1.0, winner=hedged.winner)
+
+    assert hedged.winner == "hedge"
+    assert not hedger.within_budget()
@@ -0,0 +1,57 @@
+"""Tests for deciding whether an analyst's inputs changed materially."""
+
+from hedgehog.tools.incremental import fingerprint, material_change
+
+
+def test_numbers_within_tolerance_are_immaterial():
+    old = {"price": 100.0, "pe_ratio": 25}
+
+    assert material_change(old, {"price": 101.9, "pe_ratio": 25}, 0.02) is None
+    assert material_change(old, {"price": 100.0, "pe_ratio": 25.4}, 0.02) is None
+
+
+def test_numbers_beyond_tolerance_are_material():
+    old = {"company": {"price": 100.0, "pe_ratio": 25}}
+
+    assert material_change(old, {"company": {"price": 103.0, "pe_ratio": 25}}, 0.02) == "company.price"
+
+
+def test_zero_tolerance_requires_equal_numbers():
+    assert material_change({"rsi": 55.0}, {"rsi": 55.0}, 0.0) is None
+    assert material_change({"rsi": 55.0}, {"rsi": 55.01}, 0.0) == "rsi"
+
+
+def test_added_and_removed_keys_are_material():
+    old = {"price": 100.0, "sector": "Technology"}
+
+    assert material_change(old, {**old, "dividend": 0.5}, 0.5) == "dividend"
+    assert material_change(old, {"price": 100.0}, 0.5) == "sector"
+
+
+def test_list_length_changes_are_material():
+    old = {"news": [{"title": "A"}, {"title": "B"}]}
+
+    assert material_change(old, {"news": [{"title": "A"}]}, 0.5) == "news"
+    assert material_change(old, {"news": [{"title": "A"}, {"title": "B"}, {"title": "C"}]}, 0.5) == "news"
+
+
+def test_list_items_are_compared_in_order():
+    old = {"peers": ["MSFT", "GOOGL"], "closes": [100.0, 101.0]}
+
+    assert material_change(old, {"peers": ["MSFT", "GOOGL"], "closes": [100.5, 101.0]}, 0.02) is None
+    assert material_change(old, {"peers": ["GOOGL", "MSFT"], "closes": [100.0, 101.0]}, 0.02) == "peers[0]"
+
+
+def test_non_numbers_must_be_equal():
+    assert material_change({"trend": "Bullish"}, {"trend": "Bearish"}, 0.5) == "trend"
+    assert material_change({"price": None}, {"price": 100.0}, 0.5) == "price"
+
+
+def test_top_level_change_is_reported_as_inputs():
+    assert material_change(100.0, 110.0, 0.02) == "inputs"
+    assert material_change([1], [1, 2], 0.02) == "inputs"
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 1.5})
@@ -0,0 +1,110 @@
+"""Check the vectorized indicators against straightforward loop implementations."""
+
+import math
+from itertools import pairwise
+
+import numpy as np
+import pytest
+
+from hedgehog.tools.indicators import ema, rolling_std, rsi, sma, wilder
+
+PADDING = 7
+
+
+def prices(days: int = 80, seed: int = 3) -> np.ndarray:
+    """Two rows of random-walk closes, the second left-padded with NaN."""
+    rng = np.random.default_rng(seed)
+    walk = 100 + np.cumsum(rng.normal(0, 1.5, size=(2, days)), axis=1)
+    walk[1, :PADDING] = np.nan
+    return walk
+
+
+def valid(row: np.ndarray) -> list:
+    return [value for value in row if not math.isnan(value)]
+
+
+def reference_sma(row, window):
+    return [sum(row[i - window + 1:i + 1]) / window if i >= window - 1 else math.nan for i in range(len(row))]
+
+
+def reference_std(row, window):
+    result = []
+    for i in range(len(row)):
+        if i < window - 1:
+            result.append(math.nan)
+            continue
+        chunk = row[i - window + 1:i + 1]
+        mean = sum(chunk) / window
+        result.append(math.sqrt(sum((x - mean) ** 2 for x in chunk) / window))
+    return result
+
+
+def reference_ema(row, span):
+    alpha = 2 / (span + 1)
+    result, current = [], row[0]
+    for i, value in enumerate(row):
+        current = alpha * value + (1 - alpha) * current
+        result.append(current if i >= span - 1 else math.nan)
+    return result
+
+
+def reference_wilder(row, period):
+    result, current = [], None
+    for i, value in enumerate(row):
+        if i < period - 1:
+            result.append(math.nan)
+            continue
+        if current is None:
+            current = sum(row[:period]) / period
+        else:
+            current = (current * (period - 1) + value) / period
+        result.append(current)
+    return result
+
+
+def reference_rsi(row, period):
+    changes = [b - a for a, b in pairwise(row)]
+    gains = reference_wilder([max(change, 0.0) for change in changes], period)
+    losses = reference_wilder([max(-change, 0.0) for change in changes], period)
+    return [math.nan] + [
+        math.nan if math.isnan(gain) else 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+        for gain, loss in zip(gains, losses)
+    ]
+
+
+@pytest.mark.parametrize("indicator, reference, window", [
+    (sma, reference_sma, 20),
+    (rolling_std, reference_std, 20),
+    (ema, reference_ema, 12),
+    (wilder, reference_wilder, 14),
+    (rsi, reference_rsi, 14),
+])
+def test_matches_loop_reference(indicator, reference, window):
+    close = prices()
+
+    result = indicator(close, window)
+
+    for row in range(close.shape[0]):
+        values = valid(close[row])
+        expected = reference(values, window)
+        np.testing.assert_allclose(result[row, -len(values):], expected, rtol=1e-9, equal_nan=True)
+    # The padding never leaks into the output
+    assert np.isnan(result[1, :PADDING]).all()
+
+
+def test_wilder_is_seeded_with_the_simple_average():
+    values = np.array([[1.0, 2.0, 3.0, 4.0, 10.0]])
+
+    result = wilder(values, 4)
+
+    assert np.isnan(result[0, :3]).all()
+    assert result[0, 3] == pytest.approx(2.5)
+    assert result[0, 4] == pytest.approx((2.5 * 3 + 10.0) / 4)
+
+
+def test_short_history_is_all_nan():
+    close = prices(days=10)
+
+    assert np.isnan(sma(close, 20)).all()
+    assert np.isnan(rolling_std(close, 20)).all()
+    assert np.isnan(rsi(close, 14)).all()
@@ -0,0 +1,44 @@
+"""Tests for the event bus and the call recorder."""
+
+import logging
+
+from hedgehog.instrumentation import CallRecorder, EventBus
+
+
+def test_broken_subscriber_is_logged_and_others_still_run(caplog):
+    bus = EventBus()
+    received = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(received.append)
+
+    with caplog.at_level(logging.ERROR, logger="hedgehog.instrumentation"):
+        bus.emit("fetch_started", ticker="AAPL")
+
+    assert [event.name for event in received] == ["fetch_started"]
+    assert "boom" in caplog.text
+
+
+def test_pipelines_of_a_ticker_run_several_times_are_all_kept():
+    bus = EventBus()
+    recorder = CallRecorder()
+    bus.subscribe(recorder.handle_event)
+
+    bus.emit("pipeline_finished", ticker="AAPL", seconds=2.0, critical_path=[("fetch_prices", 0.5), ("decision", 1.5)])
+    bus.emit("pipeline_finished", ticker="AAPL", seconds=5.0, critical_path=[("fetch_news", 4.0), ("decision", 1.0)])
+    bus.emit("pipeline_finished", ticker="AAPL", seconds=1.0, critical_path=[("decision", 1.0)])
+    bus.emit("pipeline_finished", ticker="MSFT", seconds=3.0, critical_path=[("decision", 3.0)])
+
+    pipelines = recorder.summary()["pipelines"]
+
+    assert list(pipelines) == ["AAPL", "MSFT"]
+    assert pipelines["AAPL"] == {
+        "runs": 3,
+        "seconds": 5.0,
+        "total_seconds": 8.0,
+        "critical_path": [["fetch_news", 4.0], ["decision", 1.0]],
+    }
+    assert pipelines["MSFT"]["runs"] == 1
@@ -0,0 +1,206 @@
+"""Tests for the dependency-driven pipeline scheduler."""
+
+import asyncio
+import json
+
+import pytest
+
+from hedgehog.pipeline import Node, Pipeline, PipelineRun
+
+
+def constant(value, delay: float = 0.0):
+    """Node body returning a value after a delay."""
+    async def run(ctx):
+        await asyncio.sleep(delay)
+        return value
+    return run
+
+
+def total(ctx):
+    """Node body summing its inputs."""
+    async def run():
+        return sum(ctx.inputs.values())
+    return run()
+
+
+def test_validate_rejects_unknown_dependency():
+    pipeline = Pipeline([Node("a", constant(1)), Node("b", total, deps=["a", "missing"])])
+
+    with pytest.raises(ValueError, match="unknown output 'missing'"):
+        pipeline.validate()
+
+
+def test_validate_rejects_undeclared_early_output():
+    pipeline = Pipeline([Node("a", constant(1)), Node("b", total, deps=["a:headline"])])
+
+    with pytest.raises(ValueError, match="unknown output 'a:headline'"):
+        pipeline.validate()
+
+
+def test_validate_rejects_cycle():
+    pipeline = Pipeline([
+        Node("a", total, deps=["c"]),
+        Node("b", total, deps=["a"], early={"early": lambda result: result}),
+        Node("c", total, deps=["b:early"]),
+    ])
+
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline.validate()
+
+
+def test_add_rejects_duplicate_name():
+    pipeline = Pipeline([Node("a", constant(1))])
+
+    with pytest.raises(ValueError, match="already has a node 'a'"):
+        pipeline.add(Node("a", constant(2)))
+
+
+def test_nodes_receive_inputs_and_persist_state(tmp_path):
+    pipeline = Pipeline([
+        Node("a", constant(1)),
+        Node("b", constant(2)),
+        Node("sum", total, deps=["a", "b"]),
+    ])
+
+    run = asyncio.run(pipeline.run("AAPL", state_path=tmp_path / "AAPL.json"))
+
+    assert run.results == {"a": 1, "b": 2, "sum": 3}
+    saved = json.loads((tmp_path / "AAPL.json").read_text())
+    assert {name: node["status"] for name, node in saved["nodes"].items()} == {"a": "done", "b": "done", "sum": "done"}
+
+
+def test_early_output_starts_dependants_before_the_node_finishes():
+    order = []
+
+    async def analyst(ctx):
+        assert ctx.publish("headline", "Buy")
+        assert not ctx.publish("headline", "Sell")
+        await asyncio.sleep(0.05)
+        order.append("analyst")
+        return {"headline": "Buy", "details": "..."}
+
+    async def decision(ctx):
+        order.append("decision")
+        return ctx.inputs["analyst:headline"]
+
+    pipeline = Pipeline([
+        Node("analyst", analyst, early={"headline": lambda result: result["headline"]}),
+        Node("decision", decision, deps=["analyst:headline"]),
+    ])
+
+    run = asyncio.run(pipeline.run())
+
+    assert order == ["decision", "analyst"]
+    assert run.results["decision"] == "Buy"
+
+
+def test_unpublished_early_output_is_derived_from_the_result():
+    pipeline = Pipeline([
+        Node("analyst", constant({"headline": "Hold"}), early={"headline": lambda result: result["headline"]}),
+        Node("decision", lambda ctx: constant(ctx.inputs["analyst:headline"])(ctx), deps=["analyst:headline"]),
+    ])
+
+    run = asyncio.run(pipeline.run())
+
+    assert run.results["decision"] == "Hold"
+
+
+def test_publishing_an_undeclared_output_raises():
+    async def analyst(ctx):
+        ctx.publish("verdict", "Buy")
+
+    with pytest.raises(KeyError, match="no early output 'verdict'"):
+        asyncio.run(Pipeline([Node("analyst", analyst)]).run())
+
+
+def test_failure_skips_dependants_and_cancels_running_nodes():
+    async def broken(ctx):
+        raise RuntimeError("feed down")
+
+    pipeline = Pipeline([
+        Node("fetch", broken),
+        Node("slow", constant("late", delay=10)),
+        Node("analyst", total, deps=["fetch"]),
+    ])
+    run = PipelineRun(pipeline, "AAPL")
+
+    with pytest.raises(RuntimeError, match="feed down"):
+        asyncio.run(run.execute())
+
+    assert run.states["fetch"].status == "failed"
+    assert run.states["fetch"].error == "feed down"
+    assert run.states["analyst"].status == "skipped"
+    assert run.states["slow"].status == "cancelled"
+    assert run.states["slow"].error is None
+    assert "analyst" not in run.results
+
+
+def test_cancelling_the_run_cancels_every_node():
+    pipeline = Pipeline([
+        Node("fetch", constant(1, delay=10)),
+        Node("analyst", total, deps=["fetch"]),
+    ])
+    run = PipelineRun(pipeline, "AAPL")
+
+    async def cancel_soon():
+        task = asyncio.create_task(run.execute())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_soon())
+
+    assert run.states["fetch"].status == "cancelled"
+    assert run.states["analyst"].status == "skipped"
+
+
+def test_critical_path_follows_the_slowest_inputs():
+    async def analyst(ctx):
+        ctx.publish("headline", "Buy")
+        await asyncio.sleep(0.2)
+        return "report"
+
+    async def decision(ctx):
+        await asyncio.sleep(0.02)
+        return ctx.inputs["analyst:headline"]
+
+    pipeline = Pipeline([
+        Node("fast", constant(1, delay=0.01)),
+        Node("slow", constant(2, delay=0.1)),
+        Node("analyst", analyst, deps=["fast", "slow"], early={"headline": lambda result: "Buy"}),
+        Node("decision", decision, deps=["analyst:headline", "fast"]),
+    ])
+
+    run = asyncio.run(pipeline.run())
+
+    path = run.critical_path()
+    assert [name for name, _ in path] == ["slow", "analyst"]
+    assert path[0][1] == pytest.approx(0.1, abs=0.05)
+    assert path[1][1] == pytest.approx(0.2, abs=0.05)
+    assert run.states["decision"].waited_on == "analyst:headline"
+    # The decision ran off the headline and finished long before the analyst
+    assert run.states["decision"].finished < run.states["analyst"].finished
+
+
+def test_critical_path_through_an_early_output_ends_at_its_publication():
+    async def analyst(ctx):
+        await asyncio.sleep(0.05)
+        ctx.publish("headline", "Buy")
+        await asyncio.sleep(0.05)
+        return "report"
+
+    async def decision(ctx):
+        await asyncio.sleep(0.2)
+        return ctx.inputs["analyst:headline"]
+
+    pipeline = Pipeline([
+        Node("analyst", analyst, early={"headline": lambda result: "Buy"}),
+        Node("decision", decision, deps=["analyst:headline"]),
+    ])
+
+    path = asyncio.run(pipeline.run()).critical_path()
+
+    assert [name for name, _ in path] == ["analyst", "decision"]
+    assert path[0][1] == pytest.approx(0.05, abs=0.03)
+    assert path[1][1] == pytest.approx(0.2, abs=0.05)
@@ -0,0 +1,69 @@
+"""Tests for appending delta fetches to a stored price series."""
+
+import numpy as np
+
+from hedgehog.tools.prices import ADJUSTMENT_TOLERANCE, MAX_GAP_DAYS, PriceSeries
+
+
+def make_series(start: str, closes, ticker: str = "AAPL") -> PriceSeries:
+    """Build a series of consecutive daily bars starting at a date."""
+    first = np.datetime64(start, "D")
+    bars = [
+        {"date": str(first + np.timedelta64(offset, "D")), "open": close, "high": close, "low": close,
+         "close": close, "adj_close": close, "volume": 1000}
+        for offset, close in enumerate(closes)
+    ]
+    return PriceSeries.from_bars(ticker, bars)
+
+
+def test_merge_replaces_identical_overlapping_bar():
+    stored = make_series("2024-03-01", [100.0, 101.0, 102.0])
+    newer = make_series("2024-03-03", [102.0, 103.0, 104.0])
+
+    merged = stored.merge(newer)
+
+    assert merged is not None
+    assert [str(day) for day in merged.dates] == ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04", "2024-03-05"]
+    assert merged.close.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+
+def test_merge_accepts_overlap_within_tolerance():
+    stored = make_series("2024-03-01", [100.0, 101.0])
+    newer = make_series("2024-03-02", [101.0 * (1 + ADJUSTMENT_TOLERANCE / 2), 102.0])
+
+    merged = stored.merge(newer)
+
+    assert merged is not None
+    assert len(merged) == 3
+
+
+def test_merge_refuses_adjusted_overlap():
+    stored = make_series("2024-03-01", [100.0, 101.0])
+    newer = make_series("2024-03-02", [101.0 * (1 + 2 * ADJUSTMENT_TOLERANCE), 102.0])
+
+    assert stored.merge(newer) is None
+
+
+def test_merge_appends_after_short_gap():
+    stored = make_series("2024-03-01", [100.0, 101.0])
+    newer = make_series(str(np.datetime64("2024-03-02") + np.timedelta64(MAX_GAP_DAYS, "D")), [102.0])
+
+    merged = stored.merge(newer)
+
+    assert merged is not None
+    assert merged.close.tolist() == [100.0, 101.0, 102.0]
+
+
+def test_merge_refuses_gap_beyond_limit():
+    stored = make_series("2024-03-01", [100.0, 101.0])
+    newer = make_series(str(np.datetime64("2024-03-02") + np.timedelta64(MAX_GAP_DAYS + 1, "D")), [102.0])
+
+    assert stored.merge(newer) is None
+
+
+def test_merge_with_empty_side():
+    stored = make_series("2024-03-01", [100.0, 101.0])
+    empty = PriceSeries.empty("AAPL")
+
+    assert stored.merge(empty) is stored
+    assert empty.merge(stored) is stored
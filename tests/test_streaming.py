@@ -0,0 +1,51 @@
+"""Tests for incremental decoding of streamed JSON arrays."""
+
+import asyncio
+import json
+
+import pytest
+
+from hedgehog.tools.streaming import iter_json_array
+
+PAYLOAD = {
+    "ticker": "AAPL",
+    "news": [
+        {"title": "Äpfel über alles", "source": "Börse", "tags": ["a", "b"]},
+        {"title": "株価が上昇", "nested": {"items": [1, 2, {"x": "]"}]}},
+        {"title": "Quote \" and brace } inside", "emoji": "📈"},
+    ],
+}
+
+
+async def _chunks(body: bytes, size: int):
+    for offset in range(0, len(body), size):
+        yield body[offset:offset + size]
+
+
+def decode(body: bytes, size: int, key=None):
+    async def collect():
+        return [item async for item in iter_json_array(_chunks(body, size), key)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_items_survive_any_chunk_boundary(size):
+    body = json.dumps(PAYLOAD, ensure_ascii=False).encode("utf-8")
+
+    assert decode(body, size, "news") == PAYLOAD["news"]
+
+
+@pytest.mark.parametrize("size", [1, 5])
+def test_bare_array(size):
+    body = json.dumps(PAYLOAD["news"], ensure_ascii=False, indent=2).encode("utf-8")
+
+    assert decode(body, size) == PAYLOAD["news"]
+
+
+def test_missing_array_yields_nothing():
+    assert decode(b'{"error": "not found"}', 4, "news") == []
+
+
+def test_non_json_body_is_rejected():
+    with pytest.raises(ValueError):
+        decode(b"<html>Bad gateway</html>", 8, "news")